@@ -1,12 +1,15 @@
 """R bridge module for rpy2 integration with njschooldata R package."""
 
 import functools
+import inspect
 import re
+import threading
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any, Callable, Hashable, Optional
 
 import pandas as pd
 
+from . import memory, profiling, progress, tracing
 from ._generated_contract import R_PACKAGE_MAX_VERSION, R_PACKAGE_MIN_VERSION
 
 try:
@@ -180,12 +183,215 @@ def list_r_fetchers() -> list[str]:
     return list(_r_fetchers_cache)
 
 
+class _Flight:
+    """One in-flight call that concurrent identical callers wait on."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into one execution.
+
+    The first caller for a key runs the call; callers arriving while it is in
+    flight block until it finishes and receive the same result (or re-raise
+    the same exception). Nothing is cached once the call completes.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: dict = {}
+        self._counts = dict.fromkeys(("executed", "coalesced", "bypassed"), 0)
+
+    def do(self, key: Optional[Hashable], fn: Callable[[], Any]) -> tuple[Any, bool]:
+        """Run ``fn`` for ``key``; return ``(result, shared)``."""
+        if key is None:
+            with self._lock:
+                self._counts["bypassed"] += 1
+            return fn(), False
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self._counts["executed"] += 1
+            else:
+                self._counts["coalesced"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+        try:
+            flight.result = fn()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result, False
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {**self._counts, "in_flight": len(self._flights)}
+
+    def reset(self) -> None:
+        with self._lock:
+            for name in self._counts:
+                self._counts[name] = 0
+
+
+_call_flights = _SingleFlight()
+_frame_flights = _SingleFlight()
+
+
+def _freeze(value: Any) -> Hashable:
+    """Return a hashable, type-tagged form of an argument value."""
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(_freeze(item) for item in value))
+    if isinstance(value, dict):
+        return ("dict", tuple(sorted((str(k), _freeze(v)) for k, v in value.items())))
+    if isinstance(value, (set, frozenset)):
+        return ("set", tuple(sorted(map(repr, value))))
+    hash(value)
+    return (type(value).__name__, value)
+
+
+def _flight_key(name: str, args: tuple, kwargs: dict) -> Optional[Hashable]:
+    """
+    Key for a call, or ``None`` when it must not be coalesced.
+
+    Calls are not coalesced when an argument is unhashable or a progress
+    callback is active: a caller joining another's flight would receive none
+    of the R progress events.
+    """
+    if progress.progress_active():
+        return None
+    try:
+        return (
+            name,
+            tuple(_freeze(arg) for arg in args),
+            tuple(sorted((key, _freeze(val)) for key, val in kwargs.items())),
+        )
+    except TypeError:
+        return None
+
+
+def _bound_call_key(func: Callable, args: tuple, kwargs: dict) -> Optional[Hashable]:
+    """
+    Key a wrapped call by R function name and normalized arguments.
+
+    Curated wrappers bind arguments against their signature with defaults
+    applied, so ``fetch_enr(2024, tidy=True)`` and
+    ``fetch_enr(end_year=2024, tidy=True, use_cache=False)`` share a key.
+    Pass-through partials of :func:`call_r_function` are keyed by the R name.
+    """
+    if isinstance(func, functools.partial) and func.func is call_r_function:
+        return _flight_key(func.args[0], func.args[1:] + args, {**func.keywords, **kwargs})
+    try:
+        bound = inspect.signature(func).bind(*args, **kwargs)
+    except (TypeError, ValueError):
+        return _flight_key(f"{func.__module__}.{func.__qualname__}", args, kwargs)
+    bound.apply_defaults()
+    return _flight_key(f"{func.__module__}.{func.__qualname__}", (), dict(bound.arguments))
+
+
+def single_flight_stats() -> dict[str, int]:
+    """
+    Report single-flight de-duplication counters for R calls.
+
+    Returns
+    -------
+    dict
+        ``calls`` and ``frames`` entries for :func:`call_r_function` and the
+        pandas-converting wrappers respectively, each with ``executed``
+        (calls that ran), ``coalesced`` (callers that shared an in-flight
+        result), ``bypassed`` (calls with unhashable arguments or a progress
+        callback) and
+        ``in_flight`` counts.
+    """
+    return {"calls": _call_flights.stats(), "frames": _frame_flights.stats()}
+
+
+def reset_single_flight_stats() -> None:
+    """Zero the single-flight counters."""
+    _call_flights.reset()
+    _frame_flights.reset()
+
+
+def _call_name(func: Callable) -> str:
+    """R function name for a pass-through partial, else the Python name."""
+    if isinstance(func, functools.partial) and func.func is call_r_function:
+        return func.args[0]
+    return getattr(func, "__name__", repr(func))
+
+
 def r_to_pandas(func: Callable) -> Callable:
-    """Convert an R data.frame and retain its source-result contract."""
+    """
+    Convert an R data.frame and retain its source-result contract.
+
+    Concurrent identical calls (same R function and normalized arguments)
+    share one R call and conversion, unless a progress callback is active.
+    Callers that joined an in-flight call get
+    a shallow copy of the leader's frame: the column data is shared and should
+    be treated as read-only. With profiling enabled (see
+    :mod:`njschooldata.profiling`) the leader's call and conversion are
+    profiled together; with tracing enabled (see :mod:`njschooldata.tracing`)
+    each call records a span tree.
+    """
     @functools.wraps(func)
     def wrapper(*args, **kwargs) -> pd.DataFrame:
         _require_rpy2()
+        if tracing.tracing_exporter() is None:
+            return _shared_frame(func, args, kwargs)
+        with tracing.span(
+            _call_name(func), **{"njsd.arguments": _describe_arguments(args, kwargs)}
+        ) as opened:
+            converted = _shared_frame(func, args, kwargs)
+            tracing.record_source_status(opened, converted)
+        return converted
+    return wrapper
+
+
+def _shared_frame(func: Callable, args: tuple, kwargs: dict) -> Any:
+    """Convert through the frame single-flight group."""
+    key = _bound_call_key(func, args, kwargs)
+    converted, shared = _frame_flights.do(
+        key,
+        lambda: profiling.profiled(
+            _call_name(func), args, kwargs, lambda: _convert(func, args, kwargs)
+        ),
+    )
+    if shared and isinstance(converted, pd.DataFrame):
+        converted = converted.copy(deep=False)
+    return converted
+
+
+def _describe_arguments(args: tuple, kwargs: dict, limit: int = 200) -> str:
+    text = ", ".join([*map(repr, args), *(f"{k}={v!r}" for k, v in kwargs.items())])
+    return text if len(text) <= limit else text[: limit - 3] + "..."
+
+
+def _convert(func: Callable, args: tuple, kwargs: dict) -> Any:
+    """
+    Run a wrapped R call and convert its result to pandas.
+
+    Memory accounting and the memory budget (see :mod:`njschooldata.memory`)
+    wrap the call; the budget is enforced before conversion starts.
+    """
+    with memory.account(_call_name(func)) as usage:
         result = func(*args, **kwargs)
+        usage.returned(result)
         source_results = None
         if not isinstance(result, pd.DataFrame):
             attributes = {
@@ -196,18 +402,21 @@ def r_to_pandas(func: Callable) -> Callable:
                 with localconverter(ro.default_converter + pandas2ri.converter):
                     source_results = pandas2ri.rpy2py(records)
 
-        # Use localconverter context for pandas conversion
-        with localconverter(ro.default_converter + pandas2ri.converter):
-            if isinstance(result, pd.DataFrame):
-                converted = result
-            elif hasattr(result, "to_pandas"):
-                converted = result.to_pandas()
-            else:
-                converted = pandas2ri.rpy2py(result)
+        if isinstance(result, pd.DataFrame):
+            converted = result
+        else:
+            # Use localconverter context for pandas conversion
+            with tracing.span("conversion"), localconverter(
+                ro.default_converter + pandas2ri.converter
+            ):
+                if hasattr(result, "to_pandas"):
+                    converted = result.to_pandas()
+                else:
+                    converted = pandas2ri.rpy2py(result)
         if isinstance(converted, pd.DataFrame) and isinstance(source_results, pd.DataFrame):
             converted.attrs["source_results"] = source_results
-        return converted
-    return wrapper
+        usage.finish(converted)
+    return converted
 
 
 def _python_to_r(value: Any) -> Any:
@@ -238,6 +447,11 @@ def _python_to_r(value: Any) -> Any:
     return value
 
 
+def _invoke_r(r_func: Any, r_args: list, r_kwargs: dict) -> Any:
+    """Evaluate an R function; profiles graft R stacks under this frame."""
+    return r_func(*r_args, **r_kwargs)
+
+
 def call_r_function(func_name: str, *args, **kwargs) -> Any:
     """
     Call an R function from njschooldata package.
@@ -254,13 +468,23 @@ def call_r_function(func_name: str, *args, **kwargs) -> Any:
     Returns
     -------
     Any
-        Result from the R function (typically an R data.frame).
+        Result from the R function (typically an R data.frame). Concurrent
+        calls with the same name and arguments share one R evaluation.
     """
     pkg = _get_r_package()
     r_func = getattr(pkg, func_name)
 
-    # Convert Python types to R types
-    r_args = [_python_to_r(arg) for arg in args]
-    r_kwargs = {key: _python_to_r(val) for key, val in kwargs.items()}
-
-    return r_func(*r_args, **r_kwargs)
+    def run():
+        # Convert Python types to R types
+        r_args = [_python_to_r(arg) for arg in args]
+        r_kwargs = {key: _python_to_r(val) for key, val in kwargs.items()}
+        with tracing.span("call_r_function", **{"njsd.function": func_name}) as opened:
+            if opened is not None:
+                tracing.install_r_hook()
+            return _invoke_r(r_func, r_args, r_kwargs)
+
+    result, _ = _call_flights.do(
+        _flight_key(func_name, args, kwargs),
+        lambda: profiling.profiled(func_name, args, kwargs, run),
+    )
+    return result
@@ -0,0 +1,66 @@
+"""Benchmark the free-disposal-hull frontier across all district-years.
+
+Compares the sort-and-sweep engine with pairwise dominance on a synthetic panel
+sized like the full TGES history (about 600 districts, 2001-2025, several
+outcomes). Run from ``python/``::
+
+    python benchmarks/bench_tges_frontier.py [--districts 600] [--outcomes 4]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from njschooldata.tges_analysis import _fdh_pairwise, fdh_efficiency
+
+
+def _panel(districts: int, years: int, outcomes: int, groups: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    n = districts * years * outcomes
+    spend = rng.lognormal(9.8, 0.2, n).round(-1)
+    outcome = rng.uniform(0, 100, n).round(1)
+    # peer groups are (year, outcome, enrollment band), as in tges_frontier()
+    year = np.repeat(np.arange(years), districts * outcomes)
+    which = np.tile(np.repeat(np.arange(outcomes), districts), years)
+    band = rng.integers(0, groups, n)
+    group = (year * outcomes + which) * groups + band
+    return spend, outcome, group
+
+
+def _timed(fn, repeat: int = 3) -> float:
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--districts", type=int, default=600)
+    parser.add_argument("--years", type=int, default=25)
+    parser.add_argument("--outcomes", type=int, default=4)
+    parser.add_argument("--groups", type=int, default=8)
+    args = parser.parse_args()
+
+    spend, outcome, group = _panel(args.districts, args.years, args.outcomes, args.groups)
+    ok = np.isfinite(spend) & np.isfinite(outcome)
+    print(f"{len(spend):,} district-year-outcome rows in {len(np.unique(group)):,} groups")
+
+    sweep = _timed(lambda: fdh_efficiency(spend, outcome, group))
+    pairwise = _timed(lambda: _fdh_pairwise(
+        spend[:, None], outcome[:, None], group, ok
+    ), repeat=1)
+
+    score, _ = fdh_efficiency(spend, outcome, group)
+    check, _ = _fdh_pairwise(spend[:, None], outcome[:, None], group, ok)
+    assert np.allclose(score, check, equal_nan=True), "engines disagree"
+
+    print(f"sort-and-sweep   {sweep * 1000:9.1f} ms")
+    print(f"pairwise         {pairwise * 1000:9.1f} ms  ({pairwise / sweep:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -25,7 +25,9 @@ from ._r_bridge import (
     get_r_package_version,
     list_r_fetchers,
     r_to_pandas,
+    single_flight_stats,
 )
+from . import progress
 from .enrollment import fetch_enr
 from .assessment import fetch_parcc, fetch_access
 from .graduation import fetch_grad_rate
@@ -80,6 +82,7 @@ _CURATED_EXPORTS = [
     "fetch_ell",
     "fetch_ell_multi",
     "get_r_package_version",
+    "single_flight_stats",
     "version_info",
     "RPackageCompatibilityError",
 ]
@@ -90,12 +93,19 @@ __all__ = sorted(set(_CURATED_EXPORTS).union(list_r_fetchers()))
 def _build_passthrough(name: str):
     """Create a lazy pandas-converting wrapper for an R package export."""
     wrapper = r_to_pandas(functools.partial(call_r_function, name))
+    if progress.reports_progress(name):
+        wrapper = progress.with_progress(wrapper)
     wrapper.__name__ = name
     wrapper.__qualname__ = name
     wrapper.__module__ = __name__
     wrapper.__doc__ = (
         f"Pass-through wrapper for the R njschooldata::{name} export."
     )
+    if progress.reports_progress(name):
+        wrapper.__doc__ += (
+            " Pass ``progress=`` a callable or tqdm bar to receive per-item"
+            " events (see :mod:`njschooldata.progress`)."
+        )
     return wrapper
 
 
@@ -14,8 +14,24 @@ CURATED_R_ARGUMENT_OVERRIDES = {
     },
 }
 
+# Keyword-only, Python-only parameters appended after the R formals. Each
+# defaults to None. ``progress`` installs a callback as R's
+# njschooldata.progress_callback option for the duration of the call.
+CURATED_PYTHON_ONLY_PARAMETERS = {
+    name: ["progress"]
+    for name in (
+        "fetch_ell_multi",
+        "fetch_facilities_multi",
+        "fetch_finance_multi",
+        "fetch_sped_placement_multi",
+    )
+}
+
 
 def expected_python_parameters(name: str, r_parameters: list[str]) -> list[str]:
     """Apply the narrow, documented R-to-Python signature mapping."""
     omitted = set(CURATED_R_ARGUMENT_OVERRIDES.get(name, {}).get("omit", []))
-    return [parameter for parameter in r_parameters if parameter not in omitted]
+    return [
+        *(parameter for parameter in r_parameters if parameter not in omitted),
+        *CURATED_PYTHON_ONLY_PARAMETERS.get(name, []),
+    ]
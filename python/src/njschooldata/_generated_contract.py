@@ -312,6 +312,28 @@ _CONTRACT = json.loads(r'''
       "tidy_years": [],
       "skipped_years": []
     }
+  },
+  "era_breaks": {
+    "break_set": ["njsla", "njsla", "njsla", "njsla", "njsla", "grad", "grad", "grad", "attendance", "attendance", "econ_disadv"],
+    "break_year": [2015, 2019, 2020, 2021, 2022, 2020, 2021, 2022, 2020, 2021, 2025],
+    "break_type": ["scale_break", "definition_change", "covid_gap", "covid_gap", "definition_change", "covid_gap", "definition_change", "definition_change", "covid_gap", "covid_gap", "definition_change"],
+    "label": ["NJASK/HSPA to PARCC", "PARCC to NJSLA", "COVID assessment cancellation", "COVID assessment cancellation", "NJSLA resumption after COVID gaps", "Class of 2020 graduation assessment waiver", "Federal graduation rate reporting split", "Federal graduation requirement exclusion expands", "COVID attendance disruption", "COVID attendance disruption", "Expanded meal eligibility and CEP reporting"],
+    "comparable_prior": [false, false, null, null, false, null, false, false, null, null, false]
+  },
+  "metric_registry": {
+    "domain": ["finance", "finance", "finance", "finance", "finance", "finance", "finance", "graduation", "graduation", "graduation", "graduation", "graduation", "graduation", "graduation", "graduation", "graduation", "graduation", "graduation", "graduation", "graduation", "graduation", "graduation", "graduation", "graduation", "assessment", "assessment", "assessment", "assessment", "assessment", "assessment", "assessment", "assessment", "assessment", "assessment", "assessment", "assessment", "assessment", "assessment", "assessment", "assessment", "assessment", "assessment", "assessment", "assessment", "assessment", "assessment", "assessment", "attendance", "attendance", "attendance", "attendance", "attendance", "attendance", "discipline", "discipline", "discipline", "discipline", "discipline", "discipline", "discipline", "discipline", "discipline", "discipline", "discipline", "discipline", "discipline", "discipline", "discipline", "discipline", "discipline", "discipline", "discipline", "discipline", "restraint", "restraint", "restraint", "restraint", "restraint", "restraint", "restraint", "restraint", "restraint", "restraint", "restraint", "restraint", "advanced", "advanced", "advanced", "advanced", "advanced", "advanced", "advanced", "advanced", "advanced", "advanced", "advanced", "advanced", "advanced", "advanced", "advanced", "advanced", "advanced", "advanced", "advanced", "advanced", "advanced", "advanced", "college_career", "college_career", "college_career", "college_career", "college_career", "college_career", "college_career", "college_career", "college_career", "college_career", "college_career", "college_career", "college_career", "college_career", "college_career", "college_career", "college_career", "college_career", "college_career", "college_career", "college_career", "college_career", "biliteracy", "biliteracy", "biliteracy", "biliteracy", "biliteracy", "biliteracy", "biliteracy", "biliteracy", "biliteracy", "biliteracy", "special_ed", "special_ed", "special_ed", "special_ed", "special_ed", "special_ed", "special_ed", "special_ed", "special_ed", "el", "el", "el", "el", "enrollment", "enrollment", "enrollment", "staff", "staff", "staff", "staff", "staff", "staff", "staff", "staff", "staff", "staff", "school_environment", "school_environment", "school_environment", "school_environment", "school_environment"],
+    "metric": ["per_pupil_total", "per_pupil_instruction", "per_pupil_support_services", "per_pupil_administration", "per_pupil_operations_maintenance", "per_pupil_food_service", "revenue_state", "grad_rate", "four_yr_grad_rate", "five_yr_grad_rate", "grad_rate_4yr", "grad_rate_5yr", "grad_rate_6yr", "cohort_count", "graduated_count", "continuing_rate", "non_continuing_rate", "persistence_rate", "graduated", "continuing", "non_continuing", "persisting", "graduation_rate_federal", "dropout_rate", "proficient_above", "scale_score_mean", "proficiency_rate", "mean_scaled_score", "valid_scores", "number_of_valid_scale_scores", "pct_l1", "pct_l2", "pct_l3", "pct_l4", "pct_l5", "pct_l6", "level_1", "level_2", "level_3", "level_4", "level_5", "level_1_percentage", "level_2_percentage", "level_3_percentage", "level_4_percentage", "science_proficiency_rate", "progress_toward_elp", "chronically_absent_rate", "chronic_absenteeism", "chronic_absenteeism_total", "attendance_total", "avg_days_absent", "median_days_absent", "discipline_rate", "suspension_rate", "number_of_removals", "percent_by_subgroup", "risk_ratio", "violence", "weapons", "vandalism", "substances", "hib", "harassment_intimidation_bullying_hib", "other_incidents", "total_unique_incidents", "incidents_per_100_students_enrolled", "incidents_per_100_students", "police_count", "arrested_count", "hib_alleged", "hib_confirmed", "total_hib_investigations", "restraint_rate", "seclusion_rate", "any_restraint_seclusion_count", "any_restraint_seclusion_pct", "restraint_count", "restraint_pct", "restraint_physical_count", "restraint_physical_pct", "restraint_mechanical_count", "restraint_mechanical_pct", "seclusion_count", "seclusion_pct", "ap_participation", "apib_coursework_school", "apib_coursework_state", "apib_exam_school", "apib_exam_state", "ap3_ib4_school", "ap3_ib4_state", "dual_enrollment_school", "dual_enrollment_state", "apib_pct_school", "apib_pct_district", "apib_pct_state", "dual_pct_school", "dual_pct_district", "dual_pct_state", "sle_pct_school", "sle_pct_district", "sle_pct_state", "students_enrolled", "students_tested", "ap_access_rate", "stem_participation_rate", "cte_participants", "cte_concentrators", "state_cte_participants", "state_cte_concentrators", "earned_one_credential", "credentials_earned", "students_participating", "pct_participating", "apprenticeship_count", "apprenticeship_8_year_total", "sat_participation", "act_participation", "psat_participation", "sat_participation_state", "act_participation_state", "psat_participation_state", "college_exam_avg_score_school", "college_exam_avg_score_district", "college_exam_avg_score_state", "college_exam_benchmark_school", "college_exam_benchmark_district", "college_exam_benchmark_state", "seals_earned", "pct_12th_graders", "total_seals_earned", "unique_students_earning_seals", "unique_students_earning_seals_pct", "multilingual_learners_earning_seals", "multilingual_learners_earning_seals_pct", "students_earning_seal_pct_school", "students_earning_seal_pct_district", "students_earning_seal_pct_state", "sped_classification_rate", "sped_rate", "sped_rate_no_speech", "sped_num", "sped_num_no_speech", "gened_num", "count", "percent", "subgroup_total", "el_share", "pct_of_enrollment", "el_count", "el_pct", "n_students", "pct", "pct_total_enr", "staff_retention", "retention_pct_district", "retention_pct_state", "retention_rate", "turnover_rate", "stability_index", "student_staff_ratio", "diversity_index", "racial_diversity_score", "gender_diversity_score", "length_of_day_minutes", "instruction_full_time_minutes", "instruction_shared_time_minutes", "student_device_ratio", "students_per_device"],
+    "label": ["Total expenditures per pupil", "Instruction expenditures per pupil", "Support services expenditures per pupil", "Administration expenditures per pupil", "Operations and maintenance expenditures per pupil", "Food service expenditures per pupil", "State aid revenue", "Graduation rate", "Four year graduation rate", "Five year graduation rate", "Four year graduation rate", "Five year graduation rate", "Six year graduation rate", "Graduation cohort count", "Graduated student count", "Continuing after six years rate", "Non continuing after six years rate", "High school persistence rate", "Graduated cohort outcome rate", "Continuing cohort outcome rate", "Non continuing cohort outcome rate", "High school persisting cohort rate", "Federal graduation rate", "Dropout rate", "Proficient or above rate", "Mean scale score", "NJSLA proficiency rate", "Mean scaled score", "Valid assessment scores", "Valid scale score count", "Percent at level 1", "Percent at level 2", "Percent at level 3", "Percent at level 4", "Percent at level 5", "Percent at level 6", "Percent at NJSLA level 1", "Percent at NJSLA level 2", "Percent at NJSLA level 3", "Percent at NJSLA level 4", "Percent at NJSLA level 5", "Science level 1 percentage", "Science level 2 percentage", "Science level 3 percentage", "Science level 4 percentage", "Science proficiency rate", "Progress toward English language proficiency", "Chronically absent rate", "Chronic absenteeism rate", "Total chronic absenteeism rate", "Total attendance rate", "Average days absent", "Median days absent", "Discipline incident rate", "Suspension rate", "Disciplinary removals", "Incident percent by subgroup", "Discipline risk ratio", "Violence incidents", "Weapons incidents", "Vandalism incidents", "Substance incidents", "HIB incidents", "HIB incidents", "Other incidents", "Total unique incidents", "Incidents per 100 students enrolled", "Incidents per 100 students", "Police notifications", "Student arrests", "HIB alleged investigations", "HIB confirmed investigations", "Total HIB investigations", "Restraint rate", "Seclusion rate", "Any restraint or seclusion count", "Any restraint or seclusion percent", "Restraint count", "Restraint percent", "Physical restraint count", "Physical restraint percent", "Mechanical restraint count", "Mechanical restraint percent", "Seclusion count", "Seclusion percent", "AP participation", "AP IB coursework participation", "AP IB statewide coursework participation", "AP IB exam participation", "AP IB statewide exam participation", "AP 3 plus or IB 4 plus rate", "AP 3 plus or IB 4 plus statewide rate", "Dual enrollment participation", "Dual enrollment statewide participation", "AP IB participation by group", "AP IB district participation by group", "AP IB state participation by group", "Dual enrollment participation by group", "Dual enrollment district participation by group", "Dual enrollment state participation by group", "Structured learning experience participation", "Structured learning experience district participation", "Structured learning experience state participation", "Students enrolled", "Students tested", "AP access rate", "STEM participation rate", "CTE participants", "CTE concentrators", "State CTE participants", "State CTE concentrators", "Students earning one credential", "Industry credentials earned", "Work based learning participants", "Work based learning participation rate", "Apprenticeship count", "Apprenticeship eight-year total", "SAT participation", "ACT participation", "PSAT participation", "SAT statewide participation", "ACT statewide participation", "PSAT statewide participation", "College entrance exam average score", "College entrance exam district average score", "College entrance exam statewide average score", "College entrance exam benchmark rate", "College entrance exam district benchmark rate", "College entrance exam statewide benchmark rate", "Seals of biliteracy earned", "Twelfth graders earning seals", "Total seals earned", "Unique students earning seals", "Unique students earning seals rate", "Multilingual learners earning seals", "Multilingual learners earning seals rate", "Students earning seal school rate", "Students earning seal district rate", "Students earning seal state rate", "Special education classification rate", "Special education classification rate", "Special education classification rate without speech", "Special education student count", "Special education student count without speech", "General education enrollment count", "Special education placement count", "Special education placement percent", "Special education placement subgroup total", "English learner share", "English learner share of enrollment", "English learner count", "English learner published percent", "Student count", "Student subgroup share", "Percent of total enrollment", "Staff retention", "District staff retention percent", "State staff retention percent", "Staff retention rate", "Staff turnover rate", "Staff stability index", "Student staff ratio", "Staff diversity index", "Racial diversity score", "Gender diversity score", "Length of school day", "Full time instruction minutes", "Shared time instruction minutes", "Students per device ratio", "Students per device"],
+    "unit": ["dollars", "dollars", "dollars", "dollars", "dollars", "dollars", "dollars", "percent", "percent", "percent", "percent", "percent", "percent", "count", "count", "percent", "percent", "percent", "percent", "percent", "percent", "percent", "percent", "percent", "percent", "scaled_score", "percent", "scaled_score", "count", "count", "percent", "percent", "percent", "percent", "percent", "percent", "percent", "percent", "percent", "percent", "percent", "percent", "percent", "percent", "percent", "percent", "percent", "percent", "percent", "percent", "percent", "days", "days", "ratio", "percent", "count", "percent", "ratio", "count", "count", "count", "count", "count", "count", "count", "count", "per 100 students", "per 100 students", "count", "count", "count", "count", "count", "percent", "percent", "count", "percent", "count", "percent", "count", "percent", "count", "percent", "count", "percent", "percent", "percent", "percent", "percent", "percent", "percent", "percent", "percent", "percent", "percent", "percent", "percent", "percent", "percent", "percent", "percent", "percent", "percent", "count", "count", "percent", "percent", "count", "count", "count", "count", "count", "count", "count", "percent", "count", "count", "percent", "percent", "percent", "percent", "percent", "percent", "score", "score", "score", "percent", "percent", "percent", "count", "percent", "count", "count", "percent", "count", "percent", "percent", "percent", "percent", "percent", "percent", "percent", "count", "count", "count", "count", "percent", "count", "percent", "percent", "count", "percent", "count", "percent", "percent", "percent", "percent", "percent", "percent", "percent", "index", "ratio", "index", "index", "index", "minutes", "minutes", "minutes", "ratio", "ratio"],
+    "polarity": ["neutral", "neutral", "neutral", "neutral", "neutral", "neutral", "neutral", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "neutral", "neutral", "neutral", "lower_is_better", "higher_is_better", "higher_is_better", "neutral", "lower_is_better", "higher_is_better", "higher_is_better", "lower_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "neutral", "neutral", "lower_is_better", "lower_is_better", "neutral", "higher_is_better", "higher_is_better", "higher_is_better", "lower_is_better", "lower_is_better", "neutral", "higher_is_better", "higher_is_better", "lower_is_better", "lower_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "lower_is_better", "lower_is_better", "lower_is_better", "higher_is_better", "lower_is_better", "lower_is_better", "lower_is_better", "lower_is_better", "lower_is_better", "neutral", "lower_is_better", "lower_is_better", "lower_is_better", "lower_is_better", "lower_is_better", "lower_is_better", "lower_is_better", "lower_is_better", "lower_is_better", "lower_is_better", "lower_is_better", "lower_is_better", "lower_is_better", "lower_is_better", "lower_is_better", "lower_is_better", "lower_is_better", "lower_is_better", "lower_is_better", "lower_is_better", "lower_is_better", "lower_is_better", "lower_is_better", "lower_is_better", "lower_is_better", "lower_is_better", "lower_is_better", "lower_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "neutral", "neutral", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "neutral", "neutral", "neutral", "neutral", "neutral", "neutral", "neutral", "neutral", "neutral", "neutral", "neutral", "neutral", "neutral", "neutral", "neutral", "neutral", "higher_is_better", "higher_is_better", "higher_is_better", "higher_is_better", "lower_is_better", "higher_is_better", "lower_is_better", "neutral", "neutral", "neutral", "neutral", "higher_is_better", "higher_is_better", "lower_is_better", "lower_is_better"],
+    "is_rate": [false, false, false, false, false, false, false, true, true, true, true, true, true, false, false, true, true, true, true, true, true, true, true, true, true, false, true, false, false, false, true, true, true, true, true, true, true, true, true, true, true, true, true, true, true, true, true, true, true, true, true, false, false, true, true, false, true, true, false, false, false, false, false, false, false, false, true, true, false, false, false, false, false, true, true, false, true, false, true, false, true, false, true, false, true, true, true, true, true, true, true, true, true, true, true, true, true, true, true, true, true, true, true, false, false, true, true, false, false, false, false, false, false, false, true, false, false, true, true, true, true, true, true, false, false, false, true, true, true, false, true, false, false, true, false, true, true, true, true, true, true, true, false, false, false, false, true, false, true, true, false, true, false, true, true, true, true, true, true, true, false, true, false, false, false, false, false, false, true, true],
+    "denominator_metric": [null, null, null, null, null, null, null, "cohort_count", "cohort_count", "cohort_count", "cohort_count", "cohort_count", "cohort_count", null, null, "cohort_count", "cohort_count", "cohort_count", "cohort_count", "cohort_count", "cohort_count", "cohort_count", "cohort_count", "cohort_count", "number_of_valid_scale_scores", null, "valid_scores", null, null, null, "valid_scores", "valid_scores", "valid_scores", "valid_scores", "valid_scores", "valid_scores", "valid_scores", "valid_scores", "valid_scores", "valid_scores", "valid_scores", "valid_scores", "valid_scores", "valid_scores", "valid_scores", "valid_scores", null, null, null, null, null, null, null, "n_students", "n_students", null, "total_incidents", "total_pop_rate", null, null, null, null, null, null, null, null, "n_students", "n_students", null, null, null, null, null, "n_students", "n_students", null, "n_students", null, "n_students", null, "n_students", null, "n_students", null, "n_students", "n_students", "n_students", "n_students", "n_students", "n_students", "n_students", "n_students", "n_students", "n_students", "n_students", "n_students", "n_students", "n_students", "n_students", "n_students", "n_students", "n_students", "n_students", null, null, "total_students", "n_total_students", null, null, null, null, null, null, null, "n_students", null, null, "n_students", "n_students", "n_students", "n_students", "n_students", "n_students", null, null, null, "n_students", "n_students", "n_students", null, "n_students", null, null, "n_students", null, "n_students", "n_students", "n_students", "n_students", "gened_num", "gened_num", "gened_num", null, null, null, null, "subgroup_total", null, "total_enrollment", "total_enrollment", null, "total_enrollment", null, "row_total", "row_total", "total_staff", "total_staff", "total_staff", "total_staff", "total_staff", null, "total_staff", null, null, null, null, null, null, "device_count", "device_count"],
+    "era_break_set": [null, null, null, null, null, null, null, "grad", "grad", "grad", "grad", "grad", "grad", null, null, "grad", "grad", "grad", "grad", "grad", "grad", "grad", "grad", "grad", "njsla", "njsla", "njsla", "njsla", "njsla", "njsla", "njsla", "njsla", "njsla", "njsla", "njsla", null, "njsla", "njsla", "njsla", "njsla", "njsla", "njsla", "njsla", "njsla", "njsla", "njsla", null, "attendance", "attendance", "attendance", "attendance", "attendance", "attendance", null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null],
+    "notes": ["Emitted by fetch_finance .finance_metrics", "Emitted by fetch_finance .finance_metrics", "Emitted by fetch_finance .finance_metrics", "Emitted by fetch_finance .finance_metrics", "Emitted by fetch_finance .finance_metrics", "Emitted by fetch_finance .finance_metrics", "Emitted by fetch_finance .finance_metrics", "Emitted by fetch_grad_rate", "Emitted by fetch_grad_rate when present", "Emitted by fetch_grad_rate when present", "Used by issue tests and cohort comparisons", "Used by issue tests and cohort comparisons", "Emitted by fetch_6yr_grad_rate", "Emitted by fetch_grad_rate and fetch_grad_count", "Emitted by fetch_grad_rate and fetch_grad_count", "Emitted by fetch_6yr_grad_rate", "Emitted by fetch_6yr_grad_rate", "Emitted by fetch_6yr_grad_rate", "Emitted by fetch_spr_grad_cohort", "Emitted by fetch_spr_grad_cohort", "Emitted by fetch_spr_grad_cohort", "Emitted by fetch_spr_grad_cohort", "Emitted by fetch_spr_fed_grad", "Emitted by fetch_dropout_rates source schema", "Emitted by fetch_parcc and ACCESS processing", "Emitted by fetch_parcc", "Emitted by fetch_spr_proficiency_by_test", "Emitted by fetch_spr_proficiency_by_test", "Emitted by assessment fetchers", "Emitted by processed assessment data", "Emitted by assessment processing", "Emitted by assessment processing", "Emitted by assessment processing", "Emitted by assessment processing", "Emitted by assessment processing", "Emitted by ACCESS processing", "Emitted by fetch_spr_proficiency_by_test", "Emitted by fetch_spr_proficiency_by_test", "Emitted by fetch_spr_proficiency_by_test", "Emitted by fetch_spr_proficiency_by_test", "Emitted by fetch_spr_proficiency_by_test", "Emitted by fetch_spr_science_grade", "Emitted by fetch_spr_science_grade", "Emitted by fetch_spr_science_grade", "Emitted by fetch_spr_science_grade", "Normalized analysis alias for science level 3 plus level 4", "Emitted by fetch_spr_elp_progress", "Emitted by fetch_chronic_absenteeism and fetch_absence", "Normalized analysis alias for chronically_absent_rate", "Emitted by fetch_essa_chronic_absenteeism", "Emitted by fetch_essa_chronic_absenteeism", "Emitted by fetch_days_absent when present", "Emitted by fetch_days_absent when present", "Emitted by calc_discipline_rates_by_subgroup", "Normalized analysis alias for discipline suspension rates", "Emitted by disciplinary removals source schema", "Emitted by calc_discipline_rates_by_subgroup", "Emitted by calc_discipline_rates_by_subgroup", "Emitted by fetch_police_notifications", "Emitted by fetch_police_notifications", "Emitted by fetch_police_notifications", "Emitted by fetch_police_notifications", "Emitted by fetch_police_notifications", "Legacy HIB column emitted by fetch_violence_vandalism_hib", "Emitted by fetch_police_notifications", "Emitted by fetch_violence_vandalism_hib", "Legacy rate emitted by fetch_violence_vandalism_hib", "Emitted by fetch_violence_vandalism_hib", "Emitted by SPR group grade detail helpers", "Emitted by fetch_arrests", "Emitted by fetch_hib_investigations", "Emitted by fetch_hib_investigations", "Emitted by fetch_hib_investigations", "Normalized analysis alias for restraint_pct", "Normalized analysis alias for seclusion_pct", "Emitted by fetch_restraint_seclusion", "Emitted by fetch_restraint_seclusion", "Emitted by fetch_restraint_seclusion", "Emitted by fetch_restraint_seclusion", "Emitted by fetch_restraint_seclusion", "Emitted by fetch_restraint_seclusion", "Emitted by fetch_restraint_seclusion", "Emitted by fetch_restraint_seclusion", "Emitted by fetch_restraint_seclusion", "Emitted by fetch_restraint_seclusion", "Normalized analysis alias for AP participation fields", "Emitted by fetch_ap_participation", "Emitted by fetch_courses for fetch_ap_participation state comparison", "Emitted by fetch_ap_participation", "Emitted by fetch_courses for fetch_ap_participation state comparison", "Emitted by fetch_ap_participation", "Emitted by fetch_courses for fetch_ap_participation state comparison", "Emitted by fetch_ap_participation", "Emitted by fetch_courses for fetch_ap_participation state comparison", "Emitted by fetch_advanced_course_access", "Emitted by fetch_advanced_course_access", "Emitted by fetch_advanced_course_access", "Emitted by fetch_advanced_course_access", "Emitted by fetch_advanced_course_access", "Emitted by fetch_advanced_course_access", "Emitted by fetch_advanced_course_access", "Emitted by fetch_advanced_course_access", "Emitted by fetch_advanced_course_access", "Emitted by advanced course and credential fetchers", "Emitted by fetch_advanced_course_access", "Emitted by calc_ap_access_rate", "Emitted by calc_stem_participation_rate", "Emitted by fetch_cte_participation", "Emitted by fetch_cte_participation", "Emitted by fetch_courses for fetch_cte_participation state comparison", "Emitted by fetch_courses for fetch_cte_participation state comparison", "Emitted by fetch_industry_credentials", "Emitted by fetch_industry_credentials", "Emitted by fetch_work_based_learning", "Emitted by fetch_work_based_learning", "Emitted by fetch_courses for fetch_apprenticeship_data", "Emitted by fetch_courses for fetch_apprenticeship_data", "Emitted by fetch_sat_participation and fetch_courses", "Emitted by fetch_sat_participation and fetch_courses", "Emitted by fetch_sat_participation and fetch_courses", "Emitted by fetch_courses for fetch_sat_participation state comparison", "Emitted by fetch_courses for fetch_sat_participation state comparison", "Emitted by fetch_courses for fetch_sat_participation state comparison", "Emitted by fetch_courses for fetch_sat_performance", "Emitted by fetch_courses for fetch_sat_performance", "Emitted by fetch_courses for fetch_sat_performance", "Emitted by fetch_courses for fetch_sat_performance", "Emitted by fetch_courses for fetch_sat_performance", "Emitted by fetch_courses for fetch_sat_performance", "Emitted by fetch_biliteracy_seal", "Emitted by fetch_biliteracy_seal", "Emitted by biliteracy summary and trends fetchers", "Emitted by fetch_biliteracy_summary", "Emitted by fetch_biliteracy_summary", "Emitted by fetch_biliteracy_summary", "Emitted by fetch_biliteracy_summary", "Emitted by fetch_biliteracy_by_group", "Emitted by fetch_biliteracy_by_group", "Emitted by fetch_biliteracy_by_group", "Normalized analysis alias for sped_rate", "Emitted by fetch_sped", "Emitted by fetch_sped", "Emitted by fetch_sped", "Emitted by fetch_sped when the no-speech column is published", "Emitted by fetch_sped", "Emitted by fetch_sped_placement", "Emitted by fetch_sped_placement", "Emitted by fetch_sped_placement", "Normalized analysis alias for pct_of_enrollment", "Emitted by fetch_ell tidy output", "Emitted by fetch_ell wide output", "Emitted by fetch_ell wide output", "Emitted by enrollment EL and other tidy outputs", "Emitted by tidy_enr", "Emitted by enrollment aggregations", "Normalized analysis alias for staff retention", "Emitted by fetch_spr_staff_retention", "Emitted by fetch_spr_staff_retention", "Emitted by analyze_retention_patterns", "Emitted by analyze_retention_patterns", "Emitted by analyze_retention_patterns", "Emitted by calc_student_staff_ratio", "Emitted by calc_staff_diversity_metrics", "Emitted by calc_staff_diversity_metrics", "Emitted by calc_staff_diversity_metrics", "Emitted by fetch_school_day", "Emitted by fetch_school_day", "Emitted by fetch_school_day", "Emitted by fetch_device_ratios", "Emitted by fetch_device_ratios"]
+  },
+  "subgroup_std_lookup": {
+    "raw_value": ["total population", "american indian", "black", "economically disadvantaged", "limited english proficiency", "multiracial", "pacific islander", "students with disabilities", "asian", "white", "hispanic", "hispanic/latino", "asian, native hawaiian, or pacific islander", "migrant students", "military-connected students", "students experiencing homelessness", "students in foster care", "non-binary/undesignated gender", "other", "male", "female", "non-binary", "total_population", "pacific_islander", "american_indian", "special_education", "sped_accomodations", "ed", "non_ed", "lep_current_former", "lep_current", "lep_former", "grade_other", "grade_06", "grade_07", "grade_08", "grade_09", "grade_10", "grade_11", "grade_12", "total"],
+    "subgroup_std": ["total_enrollment", "native_american", "black", "econ_disadv", "lep", "multiracial", "pacific_islander", "special_ed", "asian", "white", "hispanic", "hispanic", "asian_pacific_islander", "migrant", "military_connected", "homeless", "foster_care", "non_binary", "other", "male", "female", "non_binary", "total_enrollment", "pacific_islander", "native_american", "special_ed", null, "econ_disadv", "non_econ_disadv", "lep", "lep_current", "lep_former", null, null, null, null, null, null, null, null, "total_enrollment"]
   }
 }
 ''')
@@ -321,3 +343,6 @@ R_PACKAGE_MIN_VERSION = _CONTRACT["r_package_min_version"]
 R_PACKAGE_MAX_VERSION = _CONTRACT["r_package_max_version"]
 R_SIGNATURES = _CONTRACT["r_signatures"]
 SOURCE_COVERAGE = _CONTRACT["source_coverage"]
+ERA_BREAKS = _CONTRACT["era_breaks"]
+METRIC_REGISTRY = _CONTRACT["metric_registry"]
+SUBGROUP_STD_LOOKUP = _CONTRACT["subgroup_std_lookup"]
@@ -0,0 +1,520 @@
+"""Sparse-matrix charter host apportionment and sector aggregation.
+
+Python counterpart to ``id_charter_hosts()``, ``apply_charter_apportionment()``
+and the ``charter_sector_*_aggs()`` / ``allpublic_*_aggs()`` family in
+``R/charter.R``. The charter -> host relationships (``charter_city`` plus the
+year-aware ``charter_host_apportionment`` shares) are compiled once per year
+into a sparse matrix, and every domain is aggregated by the same sparse matrix
+product instead of a per-domain ``group_by``/``summarize``.
+
+Every count, rate, ``n_schools`` / ``pct_total_enr`` value and boolean
+``is_*`` flag produced by R is reproduced. Omitted: the text provenance
+columns (``districts``, ``schools``, ``tests``) from the R
+``*_aggregate_calcs()`` helpers and the allpublic enrollment ``n_charter``
+helper column. ``n_charter_rows`` is added for every domain.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Callable, Literal, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    from scipy import sparse
+except ImportError as e:  # pragma: no cover - exercised only without scipy
+    sparse = None
+    _SCIPY_IMPORT_ERROR = e
+else:
+    _SCIPY_IMPORT_ERROR = None
+
+__all__ = [
+    "CHARTER_DOMAINS",
+    "CharterApportionment",
+    "CharterDomain",
+    "load_charter_tables",
+]
+
+Sector = Literal["charter", "allpublic"]
+
+
+def _require_scipy() -> None:
+    """Raise a clear error if scipy is unavailable."""
+    if sparse is None:
+        raise ImportError(
+            "scipy is required for charter sector aggregation. Install the "
+            "Python package with the 'analysis' extra."
+        ) from _SCIPY_IMPORT_ERROR
+
+
+def _str(series: pd.Series) -> pd.Series:
+    return series.astype("string")
+
+
+def _charter_district_rows(df: pd.DataFrame) -> pd.Series:
+    """District-level charter rows (``'999'`` pre-2021, ``'888'`` after)."""
+    return (
+        (_str(df["county_id"]) == "80")
+        & (_str(df["district_id"]) != "9999")
+        & _str(df["school_id"]).isin(["888", "999"])
+    ).fillna(False)
+
+
+def _enr_sector_rows(df: pd.DataFrame) -> pd.Series:
+    district = _str(df["district_id"])
+    school = _str(df["school_id"])
+    modern = (
+        (df["end_year"] >= 2010)
+        & (_str(df["county_id"]) == "80")
+        & (district != "9999")
+        & (school == "999")
+    )
+    old = (
+        (df["end_year"] < 2010)
+        & (district != "9999")
+        & (school == "999")
+        & (district >= "6000")
+    )
+    return (modern | old).fillna(False)
+
+
+def _parcc_sector_rows(df: pd.DataFrame) -> pd.Series:
+    return (
+        (_str(df["county_id"]) == "80")
+        & (_str(df["district_id"]) != "9999")
+        & df["school_id"].isna()
+    ).fillna(False)
+
+
+def _is_district(df: pd.DataFrame) -> pd.Series:
+    return df["is_district"].fillna(False).astype(bool)
+
+
+def _matric_rows(base: Callable) -> Callable:
+    # 0s are reported as 0 -- distinct from NA -- so only NA matric rates drop
+    return lambda df: base(df) & df["enroll_any"].notna()
+
+
+def _all_rows(df: pd.DataFrame) -> pd.Series:
+    return pd.Series(True, index=df.index)
+
+
+@dataclass(frozen=True)
+class CharterDomain:
+    """How one data domain is filtered, grouped, summed and re-rated.
+
+    ``rates`` maps an output column to ``(numerator, denominator, scale,
+    digits)``; every rate is ``round(numerator / denominator * scale, digits)``
+    over the share-weighted sums. ``distinct_entities`` maps an output column
+    to a column whose distinct values are counted per aggregate row, and
+    ``share_of_total`` is ``(column, count, subgroup, keys)``: ``count``
+    divided by the ``count`` of the same host, year and ``keys`` in the
+    ``subgroup`` row. ``flags`` (``allpublic_flags`` for all-public rows,
+    defaulting to ``flags``) are set ``False``; ``computed`` maps further
+    columns to functions of the output frame.
+    """
+
+    year_col: str
+    dims: tuple[str, ...]
+    counts: tuple[str, ...]
+    rates: dict = field(default_factory=dict)
+    sector_rows: Callable = _all_rows
+    allpublic_rows: Callable = _is_district
+    allpublic_by_county: bool = True
+    weighted_means: dict = field(default_factory=dict)
+    count_entities: Optional[str] = None
+    distinct_entities: dict = field(default_factory=dict)
+    share_of_total: Optional[tuple] = None
+    flags: tuple[str, ...] = ("is_state", "is_district", "is_charter", "is_school")
+    allpublic_flags: Optional[tuple[str, ...]] = None
+    computed: dict = field(default_factory=dict)
+
+
+_PARCC_LEVELS = tuple(f"num_l{i}" for i in range(1, 6))
+_DFG_FLAGS = ("is_state", "is_dfg", "is_district", "is_charter", "is_school")
+
+CHARTER_DOMAINS = {
+    "enr": CharterDomain(
+        year_col="end_year",
+        dims=("program_code", "program_name", "grade_level", "subgroup"),
+        counts=("n_students",),
+        sector_rows=_enr_sector_rows,
+        count_entities="n_schools",
+        share_of_total=("pct_total_enr", "n_students", "total_enrollment", ("program_code",)),
+        flags=("is_state", "is_county", "is_district", "is_school"),
+        computed={
+            "cds_code": lambda out: pd.Series(pd.NA, index=out.index, dtype="string"),
+            "is_subprogram": lambda out: (_str(out["program_code"]) != "55").fillna(True),
+        },
+    ),
+    "parcc": CharterDomain(
+        year_col="testing_year",
+        dims=("assess_name", "test_name", "grade", "subgroup", "subgroup_type"),
+        counts=(
+            "number_enrolled", "number_not_tested",
+            "number_of_valid_scale_scores", *_PARCC_LEVELS,
+        ),
+        rates={
+            **{
+                f"pct_l{i}": (f"num_l{i}", "number_of_valid_scale_scores", 100, 1)
+                for i in range(1, 6)
+            },
+            "proficient_above": (
+                ("num_l4", "num_l5"), "number_of_valid_scale_scores", 100, 2
+            ),
+        },
+        sector_rows=_parcc_sector_rows,
+        weighted_means={
+            "scale_score_mean": ("number_of_valid_scale_scores", 2),
+        },
+        distinct_entities={"n_schools": "school_name"},
+        flags=_DFG_FLAGS,
+    ),
+    "grate": CharterDomain(
+        year_col="end_year",
+        dims=("subgroup", "methodology"),
+        counts=("cohort_count", "graduated_count"),
+        rates={"grad_rate": ("graduated_count", "cohort_count", 1, 3)},
+        sector_rows=_charter_district_rows,
+        allpublic_flags=_DFG_FLAGS,
+    ),
+    "gcount": CharterDomain(
+        year_col="end_year",
+        dims=("subgroup",),
+        counts=("cohort_count", "graduated_count"),
+        sector_rows=_charter_district_rows,
+        allpublic_flags=_DFG_FLAGS,
+    ),
+    "spec_pop": CharterDomain(
+        year_col="end_year",
+        dims=("subgroup",),
+        counts=("n_students", "n_enrolled"),
+        rates={"percent": ("n_students", "n_enrolled", 100, 1)},
+        sector_rows=lambda df: (_str(df["school_id"]) != "999").fillna(False),
+        allpublic_rows=lambda df: (_str(df["district_id"]) != "999").fillna(False),
+        allpublic_by_county=False,
+        flags=("is_district", "is_school"),
+    ),
+    "sped": CharterDomain(
+        year_col="end_year",
+        dims=(),
+        counts=("gened_num", "sped_num", "sped_num_no_speech"),
+        rates={
+            "sped_rate": ("sped_num", "gened_num", 100, 2),
+            "sped_rate_no_speech": ("sped_num_no_speech", "gened_num", 100, 2),
+        },
+        allpublic_rows=_all_rows,
+        allpublic_by_county=False,
+        flags=("is_district", "is_school"),
+    ),
+    "matric": CharterDomain(
+        year_col="end_year",
+        dims=("is_16mo", "subgroup"),
+        counts=(
+            "graduated_count", "cohort_count", "enroll_any_count",
+            "enroll_2yr_count", "enroll_4yr_count",
+        ),
+        rates={
+            "enroll_any": ("enroll_any_count", "graduated_count", 100, 1),
+            "enroll_2yr": ("enroll_2yr_count", "enroll_any_count", 100, 1),
+            "enroll_4yr": ("enroll_4yr_count", "enroll_any_count", 100, 1),
+        },
+        sector_rows=_matric_rows(_charter_district_rows),
+        allpublic_rows=_matric_rows(_is_district),
+        allpublic_flags=_DFG_FLAGS,
+    ),
+}
+
+
+_HOST_COLUMNS = [
+    "host_county_id", "host_county_name", "host_district_id", "host_district_name",
+]
+
+
+class CharterApportionment:
+    """
+    Compiled charter -> host city apportionment.
+
+    Parameters
+    ----------
+    charter_city : pd.DataFrame
+        The 1:1 ``charter_city`` host map.
+    apportionment : pd.DataFrame or None, default None
+        ``charter_host_apportionment`` shares by ``district_id`` and
+        ``end_year``. Shares must sum to 1.0 per charter-year.
+    """
+
+    def __init__(
+        self,
+        charter_city: pd.DataFrame,
+        apportionment: Optional[pd.DataFrame] = None,
+    ):
+        _require_scipy()
+        city = charter_city.astype({"district_id": str, **dict.fromkeys(_HOST_COLUMNS, str)})
+        if apportionment is None:
+            apportionment = pd.DataFrame(
+                columns=["district_id", "end_year", *_HOST_COLUMNS, "share"]
+            )
+        appt = apportionment.astype({"district_id": str, **dict.fromkeys(_HOST_COLUMNS, str)})
+        appt = appt.astype({"end_year": int, "share": float})
+
+        totals = appt.groupby(["district_id", "end_year"])["share"].sum()
+        bad = totals[(totals - 1.0).abs() > 1e-9]
+        if len(bad):
+            raise ValueError(
+                "charter_host_apportionment shares do not sum to 1.0 for: "
+                + ", ".join(f"{d}/{y}" for d, y in bad.index)
+            )
+
+        self.hosts = (
+            pd.concat([city[_HOST_COLUMNS], appt[_HOST_COLUMNS]])
+            .drop_duplicates(["host_county_id", "host_district_id"])
+            .reset_index(drop=True)
+        )
+        self.charters = pd.Index(city["district_id"].unique())
+        host_index = {
+            key: i for i, key in enumerate(
+                zip(self.hosts["host_county_id"], self.hosts["host_district_id"])
+            )
+        }
+        self._default_hosts = np.array([
+            host_index[key] for key in
+            city.drop_duplicates("district_id")
+            .set_index("district_id")
+            .reindex(self.charters)[["host_county_id", "host_district_id"]]
+            .itertuples(index=False, name=None)
+        ])
+        self._appt = {
+            year: [
+                (self.charters.get_loc(d), host_index[(c, h)], s)
+                for d, c, h, s in zip(
+                    rows["district_id"], rows["host_county_id"],
+                    rows["host_district_id"], rows["share"],
+                )
+                if d in self.charters
+            ]
+            for year, rows in appt.groupby("end_year")
+        }
+        self._compiled = {}
+
+    def host_matrix(self, end_year: Optional[int] = None):
+        """
+        Return the ``charters x hosts`` CSR share matrix for one year.
+
+        Charters with an apportionment entry for ``end_year`` are split across
+        their host cities; all others carry share 1.0 to their ``charter_city``
+        host. ``end_year=None`` gives the unapportioned 1:1 assignment, as R does
+        for year-less inputs.
+        """
+        key = None if end_year is None else int(end_year)
+        if key not in self._compiled:
+            n_charters = len(self.charters)
+            entries = self._appt.get(key, []) if key is not None else []
+            split = {charter for charter, _, _ in entries}
+            keep = [i for i in range(n_charters) if i not in split]
+            rows = keep + [charter for charter, _, _ in entries]
+            cols = [self._default_hosts[i] for i in keep] + [host for _, host, _ in entries]
+            data = [1.0] * len(keep) + [share for _, _, share in entries]
+            self._compiled[key] = sparse.csr_matrix(
+                (data, (rows, cols)), shape=(n_charters, len(self.hosts))
+            )
+        return self._compiled[key]
+
+    def _row_hosts(self, df: pd.DataFrame, year_col: Optional[str], sector: Sector,
+                   by_county: bool) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Return COO ``(row, host, share, is_charter)`` triplets for df rows."""
+        districts = df["district_id"].astype(str).to_numpy()
+        charter_pos = self.charters.get_indexer(districts)
+        is_charter_row = charter_pos >= 0
+
+        row_parts, host_parts, share_parts = [], [], []
+        years = (
+            df[year_col].to_numpy() if year_col and year_col in df.columns
+            else np.full(len(df), None)
+        )
+        for year in pd.unique(years[is_charter_row]):
+            rows = np.flatnonzero(is_charter_row & (years == year))
+            mapped = self.host_matrix(None if pd.isna(year) else year)[charter_pos[rows]]
+            mapped = mapped.tocoo()
+            row_parts.append(rows[mapped.row])
+            host_parts.append(mapped.col)
+            share_parts.append(mapped.data)
+
+        if sector == "allpublic":
+            if by_county:
+                host_keys = zip(self.hosts["host_county_id"], self.hosts["host_district_id"])
+                row_keys = zip(df["county_id"].astype(str), districts)
+            else:
+                host_keys = zip(self.hosts["host_district_id"])
+                row_keys = zip(districts)
+            host_of = {}
+            for idx, key in enumerate(host_keys):
+                host_of.setdefault(key, idx)
+            own = np.array([host_of.get(key, -1) for key in row_keys], dtype=np.int64)
+            rows = np.flatnonzero(~is_charter_row & (own >= 0))
+            row_parts.append(rows)
+            host_parts.append(own[rows])
+            share_parts.append(np.ones(len(rows)))
+            if not by_county:
+                # group by district_id alone, as the R helpers do
+                canonical = np.array([host_of[(d,)] for d in self.hosts["host_district_id"]])
+                host_parts = [canonical[part] for part in host_parts]
+
+        row = np.concatenate(row_parts) if row_parts else np.empty(0, np.int64)
+        host = np.concatenate(host_parts) if host_parts else np.empty(0, np.int64)
+        share = np.concatenate(share_parts) if share_parts else np.empty(0)
+        return row, host, share, is_charter_row
+
+    def aggregate(
+        self,
+        df: pd.DataFrame,
+        domain: str,
+        sector: Sector = "charter",
+    ) -> pd.DataFrame:
+        """
+        Compute charter sector or all-public aggregates for a tidy frame.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Tidy frame for ``domain`` (e.g. output of ``fetch_enr(tidy=True)``).
+        domain : str
+            One of ``CHARTER_DOMAINS``: ``"enr"``, ``"parcc"``, ``"grate"``,
+            ``"gcount"``, ``"spec_pop"``, ``"sped"`` or ``"matric"``.
+        sector : {"charter", "allpublic"}, default "charter"
+            ``"charter"`` rolls charters up to their host city;
+            ``"allpublic"`` adds host-district rows and keeps only hosts with
+            at least one charter row.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per host city, year and domain dimension with share-weighted
+            counts, recomputed rates, ``n_charter_rows``, the domain's R
+            ``is_*`` flags and pseudo ids (``<host>C`` / ``<host>A``).
+        """
+        if domain not in CHARTER_DOMAINS:
+            raise ValueError(f"domain must be one of {sorted(CHARTER_DOMAINS)}")
+        if sector not in ("charter", "allpublic"):
+            raise ValueError("sector must be 'charter' or 'allpublic'")
+        spec = CHARTER_DOMAINS[domain]
+
+        mask = (spec.sector_rows if sector == "charter" else spec.allpublic_rows)(df)
+        df = df.loc[mask.to_numpy()].reset_index(drop=True)
+        year_col = spec.year_col if spec.year_col in df.columns else None
+        # like apply_charter_apportionment(), shares are year-aware only for
+        # frames carrying end_year; others use the 1:1 charter_city host
+        appt_year_col = "end_year" if "end_year" in df.columns else None
+        row, host, share, is_charter_row = self._row_hosts(
+            df, appt_year_col, sector, spec.allpublic_by_county
+        )
+
+        dim_cols = [c for c in ((year_col,) if year_col else ()) + spec.dims]
+        dim_codes = (
+            df.groupby(dim_cols, sort=False, dropna=False).ngroup().to_numpy()
+            if dim_cols else np.zeros(len(df), dtype=np.int64)
+        )
+        n_dims = int(dim_codes.max()) + 1 if len(df) else 1
+        cols = host * n_dims + dim_codes[row]
+        shape = (len(df), len(self.hosts) * n_dims)
+        weights = sparse.csr_matrix((share, (row, cols)), shape=shape)
+        pattern = sparse.csr_matrix((np.ones(len(row)), (row, cols)), shape=shape)
+
+        values = {}
+        for col in spec.counts:
+            values[col] = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float)
+        for col, (weight_col, _) in spec.weighted_means.items():
+            values[f"_{col}_numerator"] = (
+                pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float)
+                * values[weight_col]
+            )
+        values["_ones"] = np.ones(len(df))
+        X = np.nan_to_num(np.column_stack(list(values.values()))) if len(df) else (
+            np.empty((0, len(values)))
+        )
+        sums = np.asarray(weights.T @ X)
+        n_rows = np.asarray(pattern.T @ np.ones(len(df))).ravel()
+        n_charter = np.asarray(pattern.T @ is_charter_row.astype(float)).ravel()
+
+        keep = n_rows > 0
+        if sector == "allpublic":
+            keep &= n_charter > 0
+        out_cols = np.flatnonzero(keep)
+        sums = sums[out_cols]
+        names = list(values)
+
+        first_row = pd.Series(np.arange(len(df))).groupby(dim_codes).first().to_numpy()
+        out = df.loc[first_row[out_cols % n_dims], dim_cols].reset_index(drop=True)
+        hosts = self.hosts.iloc[out_cols // n_dims].reset_index(drop=True)
+        out.insert(len(dim_cols[:1]), "county_id", hosts["host_county_id"])
+        out.insert(len(dim_cols[:1]) + 1, "county_name", hosts["host_county_name"])
+
+        suffix, label, school = (
+            ("C", " Charters", "Charter Sector Total") if sector == "charter"
+            else ("A", " All Public", "All Public Total")
+        )
+        out.insert(len(dim_cols[:1]) + 2, "district_id", hosts["host_district_id"] + suffix)
+        out.insert(len(dim_cols[:1]) + 3, "district_name", hosts["host_district_name"] + label)
+        out.insert(len(dim_cols[:1]) + 4, "school_id", f"999{suffix}")
+        out.insert(len(dim_cols[:1]) + 5, "school_name", school)
+
+        for i, col in enumerate(spec.counts):
+            out[col] = sums[:, i]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for col, (weight_col, digits) in spec.weighted_means.items():
+                numerator = sums[:, names.index(f"_{col}_numerator")]
+                out[col] = np.round(numerator / out[weight_col].to_numpy(), digits)
+            for col, (numerator, denominator, scale, digits) in spec.rates.items():
+                numerator = (numerator,) if isinstance(numerator, str) else numerator
+                top = sum(out[c].to_numpy() for c in numerator)
+                out[col] = np.round(top / out[denominator].to_numpy() * scale, digits)
+        if spec.count_entities:
+            out[spec.count_entities] = sums[:, names.index("_ones")]
+        for col, source in spec.distinct_entities.items():
+            # n_distinct() semantics: NA counts as one value
+            codes, _ = pd.factorize(df[source], use_na_sentinel=False)
+            pairs = np.unique(np.column_stack([cols, codes[row]]), axis=0)
+            out[col] = np.bincount(pairs[:, 0], minlength=shape[1])[out_cols]
+        if spec.share_of_total:
+            column, count, subgroup, keys = spec.share_of_total
+            key_cols = [*dim_cols[:1], "district_id", *keys]
+            totals = out.loc[out["subgroup"] == subgroup, [*key_cols, count]]
+            out = out.merge(
+                totals.rename(columns={count: "_row_total"}),
+                on=key_cols, how="left", validate="many_to_one",
+            )
+            out[column] = out[count] / out.pop("_row_total")
+        out["n_charter_rows"] = n_charter[out_cols].astype(int)
+        flags = spec.flags if sector == "charter" else (spec.allpublic_flags or spec.flags)
+        for flag in flags:
+            out[flag] = False
+        out["is_charter_sector"] = sector == "charter"
+        out["is_allpublic"] = sector == "allpublic"
+        for col, compute in spec.computed.items():
+            out[col] = compute(out)
+        return out
+
+
+def load_charter_tables() -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Read ``charter_city`` and ``charter_host_apportionment`` from the R package.
+
+    Returns
+    -------
+    tuple of pd.DataFrame
+        ``(charter_city, charter_host_apportionment)``, ready for
+        :class:`CharterApportionment`.
+    """
+    from ._r_bridge import _get_r_package, localconverter, pandas2ri, ro
+
+    _get_r_package()
+    tables = []
+    for name in ("charter_city", "charter_host_apportionment"):
+        with localconverter(ro.default_converter + pandas2ri.converter):
+            table = ro.r(f"njschooldata::{name}")
+            if not isinstance(table, pd.DataFrame):
+                table = pandas2ri.rpy2py(table)
+        tables.append(table)
+    return tables[0], tables[1]
@@ -1,8 +1,11 @@
 """English Learner population data functions."""
 
+from typing import Any
+
 import pandas as pd
 
 from ._r_bridge import call_r_function, r_to_pandas
+from .progress import report_progress
 
 
 @r_to_pandas
@@ -54,6 +57,8 @@ def fetch_ell_multi(
     use_cache: bool = False,
     with_status: bool = False,
     allow_partial: bool = False,
+    *,
+    progress: Any = None,
 ) -> pd.DataFrame:
     """
     Fetch New Jersey English Learner population data for multiple years.
@@ -72,17 +77,21 @@ def fetch_ell_multi(
         If False, any unavailable or failed year aborts. If True, successful
         years are returned and per-year source status is available in
         ``DataFrame.attrs["source_results"]``.
+    progress : callable or tqdm bar, optional
+        Receives a :class:`~njschooldata.progress.ProgressEvent` as each year
+        starts and finishes, or advances a ``tqdm`` bar once per year.
 
     Returns
     -------
     pd.DataFrame
         Combined EL population data for all available requested years.
     """
-    return call_r_function(
-        "fetch_ell_multi",
-        end_years,
-        tidy=tidy,
-        use_cache=use_cache,
-        with_status=with_status,
-        allow_partial=allow_partial,
-    )
+    with report_progress(progress):
+        return call_r_function(
+            "fetch_ell_multi",
+            end_years,
+            tidy=tidy,
+            use_cache=use_cache,
+            with_status=with_status,
+            allow_partial=allow_partial,
+        )
@@ -0,0 +1,365 @@
+"""Era tagging and break-span guards for frames you already hold.
+
+Python counterpart to ``get_era_breaks()``, ``tag_era()`` and
+``assert_no_break_span()`` in ``R/era_breaks.R``. The bundled ``era_breaks``
+metadata (exported into the generated contract) is compiled once per break set
+into sorted NumPy breakpoint arrays; tagging is then a single
+``searchsorted`` over the year column and span checks reduce to two
+``searchsorted`` calls per group, without copying the frame.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from ._generated_contract import ERA_BREAKS
+
+__all__ = [
+    "ERA_BOUNDARY_BREAK_TYPES",
+    "ERA_BREAK_TYPES",
+    "ERA_TREND_GUARD_BREAK_TYPES",
+    "EraBreakSet",
+    "assert_no_break_span",
+    "break_span_violations",
+    "era_break_set",
+    "era_ids",
+    "get_era_breaks",
+    "tag_era",
+]
+
+ERA_BREAK_TYPES = ("scale_break", "covid_gap", "definition_change")
+ERA_BOUNDARY_BREAK_TYPES = ("scale_break", "definition_change")
+ERA_TREND_GUARD_BREAK_TYPES = ("scale_break", "definition_change", "covid_gap")
+
+# Integer stand-in for a missing year inside the compiled arrays.
+_MISSING = np.iinfo(np.int64).min
+
+
+def get_era_breaks(break_set: Union[str, Iterable[str], None] = None) -> pd.DataFrame:
+    """
+    Return the bundled era-break metadata.
+
+    Parameters
+    ----------
+    break_set : str or list of str, optional
+        Break-set keys to return; all break sets when omitted.
+
+    Returns
+    -------
+    pd.DataFrame
+        ``break_set``, ``break_year``, ``break_type``, ``label`` and
+        ``comparable_prior``.
+    """
+    breaks = pd.DataFrame(ERA_BREAKS)
+    breaks["break_year"] = breaks["break_year"].astype(np.int64)
+    breaks["comparable_prior"] = breaks["comparable_prior"].astype("boolean")
+    unsupported = sorted(set(breaks["break_type"]) - set(ERA_BREAK_TYPES))
+    if unsupported:
+        raise ValueError(
+            "era_breaks contains unsupported break_type value(s): "
+            f"{', '.join(unsupported)}."
+        )
+    if break_set is not None:
+        wanted = [break_set] if isinstance(break_set, str) else list(break_set)
+        breaks = breaks[breaks["break_set"].isin(wanted)].reset_index(drop=True)
+    return breaks
+
+
+@dataclass(frozen=True)
+class EraBreakSet:
+    """
+    One break set compiled into sorted breakpoint arrays.
+
+    Attributes
+    ----------
+    name : str
+        Break-set key.
+    breaks : pd.DataFrame
+        Rows of :func:`get_era_breaks` for this set, ordered by year and type.
+    boundary_years : np.ndarray
+        Sorted unique ``scale_break`` / ``definition_change`` years; each
+        starts a new era.
+    break_years : np.ndarray
+        Sorted unique years of every break type.
+    gap_years : np.ndarray
+        Sorted unique ``covid_gap`` years.
+    """
+
+    name: str
+    breaks: pd.DataFrame
+    boundary_years: np.ndarray
+    break_years: np.ndarray
+    gap_years: np.ndarray
+
+    def era_ids(self, years: np.ndarray) -> np.ndarray:
+        """Era of each integer year (1-based); ``-1`` for missing years."""
+        era = np.searchsorted(self.boundary_years, years, side="right") + 1
+        return np.where(years == _MISSING, -1, era)
+
+    def is_break_year(self, years: np.ndarray) -> np.ndarray:
+        """Whether each year is any break year of the set."""
+        if not len(self.break_years):
+            return np.zeros(len(years), dtype=bool)
+        pos = np.searchsorted(self.break_years, years)
+        pos = np.minimum(pos, len(self.break_years) - 1)
+        return (self.break_years[pos] == years) & (years != _MISSING)
+
+    def span_violations(self, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+        """Whether each ``[start, end]`` span crosses a boundary or covers a gap."""
+        boundary = np.searchsorted(self.boundary_years, end, side="right") - (
+            np.searchsorted(self.boundary_years, start, side="right")
+        )
+        gaps = np.searchsorted(self.gap_years, end, side="right") - (
+            np.searchsorted(self.gap_years, start, side="left")
+        )
+        return (start < end) & ((boundary > 0) | (gaps > 0))
+
+
+def _validate_single_break_set(break_set) -> str:
+    if not isinstance(break_set, str) or not break_set:
+        raise ValueError("`break_set` must be a single non-empty character value.")
+    return break_set
+
+
+@lru_cache(maxsize=None)
+def era_break_set(break_set: str) -> EraBreakSet:
+    """
+    Compile (once) and return a break set.
+
+    Raises
+    ------
+    ValueError
+        If ``break_set`` is not a known key.
+    """
+    name = _validate_single_break_set(break_set)
+    breaks = get_era_breaks(name)
+    if breaks.empty:
+        available = ", ".join(sorted(set(get_era_breaks()["break_set"])))
+        raise ValueError(
+            f"Unknown break_set '{name}'. Available break_set values: {available}."
+        )
+    breaks = breaks.sort_values(["break_year", "break_type"], kind="stable")
+    breaks = breaks.reset_index(drop=True)
+    years = breaks["break_year"].to_numpy(dtype=np.int64)
+    types = breaks["break_type"].to_numpy()
+    return EraBreakSet(
+        name=name,
+        breaks=breaks,
+        boundary_years=np.unique(years[np.isin(types, ERA_BOUNDARY_BREAK_TYPES)]),
+        break_years=np.unique(years),
+        gap_years=np.unique(years[types == "covid_gap"]),
+    )
+
+
+def _as_era_years(years, arg: str) -> np.ndarray:
+    """Validate whole-number years; missing values become ``_MISSING``."""
+    if isinstance(years, (pd.Series, pd.Index)):
+        values = years
+    else:
+        values = pd.Series(np.asarray(years) if not np.isscalar(years) else [years])
+    if pd.api.types.is_datetime64_any_dtype(values) or isinstance(
+        values.dtype, pd.PeriodDtype
+    ):
+        raise ValueError(f"`{arg}` must contain ending years, not date-time values.")
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype(object)
+
+    if pd.api.types.is_integer_dtype(values) and not values.hasnans:
+        return values.to_numpy(dtype=np.int64)
+
+    numeric = pd.to_numeric(values, errors="coerce").to_numpy(
+        dtype=np.float64, na_value=np.nan
+    )
+    present = values.notna().to_numpy()
+    bad = present & (~np.isfinite(numeric) | (numeric != np.floor(numeric)))
+    if bad.any():
+        shown = ", ".join(pd.unique(values[bad].astype(str)))
+        raise ValueError(
+            f"`{arg}` must contain whole-number ending years. Invalid value(s): "
+            f"{shown}."
+        )
+    out = np.full(len(numeric), _MISSING, dtype=np.int64)
+    out[present] = numeric[present].astype(np.int64)
+    return out
+
+
+def era_ids(years, break_set: str) -> pd.DataFrame:
+    """
+    Compute ``era_id`` and ``is_break_year`` for a vector of years.
+
+    Returns
+    -------
+    pd.DataFrame
+        ``era_id`` (``Int64``; missing for missing years) and
+        ``is_break_year`` columns, aligned with ``years``.
+    """
+    columns = _era_columns(_as_era_years(years, "years"), era_break_set(break_set))
+    index = years.index if isinstance(years, pd.Series) else None
+    return pd.DataFrame(columns, index=index)
+
+
+def _era_columns(years: np.ndarray, compiled: EraBreakSet) -> dict:
+    era = pd.array(compiled.era_ids(years), dtype="Int64")
+    era[years == _MISSING] = pd.NA
+    return {"era_id": era, "is_break_year": compiled.is_break_year(years)}
+
+
+def tag_era(df: pd.DataFrame, break_set: str, year_col: str = "end_year") -> pd.DataFrame:
+    """
+    Add ``era_id`` and ``is_break_year`` columns.
+
+    ``era_id`` starts at 1 and increments at each ``scale_break`` or
+    ``definition_change`` year (the break year starts the new era). COVID gap
+    years set ``is_break_year`` but do not start a new era.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Frame with a year column.
+    break_set : str
+        Break-set key, e.g. ``"njsla"`` or ``"attendance"``.
+    year_col : str, default "end_year"
+        Name of the year column.
+
+    Returns
+    -------
+    pd.DataFrame
+        A shallow copy of ``df`` with the two columns added; existing column
+        data is shared with ``df``, not copied.
+    """
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("`df` must be a data frame.")
+    if not isinstance(year_col, str):
+        raise ValueError("`year_col` must be a single column name.")
+    if year_col not in df.columns:
+        raise ValueError(f"Column `{year_col}` was not found in `df`.")
+
+    compiled = era_break_set(break_set)
+    years = _as_era_years(df[year_col], year_col)
+    out = df.copy(deep=False)
+    for name, values in _era_columns(years, compiled).items():
+        out[name] = values
+    return out
+
+
+def _format_violations(breaks: pd.DataFrame) -> str:
+    return ", ".join(
+        f"{year} {kind} ({label})"
+        for year, kind, label in zip(
+            breaks["break_year"], breaks["break_type"], breaks["label"]
+        )
+    )
+
+
+def assert_no_break_span(years, break_set: str):
+    """
+    Raise if the span of ``years`` crosses an era break.
+
+    The span from ``min(years)`` to ``max(years)`` may not cross a
+    ``scale_break`` / ``definition_change`` year or include a ``covid_gap``
+    year. Single-year inputs never span a break.
+
+    Returns
+    -------
+    years
+        The input, unchanged, when the span is valid.
+
+    Raises
+    ------
+    ValueError
+        Naming every violated break.
+    """
+    values = _as_era_years(years, "years")
+    values = values[values != _MISSING]
+    if len(np.unique(values)) <= 1:
+        return years
+
+    start, end = int(values.min()), int(values.max())
+    compiled = era_break_set(break_set)
+    breaks = compiled.breaks
+    kind = breaks["break_type"]
+    year = breaks["break_year"]
+    boundary = kind.isin(ERA_BOUNDARY_BREAK_TYPES) & (start < year) & (end >= year)
+    gap = (kind == "covid_gap") & (start <= year) & (end >= year)
+    violations = breaks[boundary | gap]
+    if not violations.empty:
+        raise ValueError(
+            f"Year span {start}-{end} crosses era break(s) for break_set "
+            f"'{compiled.name}': {_format_violations(violations)}. Split the trend "
+            "at these years or call tag_era() and group by era_id."
+        )
+    return years
+
+
+def break_span_violations(
+    df: pd.DataFrame,
+    break_set: str,
+    by: Optional[Sequence[str]] = None,
+    year_col: str = "end_year",
+) -> pd.DataFrame:
+    """
+    Check :func:`assert_no_break_span` for every group of a panel at once.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Long panel with a year column.
+    break_set : str
+        Break-set key.
+    by : list of str, optional
+        Columns identifying one trend line (e.g. district and subgroup); the
+        whole frame is one span when omitted.
+    year_col : str, default "end_year"
+        Name of the year column.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per violating group with ``start_year``, ``end_year`` and the
+        violated ``breaks`` description; empty when every span is valid.
+    """
+    compiled = era_break_set(break_set)
+    years = _as_era_years(df[year_col], year_col)
+    present = years != _MISSING
+    by = list(by or [])
+
+    if by:
+        code = df.groupby(by, sort=False, dropna=False).ngroup().to_numpy()
+    else:
+        code = np.zeros(len(df), dtype=np.int64)
+    code = code[present]
+    years = years[present]
+    n_groups = int(code.max()) + 1 if len(code) else 0
+    start = np.full(n_groups, np.iinfo(np.int64).max)
+    end = np.full(n_groups, np.iinfo(np.int64).min)
+    first_row = np.full(n_groups, len(df))
+    np.minimum.at(start, code, years)
+    np.maximum.at(end, code, years)
+    np.minimum.at(first_row, code, np.flatnonzero(present))
+
+    bad = np.flatnonzero(compiled.span_violations(start, end))
+    out = (
+        df.iloc[first_row[bad]][by].reset_index(drop=True)
+        if by
+        else pd.DataFrame(index=range(len(bad)))
+    )
+    out["start_year"] = start[bad]
+    out["end_year"] = end[bad]
+
+    breaks = compiled.breaks
+    kind = breaks["break_type"].to_numpy()
+    year = breaks["break_year"].to_numpy()
+    boundary = np.isin(kind, ERA_BOUNDARY_BREAK_TYPES)
+    gap = kind == "covid_gap"
+    out["breaks"] = [
+        _format_violations(breaks[
+            (boundary & (s < year) & (e >= year)) | (gap & (s <= year) & (e >= year))
+        ])
+        for s, e in zip(start[bad], end[bad])
+    ]
+    return out
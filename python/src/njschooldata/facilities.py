@@ -1,11 +1,14 @@
 """School facilities data functions."""
 
+from typing import Any
+
 import pandas as pd
 import rpy2.robjects as ro
 from rpy2.robjects import pandas2ri
 from rpy2.robjects.conversion import localconverter
 
 from ._r_bridge import _get_r_package, call_r_function, r_to_pandas
+from .progress import report_progress
 
 
 @r_to_pandas
@@ -46,14 +49,19 @@ def fetch_facilities_multi(
     years: list[int],
     tidy: bool = True,
     use_cache: bool = True,
+    *,
+    progress: Any = None,
 ) -> pd.DataFrame:
     """
     Fetch New Jersey facilities data for multiple source years.
 
     Returns a pandas DataFrame in the canonical facilities long schema.
+    ``progress`` receives per-year events (see :mod:`njschooldata.progress`).
     """
     pkg = _get_r_package()
-    with localconverter(ro.default_converter + pandas2ri.converter):
+    with report_progress(progress), localconverter(
+        ro.default_converter + pandas2ri.converter
+    ):
         r_years = ro.IntVector(years)
         r_df = pkg.fetch_facilities_multi(
             category,
@@ -78,7 +86,11 @@ def fetch_facility_gis(layer: str = "school_points", use_cache: bool = True):
     with localconverter(ro.default_converter + pandas2ri.converter):
         r_df = pkg.fetch_facility_gis(layer, sf=False, use_cache=use_cache)
         df = r_df if isinstance(r_df, pd.DataFrame) else pandas2ri.rpy2py(r_df)
+    return _facility_geodataframe(df)
+
 
+def _facility_geodataframe(df: pd.DataFrame):
+    """Parse the ``wkt`` column into a GeoDataFrame when geopandas is available."""
     try:
         import geopandas as gpd
         from shapely import wkt as shapely_wkt
@@ -1,10 +1,11 @@
 """School finance data functions."""
 
-from typing import Literal, Optional
+from typing import Any, Literal, Optional
 
 import pandas as pd
 
 from ._r_bridge import call_r_function, r_to_pandas
+from .progress import report_progress
 
 FinanceLevel = Literal["all", "state", "district", "school"]
 
@@ -73,6 +74,8 @@ def fetch_finance_multi(
     with_status: bool = False,
     level: FinanceLevel = "all",
     allow_partial: bool = False,
+    *,
+    progress: Any = None,
 ) -> pd.DataFrame:
     """
     Fetch New Jersey school finance data for multiple years.
@@ -92,6 +95,9 @@ def fetch_finance_multi(
         Entity grain to return.
     allow_partial : bool, default False
         Permit explicitly partial per-year finance results.
+    progress : callable or tqdm bar, optional
+        Receives a :class:`~njschooldata.progress.ProgressEvent` as each year
+        starts and finishes, or advances a ``tqdm`` bar once per year.
 
     Returns
     -------
@@ -107,4 +113,5 @@ def fetch_finance_multi(
     }
     if end_years is not None:
         kwargs["end_years"] = end_years
-    return call_r_function("fetch_finance_multi", **kwargs)
+    with report_progress(progress):
+        return call_r_function("fetch_finance_multi", **kwargs)
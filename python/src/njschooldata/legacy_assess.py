@@ -0,0 +1,373 @@
+"""Memory-mapped fixed-width reader for legacy NJASK/HSPA/GEPA files.
+
+Python counterpart to ``common_fwf_req()`` in ``R/fetch_nj_assess.R``. The R
+reader pulls the whole file through ``readLines``, re-encodes every line,
+right-pads with ``sprintf``, pastes the lines back into one string and hands it
+to ``readr::read_fwf``. Here the file is memory-mapped and viewed as a 2-D
+``(records, width)`` byte array - without a copy when the file is already
+fixed width - and each layout field is sliced out of that array and converted
+with vectorized NumPy.
+
+The output matches ``common_fwf_req()``: redundant composite fields (see
+:func:`find_redundant_overlaps`) are rebuilt from their components, columns
+follow the full layout order, ``"*"`` is missing, text is decoded from
+LATIN2, and types follow :func:`nj_coltype_parser`. Text columns use the
+pandas ``string`` dtype, ``Integer`` columns ``Int64`` and ``Decimal`` columns
+``float64``.
+"""
+
+from __future__ import annotations
+
+import os
+import warnings
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+__all__ = [
+    "find_redundant_overlaps",
+    "legacy_assess_layout",
+    "load_assess_layout",
+    "nj_coltype_parser",
+    "read_legacy_fwf",
+    "reconstruct_composite_field",
+]
+
+_SPACE = 0x20
+# Bytes matched by R's [[:space:]]: tab, newline, vtab, form feed, CR, space.
+_WHITESPACE = np.array([0x09, 0x0A, 0x0B, 0x0C, 0x0D, _SPACE], dtype=np.uint8)
+_INT32_MAX = 2**31 - 1
+_TYPE_CODES = {"Text": "c", "Integer": "i", "Decimal": "d"}
+
+
+def nj_coltype_parser(datatypes) -> str:
+    """
+    Turn layout ``data_type`` values into a compact ``read_fwf`` type string.
+
+    ``Text`` -> ``c``, ``Integer`` -> ``i``, ``Decimal`` -> ``d``; any other
+    value is passed through unchanged, exactly as in R.
+    """
+    return "".join(_TYPE_CODES.get(str(t), str(t)) for t in datatypes)
+
+
+def find_redundant_overlaps(layout: pd.DataFrame) -> np.ndarray:
+    """
+    Flag composite fields that are the disjoint union of narrower fields.
+
+    A field is redundant when its ``[field_start_position,
+    field_end_position]`` interval is exactly covered, without gaps or
+    overlaps, by two or more strictly narrower fields - e.g. the composite
+    county-district-school code (1-9) over ``County_Code`` (1-2),
+    ``District_Code`` (3-6) and ``School_Code`` (7-9).
+
+    Parameters
+    ----------
+    layout : pd.DataFrame
+        Layout with ``field_start_position`` and ``field_end_position``.
+
+    Returns
+    -------
+    np.ndarray
+        Boolean mask of length ``len(layout)``; ``True`` marks composites.
+    """
+    starts = layout["field_start_position"].to_numpy(dtype=np.int64)
+    ends = layout["field_end_position"].to_numpy(dtype=np.int64)
+    n = len(starts)
+    redundant = np.zeros(n, dtype=bool)
+    if n < 2:
+        return redundant
+
+    widths = ends - starts + 1
+    inside = (
+        (starts[None, :] >= starts[:, None])
+        & (ends[None, :] <= ends[:, None])
+        & (widths[None, :] < widths[:, None])
+    )
+    for i in np.flatnonzero(inside.sum(axis=1) >= 2):
+        candidate = np.flatnonzero(inside[i])
+        order = np.argsort(starts[candidate], kind="stable")
+        cs = starts[candidate][order]
+        ce = ends[candidate][order]
+        redundant[i] = (
+            cs[0] == starts[i]
+            and ce[-1] == ends[i]
+            and bool(np.all(ce[:-1] + 1 == cs[1:]))
+        )
+    return redundant
+
+
+def _as_character(values: pd.Series) -> pd.Series:
+    """``as.character()`` for a parsed column (integers lose leading zeros)."""
+    if pd.api.types.is_float_dtype(values):
+        out = values.map(lambda v: f"{v:.15g}", na_action="ignore")
+        return out.astype("string")
+    return values.astype("string")
+
+
+def reconstruct_composite_field(
+    df: pd.DataFrame, composite_row: pd.Series, parse_layout: pd.DataFrame
+) -> pd.DataFrame:
+    """
+    Rebuild a composite field dropped by :func:`find_redundant_overlaps`.
+
+    Components of ``parse_layout`` inside the composite's interval are
+    concatenated in positional order; the composite is missing whenever any
+    component is.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Frame parsed against ``parse_layout``.
+    composite_row : pd.Series
+        The composite's row from the full layout.
+    parse_layout : pd.DataFrame
+        The deduplicated layout ``df`` was parsed with.
+
+    Returns
+    -------
+    pd.DataFrame
+        ``df`` with the composite column added.
+    """
+    name = composite_row["final_name"]
+    start = composite_row["field_start_position"]
+    end = composite_row["field_end_position"]
+
+    inside = (parse_layout["field_start_position"] >= start) & (
+        parse_layout["field_end_position"] <= end
+    )
+    components = parse_layout[inside.to_numpy()]
+    if components.empty:
+        raise ValueError(
+            f"Cannot reconstruct composite field '{name}': no component fields "
+            f"found inside [{start}, {end}]."
+        )
+    components = components.sort_values("field_start_position", kind="stable")
+
+    parts = [_as_character(df[nm]) for nm in components["final_name"]]
+    value = parts[0]
+    for part in parts[1:]:
+        value = value + part
+    df[name] = value
+    return df
+
+
+def _record_matrix(buf: np.ndarray, min_width: int) -> np.ndarray:
+    """
+    View the mapped bytes as a space-padded ``(records, width)`` array.
+
+    Line handling follows ``readLines``: ``\\n`` and ``\\r\\n`` terminators,
+    and a final unterminated line is kept. When every record has the same
+    length and stride the result is a strided view over the mapping.
+    """
+    newlines = np.flatnonzero(buf == 0x0A)
+    ends = newlines
+    if len(buf) and buf[-1] != 0x0A:
+        ends = np.append(ends, len(buf))
+    starts = np.concatenate(([0], newlines + 1))[: len(ends)]
+    if len(ends):
+        cr = buf[np.maximum(ends - 1, 0)] == 0x0D
+        ends = ends - (cr & (ends > starts))
+    lengths = ends - starts
+    n = len(lengths)
+
+    max_len = int(lengths.max()) if n else 0
+    width = max(max_len, min_width)
+    strides = np.diff(starts)
+    if (
+        n
+        and width == max_len
+        and np.all(lengths == max_len)
+        and np.all(strides == strides[0] if len(strides) else True)
+    ):
+        step = int(strides[0]) if len(strides) else max_len
+        return np.lib.stride_tricks.as_strided(
+            buf[starts[0]:], shape=(n, width), strides=(step, 1), writeable=False
+        )
+
+    cols = np.arange(width)
+    present = cols[None, :] < lengths[:, None]
+    matrix = np.full((n, width), _SPACE, dtype=np.uint8)
+    matrix[present] = buf[(starts[:, None] + cols[None, :])[present]]
+
+    if n and np.any(lengths < max_len):
+        # Ragged file: R trims trailing whitespace before padding.
+        content = ~np.isin(matrix, _WHITESPACE)
+        trimmed = np.where(
+            content.any(axis=1), width - np.argmax(content[:, ::-1], axis=1), 0
+        )
+        matrix[cols[None, :] >= trimmed[:, None]] = _SPACE
+        lengths = trimmed
+    if n and len(np.unique(lengths)) > 1:
+        warnings.warn(
+            "the fixed width input file is not fixed - rows are of different "
+            "length. truncating rows that are too wide, and padding rows that "
+            "are too short...",
+            UserWarning,
+            stacklevel=3,
+        )
+    return matrix
+
+
+def _parse_numeric(raw: np.ndarray, integer: bool) -> np.ndarray:
+    """Parse stripped byte strings; unparseable values become NaN."""
+    out = np.full(len(raw), np.nan)
+    valid = (raw != b"") & (raw != b"*")
+    if integer:
+        unsigned = np.char.lstrip(raw, b"+-")
+        valid &= np.char.isdigit(unsigned)
+        valid &= np.char.str_len(raw) - np.char.str_len(unsigned) <= 1
+    if not valid.any():
+        return out
+    try:
+        out[valid] = raw[valid].astype(np.float64)
+    except ValueError:
+        decoded = np.char.decode(raw[valid], "ascii", errors="replace")
+        out[valid] = pd.to_numeric(decoded, errors="coerce")
+    if integer:
+        out[np.abs(out) > _INT32_MAX] = np.nan
+    return out
+
+
+def _parse_field(field: np.ndarray, type_code: str) -> pd.Series:
+    raw = np.char.strip(field)
+    if type_code == "i":
+        return pd.Series(_parse_numeric(raw, integer=True)).astype("Int64")
+    if type_code == "d":
+        return pd.Series(_parse_numeric(raw, integer=False))
+    text = pd.Series(np.char.decode(raw, "iso8859_2"), dtype="string")
+    text[raw == b"*"] = pd.NA
+    return text
+
+
+def read_legacy_fwf(
+    path: Union[str, os.PathLike], layout: pd.DataFrame
+) -> pd.DataFrame:
+    """
+    Parse a legacy NJASK/HSPA/GEPA state summary file against a layout.
+
+    Parameters
+    ----------
+    path : str or path-like
+        Local copy of the flat file (e.g. the path returned by the R
+        ``download_source()`` transport).
+    layout : pd.DataFrame
+        One of the package's ``layout_*`` frames (see
+        :func:`load_assess_layout`), with ``field_start_position``,
+        ``field_end_position``, ``data_type`` and ``final_name`` columns.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per record and one column per layout row, in layout order.
+    """
+    layout = layout.reset_index(drop=True)
+    min_width = int(layout["field_end_position"].max())
+    if os.path.getsize(path):
+        buf = np.memmap(path, dtype=np.uint8, mode="r")
+    else:
+        buf = np.zeros(0, dtype=np.uint8)
+    matrix = _record_matrix(buf, min_width)
+
+    redundant = find_redundant_overlaps(layout)
+    parse_layout = layout[~redundant]
+    types = nj_coltype_parser(parse_layout["data_type"])
+
+    columns = {}
+    for (_, row), type_code in zip(parse_layout.iterrows(), types):
+        start = int(row["field_start_position"]) - 1
+        stop = int(row["field_end_position"])
+        field = np.ascontiguousarray(matrix[:, start:stop])
+        field = field.view(f"S{stop - start}").ravel()
+        columns[row["final_name"]] = _parse_field(field, type_code)
+    df = pd.DataFrame(columns, index=pd.RangeIndex(len(matrix)))
+
+    for i in np.flatnonzero(redundant):
+        df = reconstruct_composite_field(df, layout.iloc[i], parse_layout)
+    if redundant.any():
+        df = df[list(layout["final_name"])]
+    return df
+
+
+def legacy_assess_layout(
+    assess_name: str, end_year: int, grade: Optional[int] = None
+) -> tuple[str, Optional[int]]:
+    """
+    Name the R layout ``fetch_njask()``/``fetch_hspa()``/``fetch_gepa()`` use.
+
+    Parameters
+    ----------
+    assess_name : str
+        ``"NJASK"``, ``"HSPA"`` or ``"GEPA"``.
+    end_year : int
+        Assessment end year (2004-2014).
+    grade : int, optional
+        Grade level; required for NJASK.
+
+    Returns
+    -------
+    tuple
+        ``(layout_object_name, n_rows)`` where ``n_rows`` truncates the
+        layout (``None`` keeps every row).
+    """
+    assess = assess_name.upper()
+    if assess == "NJASK":
+        if grade is None:
+            raise ValueError("grade is required for NJASK layouts")
+        if end_year == 2004:
+            return "layout_njask04", None
+        if end_year == 2005:
+            return "layout_njask05", None
+        if end_year == 2006 and grade in (3, 4):
+            return "layout_njask06gr3", None
+        if end_year == 2006 and grade >= 5:
+            return "layout_njask06gr5", None
+        if end_year in (2007, 2008) and grade in (3, 4):
+            return "layout_njask07gr3", None
+        if end_year == 2007 and grade in (5, 6, 7):
+            return "layout_njask07gr5", None
+        # 2007 grade 8 has no branch in R and falls through to layout_njask.
+        if (end_year == 2008 and grade >= 5) or end_year == 2009:
+            return "layout_njask09", None
+        if end_year == 2010:
+            return "layout_njask10", None
+        return "layout_njask", None
+    if assess == "HSPA":
+        if end_year > 2011:
+            return "layout_hspa", 558
+        if end_year > 2006:
+            return "layout_hspa10", None
+        return f"layout_hspa{end_year % 100:02d}", None
+    if assess == "GEPA":
+        if end_year == 2007:
+            return "layout_gepa", None
+        if end_year == 2004:
+            return "layout_njask04", 361
+        return f"layout_gepa{end_year % 100:02d}", None
+    raise ValueError(f"Unknown legacy assessment: {assess_name!r}")
+
+
+def load_assess_layout(
+    assess_name: str, end_year: int, grade: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Read the layout for a legacy assessment file from the R package.
+
+    Parameters are as for :func:`legacy_assess_layout`.
+
+    Returns
+    -------
+    pd.DataFrame
+        The layout, ready for :func:`read_legacy_fwf`.
+    """
+    from ._r_bridge import _get_r_package, localconverter, pandas2ri, ro
+
+    name, n_rows = legacy_assess_layout(assess_name, end_year, grade)
+    _get_r_package()
+    with localconverter(ro.default_converter + pandas2ri.converter):
+        layout = ro.r(f"njschooldata::{name}")
+        if not isinstance(layout, pd.DataFrame):
+            layout = pandas2ri.rpy2py(layout)
+    if n_rows is not None:
+        layout = layout.iloc[:n_rows]
+    return layout.reset_index(drop=True)
@@ -0,0 +1,341 @@
+"""
+Per-call memory accounting for pandas-converting R calls.
+
+With accounting on (``NJSD_MEMORY_ACCOUNTING=1``, :func:`track_memory`, or
+any registered hook), each :func:`~njschooldata._r_bridge.r_to_pandas` call
+records:
+- the R heap before and after the call, from ``gc()``;
+- R's peak heap during the call;
+- the Python ``tracemalloc`` peak;
+- the final ``DataFrame.memory_usage(deep=True)``.
+
+The record is stored in ``df.attrs["memory"]`` and passed to hooks added with
+:func:`add_memory_hook`.
+
+A memory budget (``NJSD_MEMORY_BUDGET`` such as ``"2G"``, or
+:func:`set_memory_budget`) is checked after R returns and before conversion.
+The pandas size of the R ``data.frame`` is projected from its column types,
+and :class:`MemoryBudgetExceeded` is raised when it is over the limit.
+
+``gc()`` and ``tracemalloc`` are process-wide, so accounted calls run one at
+a time. A wrapped call made inside an accounted call is counted in the outer
+record and is not accounted separately (the budget still applies to it).
+"""
+
+import contextvars
+import os
+import re
+import threading
+import tracemalloc
+import warnings
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Iterator, Optional, Union
+
+import pandas as pd
+
+# Bytes per R cons cell and vector cell on 64-bit builds.
+_R_HEAP = """function(reset) {
+  stats <- gc(reset = reset)
+  cells <- c(Ncells = 56, Vcells = 8)[rownames(stats)]
+  c(used = sum(stats[, "used"] * cells), max_used = sum(stats[, "max used"] * cells))
+}"""
+
+# Mirrors pandas2ri: doubles -> float64, integers -> int32, logicals -> bool,
+# characters -> object columns of str (8-byte pointer plus a ~49-byte header
+# per string), factors -> categoricals.
+_R_PROJECTED_BYTES = """function(df) {
+  if (!is.data.frame(df)) return(NA_real_)
+  n <- nrow(df)
+  strings <- function(x) {
+    x <- x[!is.na(x)]
+    sum(nchar(x, type = "bytes")) + 57 * length(x)
+  }
+  sizes <- vapply(df, function(col) {
+    if (is.factor(col)) {
+      codes <- if (nlevels(col) < 128) 1 else if (nlevels(col) < 32768) 2 else 4
+      return(codes * n + strings(levels(col)))
+    }
+    if (is.character(col)) return(8 * n + strings(col))
+    if (is.logical(col)) return(n)
+    if (is.integer(col)) return(4 * n)
+    8 * n
+  }, numeric(1))
+  128 + sum(sizes)
+}"""
+
+_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+
+_tracking: contextvars.ContextVar = contextvars.ContextVar(
+    "njsd_memory_tracking", default=False
+)
+_accounting: contextvars.ContextVar = contextvars.ContextVar(
+    "njsd_memory_accounting", default=False
+)
+_budget: Optional[int] = None
+_hooks: list = []
+_lock = threading.Lock()
+_r_functions: dict = {}
+
+
+class MemoryBudgetExceeded(MemoryError):
+    """The projected pandas size of an R result exceeds the memory budget."""
+
+    def __init__(self, function: str, projected: int, budget: int) -> None:
+        super().__init__(
+            f"{function}: projected pandas size {projected:,} bytes exceeds the "
+            f"memory budget of {budget:,} bytes"
+        )
+        self.function = function
+        self.projected = projected
+        self.budget = budget
+
+
+@dataclass(frozen=True)
+class FetchMemory:
+    """
+    Memory recorded for one pandas-converting R call, in bytes.
+
+    R heap fields are ``None`` when the call did not return an R object
+    (for example, a wrapper that already produced a pandas frame).
+    """
+
+    function: str
+    r_heap_before: Optional[int]
+    r_heap_after: Optional[int]
+    r_heap_peak: Optional[int]
+    python_peak: int
+    projected_frame: Optional[int]
+    frame: Optional[int]
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def parse_bytes(value: Union[int, str, None]) -> Optional[int]:
+    """Parse ``2G`` / ``512MiB`` / ``1000000`` style sizes (binary units)."""
+    if value is None or isinstance(value, int):
+        return value
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMGT]?)(?:i?B)?\s*", value, re.I)
+    if not match:
+        raise ValueError(f"invalid memory size: {value!r}")
+    return int(float(match.group(1)) * _UNITS[match.group(2).upper()])
+
+
+def set_memory_budget(limit: Union[int, str, None]) -> Optional[int]:
+    """
+    Set the process-wide memory budget; ``None`` falls back to the environment.
+
+    Parameters
+    ----------
+    limit : int, str or None
+        Budget in bytes, or a size string such as ``"2G"``.
+
+    Returns
+    -------
+    int or None
+        The previous budget set through this function.
+    """
+    global _budget
+    previous, _budget = _budget, parse_bytes(limit)
+    return previous
+
+
+def memory_budget() -> Optional[int]:
+    """Effective memory budget in bytes, or ``None`` for no limit."""
+    if _budget is not None:
+        return _budget
+    return parse_bytes(os.environ.get("NJSD_MEMORY_BUDGET") or None)
+
+
+def add_memory_hook(hook: Callable[[FetchMemory], Any]) -> Callable:
+    """
+    Call ``hook(record)`` after every accounted call; usable as a decorator.
+
+    Registering a hook turns accounting on. Exceptions raised by hooks are
+    reported as warnings and do not fail the fetch.
+    """
+    _hooks.append(hook)
+    return hook
+
+
+def remove_memory_hook(hook: Callable[[FetchMemory], Any]) -> None:
+    """Unregister a hook added with :func:`add_memory_hook`."""
+    _hooks.remove(hook)
+
+
+@contextmanager
+def track_memory() -> Iterator[None]:
+    """
+    Account memory for calls made in this context.
+
+    Examples
+    --------
+    >>> from njschooldata.memory import track_memory
+    >>> with track_memory():  # doctest: +SKIP
+    ...     enr = njsd.fetch_enr(2024, tidy=True)
+    >>> enr.attrs["memory"]["python_peak"]  # doctest: +SKIP
+    """
+    token = _tracking.set(True)
+    try:
+        yield
+    finally:
+        _tracking.reset(token)
+
+
+def tracking_enabled() -> bool:
+    """Whether memory accounting is on for calls in this context."""
+    return (
+        _tracking.get()
+        or bool(_hooks)
+        or os.environ.get("NJSD_MEMORY_ACCOUNTING", "").lower() in {"1", "true", "yes"}
+    )
+
+
+def _r_function(source: str):
+    from . import _r_bridge
+
+    if source not in _r_functions:
+        _r_functions[source] = _r_bridge.ro.r(source)
+    return _r_functions[source]
+
+
+def _is_r_object(value: Any) -> bool:
+    from . import _r_bridge
+
+    return _r_bridge.ro is not None and not isinstance(value, pd.DataFrame) and hasattr(
+        value, "rclass"
+    )
+
+
+def _r_heap(reset: bool) -> tuple[int, int]:
+    """Return R ``(used, max_used)`` heap bytes, optionally resetting the peak."""
+    used, max_used = _r_function(_R_HEAP)(reset)
+    return int(used), int(max_used)
+
+
+def projected_frame_bytes(result: Any) -> Optional[int]:
+    """Project the pandas size of an R ``data.frame`` before converting it."""
+    if not _is_r_object(result):
+        return None
+    (projected,) = _r_function(_R_PROJECTED_BYTES)(result)
+    return None if projected != projected else int(projected)
+
+
+class CallMemory:
+    """Accounting for one :func:`~njschooldata._r_bridge.r_to_pandas` call."""
+
+    def __init__(self, function: str, track: bool, budget: Optional[int]) -> None:
+        self.function = function
+        self.track = track
+        self.budget = budget
+        self.r_heap_before: Optional[int] = None
+        self.projected: Optional[int] = None
+        self._from_r = False
+        self._python_base = 0
+        self._started_tracing = False
+        self._token: Optional[contextvars.Token] = None
+
+    def __enter__(self) -> "CallMemory":
+        from . import _r_bridge
+
+        if not self.track:
+            return self
+        _lock.acquire()
+        self._token = _accounting.set(True)
+        try:
+            if _r_bridge.ro is not None:
+                self.r_heap_before, _ = _r_heap(reset=True)
+            self._started_tracing = not tracemalloc.is_tracing()
+            if self._started_tracing:
+                tracemalloc.start()
+            else:
+                tracemalloc.reset_peak()
+            self._python_base = tracemalloc.get_traced_memory()[0]
+        except BaseException:
+            self.__exit__()
+            raise
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self.track:
+            self._stop_tracing()
+            _accounting.reset(self._token)
+            _lock.release()
+
+    def returned(self, result: Any) -> None:
+        """Project the converted size of ``result`` and enforce the budget."""
+        self._from_r = _is_r_object(result)
+        self.projected = projected_frame_bytes(result)
+        if self.budget is not None and self.projected is not None:
+            if self.projected > self.budget:
+                raise MemoryBudgetExceeded(self.function, self.projected, self.budget)
+
+    def finish(self, converted: Any) -> None:
+        """Record the accounting for ``converted`` and run the hooks."""
+        if not self.track:
+            return
+        python_peak = max(0, tracemalloc.get_traced_memory()[1] - self._python_base)
+        self._stop_tracing()
+        r_after = r_peak = None
+        if self._from_r and self.r_heap_before is not None:
+            r_after, r_peak = _r_heap(reset=False)
+        frame = (
+            int(converted.memory_usage(deep=True).sum())
+            if isinstance(converted, pd.DataFrame)
+            else None
+        )
+        record = FetchMemory(
+            function=self.function,
+            r_heap_before=self.r_heap_before if self._from_r else None,
+            r_heap_after=r_after,
+            r_heap_peak=r_peak,
+            python_peak=python_peak,
+            projected_frame=self.projected,
+            frame=frame,
+        )
+        if isinstance(converted, pd.DataFrame):
+            converted.attrs["memory"] = record.as_dict()
+        for hook in list(_hooks):
+            try:
+                hook(record)
+            except Exception as e:
+                warnings.warn(f"memory hook {hook!r} failed: {e}", RuntimeWarning)
+
+    def _stop_tracing(self) -> None:
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+
+class _Untracked:
+    """No-op accounting used while tracking and the budget are both off."""
+
+    def __enter__(self) -> "_Untracked":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+    def returned(self, result: Any) -> None:
+        pass
+
+    def finish(self, converted: Any) -> None:
+        pass
+
+
+_UNTRACKED = _Untracked()
+
+
+def account(function: str) -> Union[CallMemory, _Untracked]:
+    """
+    Context manager accounting one call.
+
+    While tracking, accounted calls are serialized. Calls nested inside an
+    accounted call only check the budget.
+    """
+    track = tracking_enabled() and not _accounting.get()
+    budget = memory_budget()
+    if not track and budget is None:
+        return _UNTRACKED
+    return CallMemory(function, track, budget)
@@ -0,0 +1,275 @@
+"""In-process metric registry with a categorical-code annotation join.
+
+Python counterpart to ``load_metric_registry()``, ``metric_meta()``,
+``annotate_metric()`` and ``list_metrics()`` in ``R/metric_registry.R``. The
+bundled registry (``inst/extdata/metric_registry.csv``, exported into the
+generated contract) is loaded once into an immutable :class:`MetricRegistry`
+whose per-metric fields are stored as categorical codes aligned with a metric
+index.
+
+:func:`annotate_metric` factorizes the frame's ``metric`` column (or reuses its
+codes when it is already categorical), maps only the distinct values onto the
+registry index and gathers every field by integer code. The added string
+columns are categoricals sharing the registry's categories, so no per-row
+string merge is performed.
+"""
+
+from __future__ import annotations
+
+import warnings
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from ._generated_contract import METRIC_REGISTRY
+
+__all__ = [
+    "METRIC_FIELDS",
+    "MetricRegistry",
+    "annotate_metric",
+    "list_metrics",
+    "load_metric_registry",
+    "metric_meta",
+]
+
+REGISTRY_COLUMNS = (
+    "domain", "metric", "label", "unit", "polarity", "is_rate",
+    "denominator_metric", "era_break_set", "notes",
+)
+# Fields annotate_metric() can attach; the R function attaches the first three.
+METRIC_FIELDS = (
+    "polarity", "unit", "is_rate", "denominator_metric", "era_break_set",
+    "domain", "label",
+)
+_DEFAULT_FIELDS = ("polarity", "unit", "is_rate")
+
+
+def _read_only(values: np.ndarray) -> np.ndarray:
+    values = np.array(values, copy=True)
+    values.setflags(write=False)
+    return values
+
+
+@dataclass(frozen=True)
+class MetricRegistry:
+    """
+    Immutable, indexed metric registry.
+
+    Attributes
+    ----------
+    metrics : pd.Index
+        Registered metric names; position ``i`` is registry row ``i``.
+    categories : dict
+        For each string field, the sorted distinct values.
+    codes : dict
+        For each string field, a read-only ``int`` array of category codes per
+        metric (``-1`` when missing).
+    is_rate : np.ndarray
+        Read-only ``int8`` array: 1 / 0, or -1 when missing.
+    table : pd.DataFrame
+        The registry rows, in file order.
+    """
+
+    metrics: pd.Index
+    categories: dict
+    codes: dict
+    is_rate: np.ndarray
+    table: pd.DataFrame
+
+    @classmethod
+    def from_frame(cls, table: pd.DataFrame) -> "MetricRegistry":
+        """Index a registry table with the ``metric_registry.csv`` schema."""
+        missing = [c for c in REGISTRY_COLUMNS if c not in table.columns]
+        if missing:
+            raise ValueError(f"metric registry is missing column(s): {', '.join(missing)}")
+        table = table[list(REGISTRY_COLUMNS)].reset_index(drop=True)
+        metrics = pd.Index(table["metric"].astype(str), name="metric")
+        duplicated = metrics[metrics.duplicated()].unique()
+        if len(duplicated):
+            raise ValueError(
+                f"Metric '{duplicated[0]}' has multiple registry rows."
+            )
+
+        categories = {}
+        codes = {}
+        for field in REGISTRY_COLUMNS:
+            if field in ("metric", "is_rate"):
+                continue
+            cat = pd.Categorical(table[field].astype("string"))
+            categories[field] = cat.categories
+            codes[field] = _read_only(cat.codes.astype(np.int32))
+
+        rate = table["is_rate"].astype("boolean")
+        is_rate = np.where(rate.isna(), -1, rate.fillna(False).astype(int)).astype(np.int8)
+        table = table.assign(
+            is_rate=rate,
+            **{f: table[f].astype("string") for f in REGISTRY_COLUMNS if f != "is_rate"},
+        )
+        return cls(
+            metrics=metrics,
+            categories=categories,
+            codes=codes,
+            is_rate=_read_only(is_rate),
+            table=table,
+        )
+
+    @classmethod
+    def from_csv(cls, path: Union[str, Path]) -> "MetricRegistry":
+        """Read and index a ``metric_registry.csv`` file."""
+        table = pd.read_csv(path, dtype=str, keep_default_na=False)
+        table = table.replace("", pd.NA)
+        table["is_rate"] = table["is_rate"].map({"TRUE": True, "FALSE": False})
+        return cls.from_frame(table)
+
+    def __len__(self) -> int:
+        return len(self.metrics)
+
+    def __contains__(self, metric) -> bool:
+        return metric in self.metrics
+
+    def positions(self, metric: pd.Series) -> np.ndarray:
+        """
+        Registry row of each value of ``metric`` (``-1`` if unregistered).
+
+        Only the distinct values are looked up in the metric index; rows are
+        mapped through their factor codes.
+        """
+        if isinstance(metric.dtype, pd.CategoricalDtype):
+            row_codes = metric.cat.codes.to_numpy()
+            uniques = metric.cat.categories
+        else:
+            row_codes, uniques = pd.factorize(metric, use_na_sentinel=True)
+        lookup = np.append(self.metrics.get_indexer(uniques.astype(str)), -1)
+        return lookup[row_codes]
+
+    def field(self, name: str, positions: np.ndarray):
+        """Gather one field for registry ``positions`` (``-1`` -> missing)."""
+        if name == "is_rate":
+            values = np.where(positions >= 0, self.is_rate[positions], -1)
+            out = pd.array(values == 1, dtype="boolean")
+            out[values < 0] = pd.NA
+            return out
+        if name not in self.codes:
+            raise ValueError(
+                f"Unknown metric field '{name}'. Choose from: {', '.join(METRIC_FIELDS)}."
+            )
+        codes = np.where(positions >= 0, self.codes[name][positions], -1)
+        return pd.Categorical.from_codes(codes, categories=self.categories[name])
+
+    def meta(self, metric: str) -> pd.DataFrame:
+        """One-row registry record for ``metric`` (see :func:`metric_meta`)."""
+        position = self.metrics.get_indexer([metric])[0]
+        if position < 0:
+            warnings.warn(f"Metric '{metric}' is not registered.", UserWarning, stacklevel=3)
+            row = pd.DataFrame({c: pd.array([pd.NA], dtype="string") for c in REGISTRY_COLUMNS})
+            row["metric"] = metric
+            row["is_rate"] = pd.array([pd.NA], dtype="boolean")
+            return row
+        return self.table.iloc[[position]].reset_index(drop=True)
+
+
+@lru_cache(maxsize=1)
+def load_metric_registry() -> MetricRegistry:
+    """
+    Load the bundled metric registry (cached for the process).
+
+    Returns
+    -------
+    MetricRegistry
+        Indexed registry; ``.table`` holds the rows with the columns
+        ``domain``, ``metric``, ``label``, ``unit``, ``polarity``,
+        ``is_rate``, ``denominator_metric``, ``era_break_set`` and ``notes``.
+    """
+    return MetricRegistry.from_frame(pd.DataFrame(METRIC_REGISTRY))
+
+
+def _check_metric_scalar(metric) -> None:
+    if not isinstance(metric, str) or not metric:
+        raise ValueError("metric must be a non-empty character scalar.")
+
+
+def metric_meta(metric: str) -> pd.DataFrame:
+    """
+    Look up metadata for one metric.
+
+    Parameters
+    ----------
+    metric : str
+        Metric name.
+
+    Returns
+    -------
+    pd.DataFrame
+        The single registry row; unregistered metrics warn and return a row
+        of missing metadata.
+    """
+    _check_metric_scalar(metric)
+    return load_metric_registry().meta(metric)
+
+
+def annotate_metric(
+    df: pd.DataFrame,
+    metric: Optional[str] = None,
+    fields: Sequence[str] = _DEFAULT_FIELDS,
+) -> pd.DataFrame:
+    """
+    Attach metric metadata columns to a frame.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        A fetcher or analysis output.
+    metric : str, optional
+        Metric applied to every row. When omitted, ``df`` must have a
+        ``metric`` column and metadata is joined per row.
+    fields : sequence of str, default ("polarity", "unit", "is_rate")
+        Registry fields to add; any of :data:`METRIC_FIELDS`.
+
+    Returns
+    -------
+    pd.DataFrame
+        ``df`` with the requested fields added (string fields as
+        categoricals, ``is_rate`` as nullable boolean).
+    """
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("df must be a data frame.")
+    registry = load_metric_registry()
+
+    if metric is None and "metric" in df.columns:
+        positions = registry.positions(df["metric"])
+        unregistered = df["metric"][(positions < 0) & df["metric"].notna().to_numpy()]
+        if len(unregistered):
+            warnings.warn(
+                "Unregistered metric(s): "
+                + ", ".join(map(str, pd.unique(unregistered.astype(str)))),
+                UserWarning,
+                stacklevel=2,
+            )
+    else:
+        if metric is None:
+            raise ValueError("metric must be provided when df has no 'metric' column.")
+        _check_metric_scalar(metric)
+        position = registry.metrics.get_indexer([metric])[0]
+        if position < 0:
+            warnings.warn(f"Metric '{metric}' is not registered.", UserWarning, stacklevel=2)
+        positions = np.full(len(df), position, dtype=np.int64)
+
+    return df.assign(**{
+        name: pd.Series(registry.field(name, positions), index=df.index)
+        for name in fields
+    })
+
+
+def list_metrics(domain: Union[str, Iterable[str], None] = None) -> pd.DataFrame:
+    """
+    Return registry rows, optionally limited to one or more domains.
+    """
+    table = load_metric_registry().table
+    if domain is None:
+        return table.copy()
+    wanted = [domain] if isinstance(domain, str) else list(domain)
+    return table[table["domain"].isin(wanted)].reset_index(drop=True)
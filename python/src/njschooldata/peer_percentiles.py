@@ -0,0 +1,300 @@
+"""Precomputed assessment peer-percentile lookup tables.
+
+Python counterpart to ``statewide_peer_percentile()``,
+``dfg_peer_percentile()`` and ``lookup_peer_percentile()`` in
+``R/peer_percentiles.R``. A table stores the sorted finite scores of every
+comparison group once, so arbitrary new scores (including what-if inputs) are
+placed with ``numpy.searchsorted`` instead of re-ranking the whole frame.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import json
+from pathlib import Path
+from typing import Literal, Union
+
+import numpy as np
+import pandas as pd
+
+__all__ = [
+    "PEER_GROUP_COLUMNS",
+    "PeerPercentileTable",
+    "build_peer_percentile_table",
+]
+
+# Grouping columns used by the R convenience wrappers.
+PEER_GROUP_COLUMNS = {
+    "statewide": [
+        "testing_year", "assess_name", "test_name", "grade",
+        "subgroup", "subgroup_type",
+    ],
+    "dfg": [
+        "testing_year", "assess_name", "test_name", "grade", "dfg",
+        "subgroup", "subgroup_type",
+    ],
+}
+
+PeerGroup = Literal["statewide", "dfg"]
+PeerLevel = Literal["school", "district"]
+PathLike = Union[str, Path]
+
+_LEVEL_FLAGS = {"school": "is_school", "district": "is_district"}
+
+
+@dataclass(frozen=True)
+class PeerPercentileTable:
+    """Sorted score distributions for every peer group of one metric.
+
+    ``values[offsets[i]:offsets[i + 1]]`` holds the ascending finite scores of
+    the group described by row ``i`` of ``keys``.
+    """
+
+    metric: str
+    peer_group: str
+    level: str
+    key_columns: tuple[str, ...]
+    keys: pd.DataFrame
+    values: np.ndarray
+    offsets: np.ndarray
+
+    def __repr__(self) -> str:  # pragma: no cover - cosmetic
+        return (
+            f"PeerPercentileTable(metric={self.metric!r}, "
+            f"peer_group={self.peer_group!r}, level={self.level!r}, "
+            f"groups={len(self.keys)}, scores={len(self.values)})"
+        )
+
+    def group_sizes(self) -> np.ndarray:
+        """Return the number of finite scores in each peer group."""
+        return np.diff(self.offsets)
+
+    def _group_index(self, queries: pd.DataFrame) -> np.ndarray:
+        """Map query rows to table groups; ``-1`` marks an unknown group."""
+        return _match_groups(self.keys, list(self.key_columns), queries)
+
+    def _published_percentiles(self) -> pd.DataFrame:
+        """Every member score with its ``min_rank()`` percentile in its group."""
+        sizes = self.group_sizes()
+        group = np.repeat(np.arange(len(self.keys)), sizes)
+        position = np.arange(len(self.values))
+        starts = (position == np.repeat(self.offsets[:-1], sizes)) | (
+            np.diff(self.values, prepend=np.nan) != 0
+        )
+        first = np.maximum.accumulate(np.where(starts, position, 0)) - self.offsets[group]
+        return self.keys.iloc[group].reset_index(drop=True).assign(
+            _score=self.values,
+            _percentile=np.round((first + 1) / sizes[group] * 100, 1),
+        )
+
+    def rank(
+        self,
+        queries: pd.DataFrame,
+        score_col: str | None = None,
+        member: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Place scores into their peer distributions.
+
+        Parameters
+        ----------
+        queries : pd.DataFrame
+            Rows carrying the table's peer group columns and a score column.
+        score_col : str or None, default None
+            Score column; defaults to the table metric.
+        member : bool, default False
+            ``True`` when the scores are already part of the distribution, which
+            reproduces R's ``min_rank()`` percentiles exactly. ``False`` treats
+            each score as one additional comparison entity (a what-if input).
+
+        Returns
+        -------
+        pd.DataFrame
+            ``rank``, ``n`` and ``percentile`` aligned with ``queries``.
+            Percentile is ``round(rank / n * 100, 1)`` as in R.
+        """
+        score_col = score_col or self.metric
+        scores = queries[score_col].to_numpy(dtype=float)
+        groups = self._group_index(queries)
+        rank = np.full(len(queries), np.nan)
+        size = np.full(len(queries), np.nan)
+
+        valid = (groups >= 0) & np.isfinite(scores)
+        for group in np.unique(groups[valid]):
+            rows = np.flatnonzero(valid & (groups == group))
+            start, stop = self.offsets[group], self.offsets[group + 1]
+            below = np.searchsorted(self.values[start:stop], scores[rows], "left")
+            rank[rows] = below + 1
+            size[rows] = (stop - start) + (0 if member else 1)
+
+        with np.errstate(invalid="ignore"):
+            percentile = np.round(rank / size * 100, 1)
+        return pd.DataFrame(
+            {"rank": rank, "n": size, "percentile": percentile},
+            index=queries.index,
+        )
+
+    def nearest_percentile(
+        self, queries: pd.DataFrame, score_col: str | None = None
+    ) -> pd.Series:
+        """
+        Return the percentile of the closest published score.
+
+        Mirrors ``lookup_peer_percentile()``: the member score nearest each
+        query supplies the percentile, and equidistant published
+        (score, percentile) pairs are averaged. Like R, the lookup does not
+        group by ``assess_name``. In a year that published both PARCC and NJSLA
+        results, each score keeps the percentile from its own assessment, and
+        the nearest score from either one is used. ``queries`` need no
+        ``assess_name`` column.
+        """
+        score_col = score_col or self.metric
+        lookup = [col for col in self.key_columns if col != "assess_name"]
+        published = (
+            self._published_percentiles()
+            .drop_duplicates([*lookup, "_score", "_percentile"])
+            .groupby([*lookup, "_score"], sort=True, dropna=False)["_percentile"]
+            .agg(["sum", "count"])
+            .reset_index()
+        )
+        codes = published.groupby(lookup, sort=False, dropna=False).ngroup().to_numpy()
+        offsets = np.r_[0, np.cumsum(np.bincount(codes))]
+        keys = published.loc[offsets[:-1], lookup].reset_index(drop=True)
+        values = published["_score"].to_numpy(dtype=float)
+        pct_sum = published["sum"].to_numpy(dtype=float)
+        pct_n = published["count"].to_numpy(dtype=float)
+
+        scores = queries[score_col].to_numpy(dtype=float)
+        groups = _match_groups(keys, lookup, queries)
+        out = np.full(len(queries), np.nan)
+
+        valid = (groups >= 0) & np.isfinite(scores)
+        for group in np.unique(groups[valid]):
+            rows = np.flatnonzero(valid & (groups == group))
+            start, stop = offsets[group], offsets[group + 1]
+            unique = values[start:stop]
+            total, count = pct_sum[start:stop], pct_n[start:stop]
+
+            hi = np.clip(np.searchsorted(unique, scores[rows], "left"), 0, len(unique) - 1)
+            lo = np.clip(hi - 1, 0, len(unique) - 1)
+            d_lo = np.abs(scores[rows] - unique[lo])
+            d_hi = np.abs(unique[hi] - scores[rows])
+            tie = (d_lo == d_hi) & (lo != hi)
+            out[rows] = np.where(
+                tie,
+                (total[lo] + total[hi]) / (count[lo] + count[hi]),
+                np.where(d_lo < d_hi, total[lo] / count[lo], total[hi] / count[hi]),
+            )
+        return pd.Series(out, index=queries.index, name=f"{self.peer_group}_percentile")
+
+    def save(self, path: PathLike) -> Path:
+        """Persist the table as a compressed ``.npz`` archive."""
+        path = Path(path)
+        meta = {
+            "metric": self.metric,
+            "peer_group": self.peer_group,
+            "level": self.level,
+            "key_columns": list(self.key_columns),
+            "keys": self.keys.astype(object).where(self.keys.notna(), None)
+            .to_dict(orient="list"),
+        }
+        with path.open("wb") as handle:
+            np.savez_compressed(
+                handle,
+                values=self.values,
+                offsets=self.offsets,
+                meta=np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8),
+            )
+        return path
+
+    @classmethod
+    def load(cls, path: PathLike) -> "PeerPercentileTable":
+        """Load a table written by :meth:`save`."""
+        with np.load(Path(path), allow_pickle=False) as archive:
+            meta = json.loads(archive["meta"].tobytes().decode("utf-8"))
+            values = archive["values"]
+            offsets = archive["offsets"]
+        keys = pd.DataFrame(meta["keys"], columns=meta["key_columns"])
+        return cls(
+            metric=meta["metric"],
+            peer_group=meta["peer_group"],
+            level=meta["level"],
+            key_columns=tuple(meta["key_columns"]),
+            keys=keys,
+            values=values,
+            offsets=offsets,
+        )
+
+
+def _match_groups(keys: pd.DataFrame, columns: list, queries: pd.DataFrame) -> np.ndarray:
+    """Row of ``keys`` matching each query on ``columns``; ``-1`` if none."""
+    missing = [col for col in columns if col not in queries.columns]
+    if missing:
+        raise ValueError(f"queries missing peer group columns: {missing}")
+    keyed = keys[columns].assign(_group=np.arange(len(keys)))
+    matched = queries[columns].merge(keyed, on=columns, how="left", sort=False)
+    return matched["_group"].fillna(-1).to_numpy(dtype=np.int64)
+
+
+def build_peer_percentile_table(
+    df: pd.DataFrame,
+    metric: str = "scale_score_mean",
+    peer_group: PeerGroup = "statewide",
+    level: PeerLevel = "district",
+) -> PeerPercentileTable:
+    """
+    Precompute sorted peer distributions from a tidy assessment frame.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Tidy PARCC/NJSLA frame with ``is_school``/``is_district`` flags and the
+        peer group columns (plus ``dfg`` for DFG peers).
+    metric : str, default "scale_score_mean"
+        Score column, usually ``scale_score_mean`` or ``proficient_above``.
+    peer_group : {"statewide", "dfg"}, default "statewide"
+        Comparison grouping, matching ``statewide_peer_percentile()`` or
+        ``dfg_peer_percentile()``.
+    level : {"school", "district"}, default "district"
+        Entity grain to rank within.
+
+    Returns
+    -------
+    PeerPercentileTable
+    """
+    if peer_group not in PEER_GROUP_COLUMNS:
+        raise ValueError(f"peer_group must be one of {sorted(PEER_GROUP_COLUMNS)}")
+    if level not in _LEVEL_FLAGS:
+        raise ValueError(f"level must be one of {sorted(_LEVEL_FLAGS)}")
+
+    key_columns = PEER_GROUP_COLUMNS[peer_group]
+    missing = [col for col in [*key_columns, metric, _LEVEL_FLAGS[level]]
+               if col not in df.columns]
+    if missing:
+        raise ValueError(f"df missing required columns: {missing}")
+
+    rows = df.loc[df[_LEVEL_FLAGS[level]].fillna(False).astype(bool),
+                  [*key_columns, metric]]
+    scores = pd.to_numeric(rows[metric], errors="coerce").to_numpy(dtype=float)
+    rows = rows.loc[np.isfinite(scores)]
+    scores = scores[np.isfinite(scores)]
+
+    codes = rows.groupby(key_columns, sort=True, dropna=False).ngroup().to_numpy()
+    order = np.lexsort((scores, codes))
+    keys = (
+        rows[key_columns].iloc[order]
+        .drop_duplicates()
+        .reset_index(drop=True)
+    )
+    counts = np.bincount(codes, minlength=len(keys))
+    offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+    return PeerPercentileTable(
+        metric=metric,
+        peer_group=peer_group,
+        level=level,
+        key_columns=tuple(key_columns),
+        keys=keys,
+        values=scores[order],
+        offsets=offsets,
+    )
@@ -0,0 +1,285 @@
+"""
+Opt-in profiling of R calls across the Python and R sides.
+
+Set ``NJSD_PROFILE=1`` (or use :func:`profile_calls`) and every
+:func:`~njschooldata._r_bridge.call_r_function` call and pandas-converting
+wrapper such as :func:`~njschooldata.fetch_enr` runs under ``cProfile`` in
+Python and ``Rprof`` in R. The two profiles are merged into one collapsed-stack
+file per call, with R stacks grafted under the Python frame that entered R.
+The ``.folded`` format (``frame;frame;frame weight``, weights in
+microseconds) is read by ``flamegraph.pl``, speedscope and inferno.
+
+Files are written to ``NJSD_PROFILE_DIR`` (default ``njsd-profiles``) and
+named after the function and its arguments. ``Rprof`` is process-wide, so
+one call is profiled at a time; calls made concurrently with it run
+unprofiled. Profiling is a diagnostic mode, not for production traffic.
+"""
+
+import contextvars
+import cProfile
+import hashlib
+import itertools
+import os
+import pstats
+import re
+import tempfile
+import threading
+import time
+import warnings
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+_R_ENTRY = "_r_bridge.py:_invoke_r"
+_SKIP_FRAMES = {"<method 'disable' of '_lsprof.Profiler' objects>"}
+_MAX_DEPTH = 200
+
+_directory: contextvars.ContextVar = contextvars.ContextVar(
+    "njsd_profile_directory", default=None
+)
+_active: contextvars.ContextVar = contextvars.ContextVar(
+    "njsd_profile_active", default=False
+)
+_lock = threading.Lock()
+_claimed = False
+_sequence = itertools.count()
+
+
+def profile_directory() -> Optional[Path]:
+    """
+    Directory profiles are written to, or ``None`` when profiling is off.
+
+    :func:`profile_calls` takes precedence over the ``NJSD_PROFILE`` /
+    ``NJSD_PROFILE_DIR`` environment variables.
+    """
+    override = _directory.get()
+    if override is not None:
+        return override
+    if os.environ.get("NJSD_PROFILE", "").lower() in {"1", "true", "yes"}:
+        return Path(os.environ.get("NJSD_PROFILE_DIR") or "njsd-profiles")
+    return None
+
+
+@contextmanager
+def profile_calls(directory: Optional[str] = None) -> Iterator[Path]:
+    """
+    Profile R calls made in this context.
+
+    Parameters
+    ----------
+    directory : str or None, default None
+        Output directory; defaults to ``NJSD_PROFILE_DIR`` or
+        ``njsd-profiles``.
+
+    Yields
+    ------
+    pathlib.Path
+        The output directory.
+
+    Examples
+    --------
+    >>> from njschooldata.profiling import profile_calls
+    >>> with profile_calls("profiles"):  # doctest: +SKIP
+    ...     njsd.fetch_enr(2024, tidy=True)
+    """
+    path = Path(directory or os.environ.get("NJSD_PROFILE_DIR") or "njsd-profiles")
+    token = _directory.set(path)
+    try:
+        yield path
+    finally:
+        _directory.reset(token)
+
+
+def _slug(name: str, args: tuple, kwargs: dict) -> str:
+    parts = [name, *map(repr, args), *(f"{k}={v!r}" for k, v in sorted(kwargs.items()))]
+    text = re.sub(r"[^A-Za-z0-9._=-]+", "_", "-".join(parts)).strip("_")
+    if len(text) > 80:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:10]
+        text = f"{text[:69]}-{digest}"
+    return text
+
+
+def _frame_label(func: tuple) -> str:
+    filename, _, name = func
+    label = name if filename == "~" else f"{Path(filename).name}:{name}"
+    return label.replace(";", ":")
+
+
+def python_stacks(stats: pstats.Stats) -> dict[tuple[str, ...], float]:
+    """
+    Unroll a cProfile call graph into weighted stacks (seconds).
+
+    cProfile records caller/callee edges rather than stacks, so each
+    function's self time is split across the paths that reach it in
+    proportion to the cumulative time of each incoming edge.
+    """
+    raw = stats.stats
+    callees: dict = defaultdict(dict)
+    for func, (_, _, _, _, callers) in raw.items():
+        for caller, edge in callers.items():
+            callees[caller][func] = edge[3]
+    stacks: dict[tuple[str, ...], float] = defaultdict(float)
+
+    def walk(func, path, seen, share):
+        label = _frame_label(func)
+        if label in _SKIP_FRAMES or len(path) >= _MAX_DEPTH:
+            return
+        path = path + (label,)
+        seen = seen | {func}
+        stacks[path] += raw[func][2] * share
+        for callee, edge_time in callees.get(func, {}).items():
+            total = raw[callee][3]
+            # Paths below the one-microsecond output resolution are dropped.
+            if total > 0 and edge_time * share >= 1e-6 and callee not in seen:
+                walk(callee, path, seen, share * edge_time / total)
+
+    for func, (_, _, _, _, callers) in raw.items():
+        if not callers:
+            walk(func, (), frozenset(), 1.0)
+    return dict(stacks)
+
+
+def r_stacks(text: str) -> dict[tuple[str, ...], float]:
+    """Parse ``Rprof`` output into weighted root-first stacks (seconds)."""
+    interval = 0.02
+    stacks: dict[tuple[str, ...], float] = defaultdict(float)
+    for line in text.splitlines():
+        if "sample.interval=" in line:
+            interval = int(line.rsplit("=", 1)[1]) / 1e6
+            continue
+        if line.startswith("#"):
+            continue
+        frames = re.findall(r'"([^"]*)"', line)
+        if frames:
+            stacks[tuple(f"R::{frame}" for frame in reversed(frames))] += interval
+    return dict(stacks)
+
+
+def merge_stacks(
+    python: dict[tuple[str, ...], float], r: dict[tuple[str, ...], float]
+) -> dict[tuple[str, ...], float]:
+    """
+    Graft R stacks under the heaviest Python path into R.
+
+    Python frames below the R entry point (rpy2 internals) include the time R
+    spent evaluating; they are scaled down by the sampled R time so the
+    merged profile does not count it twice.
+    """
+    if not r:
+        return dict(python)
+    entry_weights: dict[tuple[str, ...], float] = defaultdict(float)
+    for path, weight in python.items():
+        if _R_ENTRY in path:
+            entry_weights[path[: path.index(_R_ENTRY) + 1]] += weight
+    if not entry_weights:
+        return {**python, **{("R",) + path: weight for path, weight in r.items()}}
+    entry = max(entry_weights, key=entry_weights.get)
+    below = sum(
+        weight for path, weight in python.items()
+        if path[: len(entry)] == entry and len(path) > len(entry)
+    )
+    r_total = sum(r.values())
+    scale = max(0.0, below - r_total) / below if below else 0.0
+    merged = {
+        path: weight * scale if path[: len(entry)] == entry and len(path) > len(entry)
+        else weight
+        for path, weight in python.items()
+    }
+    for path, weight in r.items():
+        merged[entry + path] = merged.get(entry + path, 0.0) + weight
+    return merged
+
+
+def write_folded(stacks: dict[tuple[str, ...], float], path: Path) -> Path:
+    """Write stacks as collapsed-stack lines with microsecond weights."""
+    lines = [
+        f"{';'.join(stack)} {round(weight * 1e6)}"
+        for stack, weight in sorted(stacks.items())
+        if round(weight * 1e6) > 0
+    ]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join(lines) + ("\n" if lines else ""), encoding="utf-8")
+    return path
+
+
+def _rprof_start(path: str) -> bool:
+    from . import _r_bridge
+
+    if _r_bridge.ro is None:
+        return False
+    try:
+        _r_bridge.ro.r["Rprof"](filename=path, interval=0.01)
+    except Exception:
+        return False
+    return True
+
+
+def _rprof_stop() -> None:
+    from . import _r_bridge
+
+    _r_bridge.ro.r["Rprof"](_r_bridge.ro.NULL)
+
+
+def profiled(name: str, args: tuple, kwargs: dict, fn: Callable[[], Any]) -> Any:
+    """
+    Run ``fn`` under both profilers when profiling is enabled.
+
+    The profilers are claimed under ``_lock`` but the call itself runs without
+    it, so a call waiting on another thread (such as a single-flight join)
+    cannot deadlock with the profiled call. Calls made while another call
+    holds the profilers run unprofiled. A profile that cannot be written is
+    reported as a warning and never replaces the call's own exception.
+    """
+    global _claimed
+    directory = profile_directory()
+    if directory is None or _active.get():
+        return fn()
+    with _lock:
+        if _claimed:
+            profiler = None
+        else:
+            _claimed = True
+            handle, rprof_path = tempfile.mkstemp(prefix="njsd-rprof-", suffix=".out")
+            os.close(handle)
+            profiler = cProfile.Profile()
+            r_started = _rprof_start(rprof_path)
+            profiler.enable()
+    if profiler is None:
+        return fn()
+    token = _active.set(True)
+    try:
+        return fn()
+    finally:
+        _active.reset(token)
+        with _lock:
+            profiler.disable()
+            try:
+                if r_started:
+                    _rprof_stop()
+            finally:
+                _claimed = False
+            try:
+                _write_profile(name, args, kwargs, directory, profiler, rprof_path)
+            except Exception as e:
+                warnings.warn(f"could not write profile for {name}: {e}", RuntimeWarning)
+
+
+def _write_profile(
+    name: str,
+    args: tuple,
+    kwargs: dict,
+    directory: Path,
+    profiler: cProfile.Profile,
+    rprof_path: str,
+) -> Path:
+    try:
+        r_text = Path(rprof_path).read_text(encoding="utf-8", errors="replace")
+    finally:
+        os.unlink(rprof_path)
+    stamp = time.strftime("%Y%m%dT%H%M%S")
+    return write_folded(
+        merge_stacks(python_stacks(pstats.Stats(profiler)), r_stacks(r_text)),
+        directory / f"{_slug(name, args, kwargs)}-{stamp}-{os.getpid()}-"
+        f"{next(_sequence)}.folded",
+    )
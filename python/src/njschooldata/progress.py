@@ -0,0 +1,210 @@
+"""
+Progress callbacks for long multi-item fetches.
+
+R's batch fetchers (``fetch_*_multi``, ``fetch_all_*``, ``fetch_many_*`` and
+``fetch_enr_years``) report every item through the
+``njschooldata.progress_callback`` option. R sends an event when an item
+starts and another when it is done. Pass ``progress=`` to one of these
+wrappers, or wrap calls in :func:`report_progress`, to receive each event as
+a :class:`ProgressEvent`. ``progress`` may be:
+
+- a callable, called as ``progress(event)``;
+- a ``tqdm`` bar, or any object with ``update(n)`` and ``set_postfix_str(s)``,
+  which is advanced once per finished item.
+
+Events arrive on the calling thread while R runs. No event arrives while a
+download is in progress, so the time since the last event shows how long the
+current item has run. Exceptions raised by a callback are reported as
+warnings and do not fail the fetch.
+
+Calls made with a callback are never coalesced with a concurrent identical
+call (see :func:`~njschooldata._r_bridge.r_to_pandas`), so every caller's
+callback receives its own events.
+"""
+
+import contextvars
+import functools
+import re
+import warnings
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, Optional
+
+_PROGRESS_EXPORT_RE = re.compile(r"^fetch_(?:all_|many_|\w+_multi$|enr_years$)")
+
+_callback: contextvars.ContextVar = contextvars.ContextVar(
+    "njsd_progress_callback", default=None
+)
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    """
+    One item of a batch fetch starting or finishing.
+
+    Attributes
+    ----------
+    task : str
+        R function running the batch, such as ``"fetch_all_parcc"``.
+    phase : str
+        ``"start"`` or ``"done"``.
+    index : int
+        1-based position of the item.
+    total : int
+        Number of items in the batch.
+    item : str
+        Display name of the item, such as ``"2023 4 math"``.
+    elapsed : float
+        Seconds spent on the item; ``0`` when it starts.
+    total_elapsed : float
+        Seconds since the batch started.
+    bytes : float
+        Bytes downloaded for the item. Artifacts served from a cache, the
+        source store or a ``304`` revalidation are not counted.
+    status : str or None
+        When done, the least successful source status of the item, or
+        ``"error"`` if it raised.
+    """
+
+    task: str
+    phase: str
+    index: int
+    total: int
+    item: str
+    elapsed: float = 0.0
+    total_elapsed: float = 0.0
+    bytes: float = 0.0
+    status: Optional[str] = None
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Seconds until the batch finishes, at the average rate so far."""
+        finished = self.index if self.phase == "done" else self.index - 1
+        if finished <= 0:
+            return None
+        return self.total_elapsed / finished * (self.total - finished)
+
+    @classmethod
+    def from_r(cls, event: dict) -> "ProgressEvent":
+        """Build an event from the named list R passes to the callback."""
+        return cls(
+            task=str(event.get("task", "")),
+            phase=str(event.get("phase", "")),
+            index=int(event.get("index", 0)),
+            total=int(event.get("total", 0)),
+            item=str(event.get("item", "")),
+            elapsed=float(event.get("elapsed", 0.0)),
+            total_elapsed=float(event.get("total_elapsed", 0.0)),
+            bytes=float(event.get("bytes", 0.0)),
+            status=None if event.get("status") is None else str(event["status"]),
+        )
+
+
+class _BarReporter:
+    """Drive a ``tqdm``-style bar from progress events."""
+
+    def __init__(self, bar: Any) -> None:
+        self.bar = bar
+
+    def __call__(self, event: ProgressEvent) -> None:
+        bar = self.bar
+        if getattr(bar, "total", None) != event.total:
+            bar.total = event.total
+            if hasattr(bar, "refresh"):
+                bar.refresh()
+        if event.phase == "start":
+            bar.set_postfix_str(event.item)
+        elif event.phase == "done":
+            bar.set_postfix_str(f"{event.item} {event.status}")
+            bar.update(1)
+
+
+def as_callback(progress: Any) -> Callable[[ProgressEvent], Any]:
+    """Return ``progress`` as a callable taking a :class:`ProgressEvent`."""
+    if hasattr(progress, "update") and hasattr(progress, "set_postfix_str"):
+        return _BarReporter(progress)
+    if callable(progress):
+        return progress
+    raise TypeError(
+        "progress must be a callable or a tqdm-style bar with update() and "
+        f"set_postfix_str(), not {type(progress).__name__}"
+    )
+
+
+def progress_active() -> bool:
+    """Whether calls made in this context send progress events to a callback."""
+    return _callback.get() is not None
+
+
+def reports_progress(name: str) -> bool:
+    """Whether the R export ``name`` reports per-item progress."""
+    return bool(_PROGRESS_EXPORT_RE.match(name))
+
+
+@contextmanager
+def report_progress(progress: Any) -> Iterator[None]:
+    """
+    Send progress events from R calls made in this context to ``progress``.
+
+    ``progress=None`` reports nothing.
+
+    Examples
+    --------
+    >>> from tqdm import tqdm  # doctest: +SKIP
+    >>> with tqdm() as bar, report_progress(bar):  # doctest: +SKIP
+    ...     njsd.fetch_all_parcc()
+    """
+    if progress is None:
+        yield
+        return
+    callback = as_callback(progress)
+    install_r_callback()
+    token = _callback.set(callback)
+    try:
+        yield
+    finally:
+        _callback.reset(token)
+
+
+def with_progress(func: Callable) -> Callable:
+    """Give a pass-through batch fetcher a keyword-only ``progress`` argument."""
+    @functools.wraps(func)
+    def wrapper(*args, progress: Any = None, **kwargs):
+        if progress is None:
+            return func(*args, **kwargs)
+        with report_progress(progress):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def on_r_event(event: dict) -> None:
+    """Handle one event from R's ``njschooldata.progress_callback``."""
+    callback = _callback.get()
+    if callback is None:
+        return
+    try:
+        callback(ProgressEvent.from_r(event))
+    except Exception as e:
+        warnings.warn(f"progress callback {callback!r} failed: {e}", RuntimeWarning)
+
+
+_r_callback_installed = False
+
+
+def install_r_callback() -> None:
+    """Point R's ``njschooldata.progress_callback`` option at :func:`on_r_event`."""
+    global _r_callback_installed
+    if _r_callback_installed:
+        return
+    from rpy2.rinterface import NULL, rternalize
+
+    from ._r_bridge import ro
+
+    @rternalize
+    def progress_callback(event):
+        names = [str(key) for key in event.names] if len(event) else []
+        on_r_event({key: event[i][0] for i, key in enumerate(names)})
+        return NULL
+
+    ro.r["options"](**{"njschooldata.progress_callback": progress_callback})
+    _r_callback_installed = True
@@ -0,0 +1,342 @@
+"""Recover suppressed counts from rounded report-card percentages.
+
+Python engine for the sketch in ``R/recover_enrollment.R``
+(``enumerate_possibilities()`` / ``infer_postsec_counts()``). Instead of
+materializing every ``num / denom`` pair per call and filtering, a
+:class:`RationalTable` enumerates the pairs once per rounding rule, sorted by
+(reported value, denominator). Every query - a reported percentage plus a
+plausible denominator range - is then one pair of ``searchsorted`` calls that
+lands exactly on the matching run of candidates.
+
+Reported values are compared as integer multiples of ``10 ** -digits``
+percent, computed with exact integer arithmetic, so a query never misses a
+candidate because of floating-point representation.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Literal, Optional
+
+import numpy as np
+import pandas as pd
+
+__all__ = [
+    "RationalTable",
+    "infer_postsec_counts",
+    "rational_table",
+    "recover_counts",
+]
+
+RoundingRule = Literal["round", "trunc"]
+
+# Chunk size (in candidate rows) for the candidate expansion in resolve().
+_CHUNK = 4_000_000
+
+
+@dataclass(frozen=True)
+class RationalTable:
+    """
+    Every ``num / denom`` with ``0 <= num <= denom <= max_denom``, as reported.
+
+    Attributes
+    ----------
+    max_denom : int
+        Largest denominator enumerated.
+    rule : {"round", "trunc"}
+        ``round`` rounds half up (how report cards publish percentages);
+        ``trunc`` matches ``trunc2()`` in ``R/util.R``.
+    digits : int
+        Decimal places of the reported percentage.
+    key : np.ndarray
+        Sorted search key ``units * (max_denom + 1) + denom``, where ``units``
+        is the reported percentage in multiples of ``10 ** -digits``.
+    num, denom : np.ndarray
+        Numerator and denominator of each entry.
+    """
+
+    max_denom: int
+    rule: RoundingRule
+    digits: int
+    key: np.ndarray
+    num: np.ndarray
+    denom: np.ndarray
+
+    @classmethod
+    def build(
+        cls, max_denom: int = 500, rule: RoundingRule = "round", digits: int = 1
+    ) -> "RationalTable":
+        """Enumerate and sort the table for one rounding rule."""
+        if rule not in ("round", "trunc"):
+            raise ValueError(f"rule must be 'round' or 'trunc', not {rule!r}")
+        if max_denom < 1:
+            raise ValueError("max_denom must be at least 1")
+
+        sizes = np.arange(2, max_denom + 2)
+        denom = np.repeat(np.arange(1, max_denom + 1, dtype=np.int64), sizes)
+        num = np.arange(len(denom), dtype=np.int64) - np.repeat(
+            np.cumsum(sizes) - sizes, sizes
+        )
+        units, remainder = np.divmod(num * (100 * 10**digits), denom)
+        if rule == "round":
+            units += 2 * remainder >= denom
+
+        order = np.lexsort((denom, units))
+        return cls(
+            max_denom=max_denom,
+            rule=rule,
+            digits=digits,
+            key=(units * (max_denom + 1) + denom)[order],
+            num=num[order].astype(np.int32),
+            denom=denom[order].astype(np.int32),
+        )
+
+    def __len__(self) -> int:
+        return len(self.key)
+
+    @property
+    def units(self) -> np.ndarray:
+        """Reported percentage of each entry, in multiples of ``10 ** -digits``."""
+        return self.key // (self.max_denom + 1)
+
+    def _key(self, units: np.ndarray, denom: np.ndarray) -> np.ndarray:
+        return units * (self.max_denom + 1) + denom
+
+    def to_units(self, percent) -> np.ndarray:
+        """Convert reported percentages to integer units (NaN -> -1)."""
+        percent = np.asarray(percent, dtype=np.float64)
+        units = np.full(percent.shape, -1, dtype=np.int64)
+        ok = np.isfinite(percent) & (percent >= 0) & (percent <= 100)
+        units[ok] = np.rint(percent[ok] * 10**self.digits).astype(np.int64)
+        return units
+
+    def candidate_ranges(self, percent, denom_lo, denom_hi):
+        """
+        Locate the run of matching candidates for each query.
+
+        Returns
+        -------
+        tuple of np.ndarray
+            ``(start, stop)`` offsets into the table; ``stop - start`` is the
+            number of ``(num, denom)`` pairs that report as ``percent`` with a
+            denominator in ``[denom_lo, denom_hi]``.
+        """
+        units = self.to_units(percent)
+        lo = np.clip(np.asarray(denom_lo, dtype=np.int64), 1, self.max_denom + 1)
+        hi = np.clip(np.asarray(denom_hi, dtype=np.int64), 0, self.max_denom)
+        start = np.searchsorted(self.key, self._key(units, lo), side="left")
+        stop = np.searchsorted(self.key, self._key(units, hi), side="right")
+        stop = np.where((units < 0) | (hi < lo), start, np.maximum(stop, start))
+        return start, stop
+
+    def resolve(
+        self, percent, denom_lo, denom_hi, expected_denom=None
+    ) -> pd.DataFrame:
+        """
+        Recover counts for many ``(percent, denominator range)`` queries.
+
+        Parameters
+        ----------
+        percent : array-like
+            Reported percentages (0-100).
+        denom_lo, denom_hi : array-like
+            Inclusive plausible denominator range per query.
+        expected_denom : array-like, optional
+            Best denominator estimate; the candidate closest to it is chosen
+            (ties go to the smaller denominator). Defaults to the range
+            midpoint.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per query with ``count``, ``denom``, ``n_candidates``,
+            ``n_counts`` (distinct numerators), ``resolved`` and
+            ``ambiguous`` (more than one distinct count is possible).
+        """
+        percent = np.atleast_1d(np.asarray(percent, dtype=np.float64))
+        n = len(percent)
+        denom_lo = np.broadcast_to(np.asarray(denom_lo, dtype=np.int64), n)
+        denom_hi = np.broadcast_to(np.asarray(denom_hi, dtype=np.int64), n)
+        if expected_denom is None:
+            expected = (denom_lo + denom_hi) / 2
+        else:
+            expected = np.broadcast_to(
+                np.asarray(expected_denom, dtype=np.float64), n
+            )
+
+        start, stop = self.candidate_ranges(percent, denom_lo, denom_hi)
+        size = stop - start
+        count = np.full(n, -1, dtype=np.int64)
+        best_denom = np.full(n, -1, dtype=np.int64)
+        n_counts = np.zeros(n, dtype=np.int64)
+
+        ends = np.cumsum(size)
+        q0 = 0
+        while q0 < n:
+            done = ends[q0 - 1] if q0 else 0
+            q1 = max(q0 + 1, int(np.searchsorted(ends, done + _CHUNK, side="right")))
+            self._resolve_chunk(
+                slice(q0, q1), start, size, expected, count, best_denom, n_counts
+            )
+            q0 = q1
+
+        resolved = size > 0
+        count_out = pd.array(count, dtype="Int64")
+        count_out[~resolved] = pd.NA
+        denom_out = pd.array(best_denom, dtype="Int64")
+        denom_out[~resolved] = pd.NA
+        return pd.DataFrame({
+            "count": count_out,
+            "denom": denom_out,
+            "n_candidates": size,
+            "n_counts": n_counts,
+            "resolved": resolved,
+            "ambiguous": n_counts > 1,
+        })
+
+    def _resolve_chunk(self, rows, start, size, expected, count, best_denom, n_counts):
+        sizes = size[rows]
+        total = int(sizes.sum())
+        if total == 0:
+            return
+        query = np.repeat(np.arange(rows.start, rows.stop), sizes)
+        offset = np.arange(total) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        idx = start[query] + offset
+        num = self.num[idx]
+        denom = self.denom[idx]
+
+        distance = np.abs(denom - expected[query])
+        order = np.lexsort((denom, distance, query))
+        first = np.r_[True, query[order][1:] != query[order][:-1]]
+        picked = order[first]
+        count[query[picked]] = num[picked]
+        best_denom[query[picked]] = denom[picked]
+
+        by_num = np.lexsort((num, query))
+        new_value = np.r_[
+            True,
+            (query[by_num][1:] != query[by_num][:-1]) | (num[by_num][1:] != num[by_num][:-1]),
+        ]
+        np.add.at(n_counts, query[by_num][new_value], 1)
+
+
+@lru_cache(maxsize=8)
+def rational_table(
+    max_denom: int = 500, rule: RoundingRule = "round", digits: int = 1
+) -> RationalTable:
+    """Cached :meth:`RationalTable.build`."""
+    return RationalTable.build(max_denom, rule, digits)
+
+
+def recover_counts(
+    percent,
+    denom_lo,
+    denom_hi,
+    expected_denom=None,
+    rule: RoundingRule = "round",
+    digits: int = 1,
+    max_denom: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Recover integer counts behind rounded percentages.
+
+    Convenience wrapper that sizes a cached :class:`RationalTable` to the
+    largest requested denominator and calls :meth:`RationalTable.resolve`.
+    """
+    denom_hi_arr = np.asarray(denom_hi, dtype=np.float64)
+    if max_denom is None:
+        finite = denom_hi_arr[np.isfinite(denom_hi_arr)]
+        max_denom = int(finite.max()) if finite.size else 1
+        # round up so nearby calls share one cached table
+        max_denom = max(500, -(-max_denom // 250) * 250)
+    table = rational_table(max_denom, rule, digits)
+    return table.resolve(percent, denom_lo, np.nan_to_num(denom_hi_arr, nan=-1), expected_denom)
+
+
+def infer_postsec_counts(
+    matric: pd.DataFrame,
+    enr: pd.DataFrame,
+    tolerance: float = 0.2,
+    lag: int = 1,
+    rule: RoundingRule = "round",
+    digits: int = 1,
+) -> pd.DataFrame:
+    """
+    Recover postsecondary matriculation counts from report-card percentages.
+
+    ``enroll_any`` is a percentage of the graduating class, so its
+    denominator is searched within ``tolerance`` of the prior year's grade 12
+    enrollment (matriculation reported for ``end_year`` describes the class
+    of ``end_year - lag``). ``enroll_4yr`` / ``enroll_2yr`` are percentages
+    of college enrollees, so they are solved against the recovered
+    ``enroll_any_count`` exactly.
+
+    Parameters
+    ----------
+    matric : pd.DataFrame
+        Output of ``extract_rc_college_matric()``: ``end_year``,
+        ``county_code``, ``district_code``, ``school_code``, ``subgroup`` and
+        ``enroll_any`` (plus optional ``enroll_4yr`` / ``enroll_2yr``).
+    enr : pd.DataFrame
+        Tidy enrollment (``fetch_enr(tidy=TRUE)``) with ``grade_level``,
+        ``subgroup`` and ``n_students``.
+    tolerance : float
+        Relative width of the graduating-class denominator window.
+    lag : int
+        Years between the reported matriculation and the graduating class.
+    rule, digits : see :class:`RationalTable`.
+
+    Returns
+    -------
+    pd.DataFrame
+        Schoolwide ``matric`` rows with ``grade12_enr``,
+        ``graduated_count_est``, ``enroll_any_count`` and its
+        ``enroll_any_n_candidates`` / ``enroll_any_ambiguous`` flags, plus
+        ``enroll_4yr_count`` / ``enroll_2yr_count`` (and flags) when those
+        columns are present.
+    """
+    df = matric[matric["subgroup"].isin(["total population", "Schoolwide"])].copy()
+    df = df.reset_index(drop=True)
+
+    g12 = enr[
+        (enr["grade_level"].astype("string") == "12")
+        & (enr["subgroup"] == "total_enrollment")
+    ]
+    g12 = g12.assign(end_year=g12["end_year"] + lag)[
+        ["end_year", "county_id", "district_id", "school_id", "n_students"]
+    ].rename(columns={
+        "county_id": "county_code",
+        "district_id": "district_code",
+        "school_id": "school_code",
+        "n_students": "grade12_enr",
+    })
+    keys = ["end_year", "county_code", "district_code", "school_code"]
+    df = df.merge(g12.drop_duplicates(keys), on=keys, how="left")
+
+    d0 = pd.to_numeric(df["grade12_enr"], errors="coerce").to_numpy(dtype=np.float64)
+    known = np.isfinite(d0) & (d0 > 0)
+    lo = np.where(known, np.floor(np.where(known, d0, 0) * (1 - tolerance)), 0)
+    hi = np.where(known, np.ceil(np.where(known, d0, 0) * (1 + tolerance)), -1)
+    anyc = recover_counts(
+        df["enroll_any"].to_numpy(dtype=np.float64), np.maximum(lo, 1), hi,
+        expected_denom=np.where(known, d0, 0), rule=rule, digits=digits,
+    )
+    df["graduated_count_est"] = anyc["denom"].to_numpy()
+    df["enroll_any_count"] = anyc["count"].to_numpy()
+    df["enroll_any_n_candidates"] = anyc["n_candidates"].to_numpy()
+    df["enroll_any_ambiguous"] = anyc["ambiguous"].to_numpy()
+
+    base = df["enroll_any_count"].to_numpy(dtype=np.float64, na_value=np.nan)
+    base_ok = np.isfinite(base) & (base > 0)
+    exact = np.where(base_ok, base, 0).astype(np.int64)
+    for col in ("enroll_4yr", "enroll_2yr"):
+        if col not in df.columns:
+            continue
+        sub = recover_counts(
+            df[col].to_numpy(dtype=np.float64), exact, np.where(base_ok, exact, -1),
+            rule=rule, digits=digits,
+        )
+        df[f"{col}_count"] = sub["count"].to_numpy()
+        df[f"{col}_ambiguous"] = sub["ambiguous"].to_numpy()
+    return df
@@ -1,8 +1,11 @@
 """Special education data functions."""
 
+from typing import Any
+
 import pandas as pd
 
 from ._r_bridge import call_r_function, r_to_pandas
+from .progress import report_progress
 
 
 @r_to_pandas
@@ -86,20 +89,24 @@ def fetch_sped_placement_multi(
     tidy: bool = True,
     with_status: bool = False,
     allow_partial: bool = False,
+    *,
+    progress: Any = None,
 ) -> pd.DataFrame:
     """
     Fetch special education placement data for multiple years.
 
     Strict mode is the default. Set ``allow_partial=True`` to return successful
     years while retaining per-year status in
-    ``DataFrame.attrs["source_results"]``.
+    ``DataFrame.attrs["source_results"]``. ``progress`` receives per-year
+    events (see :mod:`njschooldata.progress`).
     """
-    return call_r_function(
-        "fetch_sped_placement_multi",
-        end_years,
-        age_group=age_group,
-        level=level,
-        tidy=tidy,
-        with_status=with_status,
-        allow_partial=allow_partial,
-    )
+    with report_progress(progress):
+        return call_r_function(
+            "fetch_sped_placement_multi",
+            end_years,
+            age_group=age_group,
+            level=level,
+            tidy=tidy,
+            with_status=with_status,
+            allow_partial=allow_partial,
+        )
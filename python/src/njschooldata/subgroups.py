@@ -0,0 +1,394 @@
+"""Compiled subgroup label recodes.
+
+Python counterpart to ``standardize_subgroup()`` / ``add_subgroup_std()``
+(``R/subgroup_std.R``) and the per-source cleaners
+``clean_spr_subgroups()``, ``clean_rc_subgroups()``,
+``clean_6yr_grad_subgroups()``, ``tidy_parcc_subgroup()``,
+``standardize_absence_subgroups()`` and
+``standardize_sped_placement_subgroups()``.
+
+Each mapping is compiled once into a :class:`SubgroupRecode` - a
+label -> canonical dictionary plus the R function's fall-through rule. Columns
+are recoded by mapping their distinct labels (categorical categories, or the
+uniques of a factorized column) and gathering by code, so the string work
+scales with the number of distinct labels rather than rows.
+"""
+
+from __future__ import annotations
+
+import re
+import warnings
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Callable, Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from ._generated_contract import SUBGROUP_STD_LOOKUP
+
+__all__ = [
+    "SUBGROUP_RECODES",
+    "SubgroupRecode",
+    "add_subgroup_std",
+    "recode_subgroups",
+    "standardize_subgroup",
+    "subgroup_recode",
+]
+
+
+def _missing(label: str) -> None:
+    return None
+
+
+def _identity(label: str) -> str:
+    return label
+
+
+@dataclass(frozen=True)
+class SubgroupRecode:
+    """
+    One compiled subgroup mapping.
+
+    Attributes
+    ----------
+    name : str
+        Recode key (see :data:`SUBGROUP_RECODES`).
+    mapping : Mapping[str, Optional[str]]
+        Normalized label -> canonical label (``None`` for an explicit
+        no-equivalent entry).
+    normalize : callable
+        Applied to each raw label before the dictionary lookup (e.g.
+        ``str.lower`` for the case-insensitive SPR cleaners).
+    fallback : callable
+        Result for normalized labels absent from ``mapping``.
+    warn_unmatched : bool
+        Whether labels absent from ``mapping`` are reported, as
+        ``warn_unmatched_subgroups()`` does for ``standardize_subgroup()``.
+    """
+
+    name: str
+    mapping: Mapping[str, Optional[str]]
+    normalize: Callable[[str], str] = _identity
+    fallback: Callable[[str], Optional[str]] = _identity
+    warn_unmatched: bool = False
+
+    def recode_label(self, label) -> Optional[str]:
+        """Recode one label (missing stays missing)."""
+        if label is None or label is pd.NA or (isinstance(label, float) and np.isnan(label)):
+            return None
+        key = self.normalize(str(label))
+        if key in self.mapping:
+            return self.mapping[key]
+        return self.fallback(key)
+
+    def recode(self, values: pd.Series) -> pd.Series:
+        """
+        Recode a column by its distinct labels.
+
+        Parameters
+        ----------
+        values : pd.Series
+            Raw subgroup labels (object, string or categorical).
+
+        Returns
+        -------
+        pd.Series
+            Categorical canonical labels aligned with ``values``.
+        """
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            codes = values.cat.codes.to_numpy()
+            uniques = values.cat.categories
+        else:
+            codes, uniques = pd.factorize(values, use_na_sentinel=True)
+        labels = list(uniques)
+
+        if self.warn_unmatched:
+            unmatched = [lab for lab in labels if self.normalize(str(lab)) not in self.mapping]
+            if unmatched:
+                warnings.warn(
+                    "Unmatched subgroup value(s): " + ", ".join(map(str, unmatched)),
+                    UserWarning,
+                    stacklevel=3,
+                )
+
+        recoded = [self.recode_label(lab) for lab in labels]
+        categories = pd.Index(sorted({r for r in recoded if r is not None}), dtype=object)
+        to_category = np.append(
+            categories.get_indexer(pd.Index(recoded, dtype=object)), -1
+        )
+        out = pd.Categorical.from_codes(to_category[codes], categories=categories)
+        return pd.Series(out, index=values.index, name=values.name)
+
+
+def _lower_map(pairs: Mapping[str, str]) -> Mapping[str, str]:
+    return MappingProxyType({k.lower(): v for k, v in pairs.items()})
+
+
+def _parcc_subgroup(label: str) -> str:
+    """``tidy_parcc_subgroup()``: ordered substring replacements."""
+    sv = label.upper()
+    for pattern, replacement in _PARCC_REPLACEMENTS:
+        sv = pattern.sub(replacement, sv)
+    return sv
+
+
+_PARCC_REPLACEMENTS = [
+    (re.compile(p if regex else re.escape(p)), r)
+    for p, r, regex in (
+        ("ALL STUDENTS", "total_population", False),
+        ("WHITE", "white", False),
+        ("BLACK OR AFRICAN AMERICAN", "black", False),
+        ("AFRICAN AMERICAN", "black", False),
+        ("ASIAN", "asian", False),
+        ("HISPANIC", "hispanic", False),
+        ("NATIVE HAWAIIAN OR OTHER PACIFIC ISLANDER|NATIVE HAWAIIAN", "pacific_islander", True),
+        ("AMERICAN INDIAN", "american_indian", False),
+        ("OTHER", "other", False),
+        ("FEMALE", "female", False),
+        ("MALE", "male", False),
+        ("STUDENTS WITH DISABLITIES|STUDENTS WITH DISABILITIES", "special_education", True),
+        ("SE ACCOMMODATION", "sped_accomodations", False),
+        ("ECONOMICALLY DISADVANTAGED", "ed", False),
+        ("NON ECON. DISADVANTAGED|NON-ECON. DISADVANTAGED", "non_ed", True),
+        ("ENGLISH LANGUAGE LEARNERS", "lep_current_former", False),
+        ("CURRENT - ELL", "lep_current", False),
+        ("FORMER - ELL", "lep_former", False),
+        ("MULTILINGUAL LEARNERS", "lep_current_former", False),
+        ("CURRENT - ML", "lep_current", False),
+        ("FORMER - ML", "lep_former", False),
+        ("NON-BINARY/UNDESIGNATED", "nonbinary_undesignated", False),
+        ("GRADE - other", "grade_other", False),
+        ("GRADE - 06", "grade_06", False),
+        ("GRADE - 07", "grade_07", False),
+        ("GRADE - 08", "grade_08", False),
+        ("GRADE - 09", "grade_09", False),
+        ("GRADE - 10", "grade_10", False),
+        ("GRADE - 11", "grade_11", False),
+        ("GRADE - 12", "grade_12", False),
+    )
+]
+
+_SPR = {
+    "schoolwide": "total population",
+    "districtwide": "total population",
+    "statewide": "total population",
+    "all students": "total population",
+    "american indian or alaska native": "american indian",
+    "black or african american": "black",
+    "economically disadvantaged students": "economically disadvantaged",
+    "english learners": "limited english proficiency",
+    "multilingual learners": "limited english proficiency",
+    "two or more races": "multiracial",
+    "native hawaiian or other pacific islander": "pacific islander",
+    "students with disabilities": "students with disabilities",
+    "students with disability": "students with disabilities",
+}
+
+_RC = {
+    "schoolwide": "total population",
+    "districtwide": "total population",
+    "total population": "total population",
+    "african american": "black",
+    "black": "black",
+    "black or african american": "black",
+    "students with disability": "students with disabilities",
+    "students with disabilities": "students with disabilities",
+    "limited english proficient students": "limited english proficiency",
+    "english language learners": "limited english proficiency",
+    "english learners": "limited english proficiency",
+    "multilingual learners": "limited english proficiency",
+    "economically disadvantaged students": "economically disadvantaged",
+    "economically disadvantaged": "economically disadvantaged",
+    "american indian or alaska native": "american indian",
+    "two or more races": "multiracial",
+    "native hawaiian or other pacific islander": "pacific islander",
+}
+
+_GRAD6YR = {
+    "schoolwide": "total population",
+    "districtwide": "total population",
+    "all students": "total population",
+    "american indian or alaska native": "american indian",
+    "black or african american": "black",
+    "economically disadvantaged students": "economically disadvantaged",
+    "english learners": "limited english proficiency",
+    "multilingual learners": "limited english proficiency",
+    "two or more races": "multiracial",
+    "hispanic": "hispanic",
+    "hispanic/latino": "hispanic",
+    "native hawaiian or pacific islander": "pacific islander",
+    "asian, native hawaiian, or pacific islander": "asian",
+    "students with disabilities": "students with disabilities",
+}
+
+_ABSENCE = {
+    "total population": "total",
+    "white": "white",
+    "black": "black",
+    "hispanic": "hispanic",
+    "asian": "asian",
+    "american indian": "native_american",
+    "pacific islander": "pacific_islander",
+    "multiracial": "multiracial",
+    "economically disadvantaged": "econ_disadv",
+    "limited english proficiency": "lep",
+    "students with disabilities": "special_ed",
+    "male": "male",
+    "female": "female",
+}
+
+_SPED_PLACEMENT = {
+    "Districtwide": "total",
+    "American Indian or Alaska Native": "native_american",
+    "Asian": "asian",
+    "Black or African American": "black",
+    "Black": "black",
+    "Hispanic": "hispanic",
+    "Hispanic/Latino": "hispanic",
+    "Native Hawaiian or Pacific Islander": "pacific_islander",
+    "Native Hawaiian or Other Pacific Islander": "pacific_islander",
+    "Two or More Races": "multiracial",
+    "Two or more races": "multiracial",
+    "Two or More": "multiracial",
+    "White": "white",
+    "Female": "female",
+    "Male": "male",
+    "Non-Binary/Undesignated": "non_binary",
+    "Multilingual Learner": "lep",
+    "Non-Multilingual Learner": "non_lep",
+    "English Learner": "lep",
+    "English_Learner": "lep",
+    "Non-English Learner": "non_lep",
+    "Non-Englishh Learner": "non_lep",
+    "Auditory Impairment": "auditory_impairment",
+    "Autism": "autism",
+    "Deaf-Blindness": "deaf_blindness",
+    "Deaf Blindness": "deaf_blindness",
+    "Deaf- Blindness": "deaf_blindness",
+    "Developmental Delay": "developmental_delay",
+    "Emotional Disturbance": "emotional_disturbance",
+    "Emotional Regulation Impairment": "emotional_regulation_impairment",
+    "Hearing Impairment": "hearing_impairment",
+    "Hearing impairment": "hearing_impairment",
+    "Intellectual Disability": "intellectual_disability",
+    "Multiple Disabilities": "multiple_disabilities",
+    "Orthopedic Impairment": "orthopedic_impairment",
+    "Other Health Impairment": "other_health_impairment",
+    "Pre-School Disabled": "preschool_disability",
+    "Preschool Child with a Disability": "preschool_disability",
+    "Specific Learning Disability": "specific_learning_disability",
+    "Speech or Language Impairment": "speech_language_impairment",
+    "Traumatic Brain Injury": "traumatic_brain_injury",
+    "Visual Impairment": "visual_impairment",
+}
+
+
+def _subgroup_std_mapping() -> Mapping[str, Optional[str]]:
+    """``subgroup_std_lookup()``: raw value -> standard, conflicts rejected."""
+    mapping: dict = {}
+    conflicts = []
+    for raw, std in zip(SUBGROUP_STD_LOOKUP["raw_value"], SUBGROUP_STD_LOOKUP["subgroup_std"]):
+        if raw in mapping and mapping[raw] != std:
+            conflicts.append(raw)
+        mapping.setdefault(raw, std)
+    if conflicts:
+        raise ValueError(
+            "subgroup_crosswalk has conflicting mappings for: " + ", ".join(conflicts)
+        )
+    return MappingProxyType(mapping)
+
+
+SUBGROUP_RECODES = {
+    "spr": "clean_spr_subgroups()",
+    "rc": "clean_rc_subgroups()",
+    "grad6yr": "clean_6yr_grad_subgroups()",
+    "parcc": "tidy_parcc_subgroup()",
+    "absence": "standardize_absence_subgroups()",
+    "sped_placement": "standardize_sped_placement_subgroups()",
+    "std": "standardize_subgroup()",
+}
+
+
+@lru_cache(maxsize=None)
+def subgroup_recode(name: str) -> SubgroupRecode:
+    """
+    Compiled recode for one of :data:`SUBGROUP_RECODES`.
+
+    Raises
+    ------
+    ValueError
+        For an unknown recode name.
+    """
+    lower = str.lower
+    if name == "spr":
+        return SubgroupRecode(name, _lower_map(_SPR), lower, _identity)
+    if name == "rc":
+        return SubgroupRecode(name, _lower_map(_RC), lower, _identity)
+    if name == "grad6yr":
+        return SubgroupRecode(name, _lower_map(_GRAD6YR), lower, _identity)
+    if name == "parcc":
+        return SubgroupRecode(name, MappingProxyType({}), _identity, _parcc_subgroup)
+    if name == "absence":
+        return SubgroupRecode(name, MappingProxyType(_ABSENCE))
+    if name == "sped_placement":
+        return SubgroupRecode(name, MappingProxyType(_SPED_PLACEMENT))
+    if name == "std":
+        return SubgroupRecode(name, _subgroup_std_mapping(), _identity, _missing, True)
+    raise ValueError(
+        f"Unknown subgroup recode '{name}'. Choose from: {', '.join(SUBGROUP_RECODES)}."
+    )
+
+
+def recode_subgroups(values, recode: Union[str, SubgroupRecode]) -> pd.Series:
+    """
+    Recode a column of subgroup labels.
+
+    Parameters
+    ----------
+    values : array-like or pd.Series
+        Raw labels.
+    recode : str or SubgroupRecode
+        A :data:`SUBGROUP_RECODES` key or a compiled recode.
+
+    Returns
+    -------
+    pd.Series
+        Categorical canonical labels.
+    """
+    if isinstance(recode, str):
+        recode = subgroup_recode(recode)
+    if not isinstance(values, pd.Series):
+        values = pd.Series(values, dtype=object)
+    return recode.recode(values)
+
+
+def standardize_subgroup(values) -> pd.Series:
+    """
+    Map cleaned subgroup labels onto the shared ``subgroup_std`` vocabulary.
+
+    Labels with no crosswalk entry, or an explicit no-equivalent entry,
+    become missing; labels with no entry are reported in a warning.
+    """
+    return recode_subgroups(values, "std")
+
+
+def add_subgroup_std(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add ``subgroup_std`` immediately after the ``subgroup`` column.
+
+    Returns ``df`` unchanged when it has no ``subgroup`` column.
+    """
+    if "subgroup" not in df.columns:
+        return df
+    base = df.drop(columns="subgroup_std", errors="ignore")
+    std = recode_subgroups(base["subgroup"], "std")
+    return base.assign(subgroup_std=std)[
+        _insert_after(list(base.columns), "subgroup", "subgroup_std")
+    ]
+
+
+def _insert_after(columns: list, anchor: str, new: str) -> list:
+    position = columns.index(anchor) + 1
+    return columns[:position] + [new] + columns[position:]
@@ -0,0 +1,753 @@
+"""Vectorized engines for the TGES comparative analysis toolkit.
+
+Python counterparts to helpers in ``R/tges_analysis.R`` that operate on frames
+already pulled from R (``tges_composition()``, ``tges_staffing()``, ...) and
+answer every district at once instead of one request per district:
+
+``TgesPeerIndex``
+    KD-tree over standardized structural features; batched
+    ``tges_find_peers()``.
+``tges_frontier`` / ``fdh_efficiency``
+    free-disposal-hull efficiency by sort-and-sweep, matching
+    ``tges_frontier()`` / ``.tges_fdh_group()``.
+``tges_convergence`` / ``tges_real_growth`` / ``batched_ols``
+    every peer-group regression solved in one padded, batched least-squares
+    call; growth decomposition and deflation as whole-panel array operations.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Sequence
+import warnings
+
+import numpy as np
+import pandas as pd
+
+try:
+    from scipy.spatial import cKDTree
+    from scipy.special import stdtr
+except ImportError as e:  # pragma: no cover - exercised only without scipy
+    cKDTree = None
+    stdtr = None
+    _SCIPY_IMPORT_ERROR = e
+else:
+    _SCIPY_IMPORT_ERROR = None
+
+__all__ = [
+    "DEFAULT_PEER_FEATURES",
+    "DFG_ORDER",
+    "TgesPeerIndex",
+    "batched_ols",
+    "fdh_efficiency",
+    "tges_convergence",
+    "tges_frontier",
+    "tges_peer_index",
+    "tges_real_growth",
+]
+
+# tges_find_peers() defaults
+DEFAULT_PEER_FEATURES = (
+    "ade", "budgetary_pp", "classroom_share",
+    "administration_share", "local_share", "state_share",
+)
+
+# District Factor Groups, poorest to wealthiest. Used to turn `dfg` into the
+# ordinal `dfg_rank` feature when a caller opts into matching on DFG.
+DFG_ORDER = ("A", "B", "CD", "DE", "FG", "GH", "I", "J")
+
+_ENTITY_COLUMNS = ("district_id", "district_name", "county_name", "group", "dfg")
+
+# peer system -> column carrying the peer group (see .tges_attach_peer())
+_PEER_COLUMNS = {"tges_group": "group", "dfg": "dfg", "county": "county_name"}
+
+# CSG1AA_AVGS columns used by tges_real_growth()
+_EXP_COL = "Total Expenditures, actual costs"
+_ADE_COL = "Average Daily Enrollment plus Sent Pupils"
+_PP_COL = "Per Pupil Total Expenditures"
+
+
+def _require_scipy() -> None:
+    """Raise a clear error if scipy is unavailable."""
+    if cKDTree is None:
+        raise ImportError(
+            "scipy is required for the TGES analysis engines. Install the "
+            "Python package with the 'analysis' extra."
+        ) from _SCIPY_IMPORT_ERROR
+
+
+@dataclass(frozen=True)
+class TgesPeerIndex:
+    """KD-tree over z-scored district features for one report year.
+
+    Built by :meth:`build`; ``entities`` and ``z`` hold only districts with a
+    complete feature vector, in the same order as the tree.
+    """
+
+    year: Optional[int]
+    features: tuple[str, ...]
+    entities: pd.DataFrame
+    raw: pd.DataFrame
+    z: np.ndarray
+    tree: object
+
+    @classmethod
+    def build(
+        cls,
+        feat: pd.DataFrame,
+        features: Sequence[str] = DEFAULT_PEER_FEATURES,
+        year: Optional[int] = None,
+    ) -> "TgesPeerIndex":
+        """
+        Standardize ``features`` the way ``tges_find_peers()`` does and index them.
+
+        Parameters
+        ----------
+        feat : pd.DataFrame
+            One row per district (per ``end_year`` when present) with
+            ``district_id`` and the feature columns, e.g. ``tges_composition()``
+            joined to ``tges_staffing()``, latest ADE and revenue mix.
+        features : sequence of str
+            Feature columns. ``ade`` is log-transformed before scaling;
+            ``dfg_rank`` is derived from ``dfg`` via :data:`DFG_ORDER`.
+        year : int or None, default None
+            ``end_year`` to index; defaults to the latest present.
+
+        Returns
+        -------
+        TgesPeerIndex
+        """
+        _require_scipy()
+        if "end_year" in feat.columns and len(feat):
+            year = int(feat["end_year"].max()) if year is None else int(year)
+            feat = feat[feat["end_year"] == year]
+        if "dfg_rank" in features and "dfg_rank" not in feat.columns:
+            feat = feat.assign(dfg_rank=feat["dfg"].map(
+                {dfg: i for i, dfg in enumerate(DFG_ORDER, start=1)}
+            ))
+        missing = [col for col in features if col not in feat.columns]
+        if missing:
+            raise ValueError(f"Requested feature(s) not available: {missing}")
+        feat = feat.drop_duplicates("district_id").reset_index(drop=True)
+
+        fmat = feat[list(features)].apply(pd.to_numeric, errors="coerce")
+        if "ade" in fmat.columns:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                fmat["ade"] = np.log(fmat["ade"])
+        fmat = fmat.replace([np.inf, -np.inf], np.nan)
+
+        # drop zero-variance features (constant -> no information, divides by 0)
+        dead = [
+            col for col in fmat.columns
+            if fmat[col].count() < 2 or fmat[col].max() == fmat[col].min()
+        ]
+        if dead:
+            warnings.warn(
+                "Dropping zero-variance feature(s) from the distance: "
+                + ", ".join(dead),
+                stacklevel=2,
+            )
+            fmat = fmat.drop(columns=dead)
+        if fmat.shape[1] == 0:
+            raise ValueError("No usable (non-constant) features remain.")
+
+        complete = fmat.notna().all(axis=1).to_numpy()
+        values = fmat.to_numpy(dtype=float)[complete]
+        z = (values - values.mean(axis=0)) / values.std(axis=0, ddof=1)
+        entities = feat.loc[complete, [c for c in _ENTITY_COLUMNS if c in feat.columns]]
+        if "dfg" not in entities.columns:
+            entities = entities.assign(dfg=pd.NA)
+        return cls(
+            year=year,
+            features=tuple(fmat.columns),
+            entities=entities.reset_index(drop=True),
+            raw=feat.loc[complete, list(features)].reset_index(drop=True),
+            z=z,
+            tree=cKDTree(z),
+        )
+
+    def find_peers(
+        self,
+        district_ids: Optional[Sequence[str]] = None,
+        n: int = 10,
+    ) -> pd.DataFrame:
+        """
+        Answer k-nearest-peer queries for many districts in one tree query.
+
+        Parameters
+        ----------
+        district_ids : sequence of str or None, default None
+            Focal districts; ``None`` queries every indexed district.
+        n : int, default 10
+            Peers per focal district, besides the focal row.
+
+        Returns
+        -------
+        pd.DataFrame
+            Long frame keyed by ``focal_district_id``: the focal row first
+            (``is_focal``, ``distance == 0``) then its ``n`` nearest peers by
+            ascending scaled Euclidean distance, with entity and raw feature
+            columns as in ``tges_find_peers()``.
+        """
+        ids = self.entities["district_id"].astype(str)
+        if district_ids is None:
+            focal = np.arange(len(ids))
+        else:
+            position = pd.Index(ids).get_indexer([str(d) for d in district_ids])
+            unknown = [d for d, pos in zip(district_ids, position) if pos < 0]
+            if unknown:
+                raise ValueError(
+                    f"District(s) {unknown} not indexed for year {self.year}; "
+                    "they are absent or missing one or more requested features."
+                )
+            focal = position
+
+        k = min(n + 1, len(ids))
+        distance, neighbor = self.tree.query(self.z[focal], k=k)
+        distance = distance.reshape(len(focal), k)
+        neighbor = neighbor.reshape(len(focal), k)
+
+        # the focal district leads even when another district ties it at 0
+        is_self = neighbor == focal[:, None]
+        missing_self = ~is_self.any(axis=1)
+        neighbor[missing_self, -1] = focal[missing_self]
+        distance[missing_self, -1] = 0.0
+        is_self[missing_self, -1] = True
+        order = np.argsort(~is_self, axis=1, kind="stable")
+        neighbor = np.take_along_axis(neighbor, order, axis=1)
+        distance = np.take_along_axis(distance, order, axis=1)
+
+        flat = neighbor.ravel()
+        out = pd.concat(
+            [self.entities.iloc[flat].reset_index(drop=True),
+             self.raw.iloc[flat].reset_index(drop=True)],
+            axis=1,
+        )
+        out.insert(0, "focal_district_id", np.repeat(ids.to_numpy()[focal], k))
+        out.insert(out.columns.get_loc("dfg") + 1, "is_focal", np.tile(
+            np.arange(k) == 0, len(focal)
+        ))
+        out.insert(out.columns.get_loc("is_focal") + 1, "distance",
+                   np.round(distance.ravel(), 4))
+        return out
+
+
+_PEER_INDEX_CACHE_SIZE = 16
+_PEER_INDEX_CACHE: OrderedDict = OrderedDict()
+_PEER_INDEX_LOCK = threading.Lock()
+
+
+def tges_peer_index(
+    feat: pd.DataFrame,
+    features: Sequence[str] = DEFAULT_PEER_FEATURES,
+    year: Optional[int] = None,
+) -> TgesPeerIndex:
+    """
+    Return a cached :class:`TgesPeerIndex` for ``feat`` and ``year``.
+
+    The cache key is the year, the feature list, the frame's column names and
+    a SHA-1 digest of its row hashes in order, so a service rebuilding the
+    same frame reuses the tree. The least recently used of more than
+    ``_PEER_INDEX_CACHE_SIZE`` indexes is evicted.
+    """
+    row_hashes = pd.util.hash_pandas_object(feat, index=False).to_numpy()
+    key = (
+        year,
+        tuple(features),
+        tuple(map(str, feat.columns)),
+        hashlib.sha1(row_hashes.tobytes()).hexdigest(),
+    )
+    with _PEER_INDEX_LOCK:
+        index = _PEER_INDEX_CACHE.get(key)
+        if index is not None:
+            _PEER_INDEX_CACHE.move_to_end(key)
+            return index
+    index = TgesPeerIndex.build(feat, features, year)
+    with _PEER_INDEX_LOCK:
+        _PEER_INDEX_CACHE[key] = index
+        _PEER_INDEX_CACHE.move_to_end(key)
+        while len(_PEER_INDEX_CACHE) > _PEER_INDEX_CACHE_SIZE:
+            _PEER_INDEX_CACHE.popitem(last=False)
+    return index
+
+
+def _real_districts(df: pd.DataFrame) -> pd.DataFrame:
+    """Drop group-average / sentinel rows (``NA`` or ``"00NA"`` district ids)."""
+    if "district_id" not in df.columns:
+        return df
+    return df[df["district_id"].notna() & (df["district_id"] != "00NA")]
+
+
+def _attach_peer(df: pd.DataFrame, peer: str) -> pd.DataFrame:
+    """Add ``peer_group`` from the column backing one of the peer systems."""
+    if peer == "statewide":
+        return df.assign(peer_group="statewide")
+    if peer not in _PEER_COLUMNS:
+        raise ValueError(
+            "peer must be one of 'tges_group', 'dfg', 'county', 'statewide'"
+        )
+    column = _PEER_COLUMNS[peer]
+    if column not in df.columns:
+        raise ValueError(f"peer = '{peer}' needs a `{column}` column.")
+    return df.assign(peer_group=df[column])
+
+
+def _group_codes(groups) -> np.ndarray:
+    if groups is None:
+        return None
+    return pd.DataFrame(groups).groupby(
+        list(pd.DataFrame(groups).columns), sort=False, dropna=False
+    ).ngroup().to_numpy()
+
+
+def _fdh_sweep(spend: np.ndarray, outcome: np.ndarray, codes: np.ndarray,
+               ok: np.ndarray) -> np.ndarray:
+    """Reference row per row for one input and one output, all groups at once.
+
+    Rows are swept from best to worst outcome within each group; the running
+    minimum of ``(spend, row)`` at the end of each tie block is the cheapest
+    peer doing at least as well, with R's ``which.min`` first-row tie-break.
+    """
+    rows = np.flatnonzero(ok)
+    ref = np.full(len(spend), -1, dtype=np.int64)
+    if not len(rows):
+        return ref
+    g, s, o = codes[rows], spend[rows], outcome[rows]
+
+    # lexicographic (spend, row) rank so a scalar running minimum carries both
+    cost_rank = np.empty(len(rows), dtype=np.int64)
+    cost_rank[np.lexsort((rows, s))] = np.arange(len(rows))
+
+    order = np.lexsort((-o, g))
+    g, o, cost_rank = g[order], o[order], cost_rank[order]
+    # later groups get strictly smaller keys so the running min never leaks
+    n_groups = int(g.max()) + 1
+    key = (n_groups - g) * len(rows) + cost_rank
+    running = np.minimum.accumulate(key)
+
+    # every row in a tie block sees the block's last running minimum
+    block_end = np.r_[(g[1:] != g[:-1]) | (o[1:] != o[:-1]), True]
+    block_id = np.cumsum(np.r_[True, block_end[:-1]]) - 1
+    best_rank = (running[block_end] % len(rows))[block_id]
+
+    by_rank = np.empty(len(rows), dtype=np.int64)
+    by_rank[cost_rank] = rows[order]
+    ref[rows[order]] = by_rank[best_rank]
+    return ref
+
+
+def _fdh_pairwise(inputs: np.ndarray, outputs: np.ndarray, codes: np.ndarray,
+                  ok: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Radial FDH scores by vectorized dominance, one group at a time."""
+    score = np.full(len(inputs), np.nan)
+    ref = np.full(len(inputs), -1, dtype=np.int64)
+    for code in np.unique(codes[ok]):
+        rows = np.flatnonzero(ok & (codes == code))
+        x, y = inputs[rows], outputs[rows]
+        # dominates[i, j]: peer j produces at least row i's outputs
+        dominates = (y[None, :, :] >= y[:, None, :]).all(axis=2)
+        ratio = (x[None, :, :] / x[:, None, :]).max(axis=2)
+        ratio = np.where(dominates, ratio, np.inf)
+        best = ratio.argmin(axis=1)
+        ref[rows] = rows[best]
+        score[rows] = ratio[np.arange(len(rows)), best]
+    return score, ref
+
+
+def fdh_efficiency(
+    inputs,
+    outputs,
+    groups=None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Input-oriented free-disposal-hull efficiency.
+
+    Parameters
+    ----------
+    inputs : array-like, shape (n,) or (n, p)
+        Inputs, lower is better (e.g. per-pupil spend). Must be positive.
+    outputs : array-like, shape (n,) or (n, q)
+        Outputs, higher is better (e.g. a graduation-rate percentile).
+    groups : array-like or pd.DataFrame, optional
+        Peer group of each row; rows are only compared within their group.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        ``(score, reference)``. ``score`` is
+        ``min over peers with outputs >= yours of max(peer input / your input)``
+        in (0, 1]; ``reference`` is the positional index of that peer, ``-1``
+        where a row has non-finite or non-positive inputs or non-finite outputs.
+        One input and one output use an O(n log n) sort-and-sweep; other
+        shapes use pairwise dominance within each group.
+    """
+    x = np.asarray(inputs, dtype=float)
+    y = np.asarray(outputs, dtype=float)
+    x = x.reshape(len(x), -1)
+    y = y.reshape(len(y), -1)
+    codes = _group_codes(groups)
+    if codes is None:
+        codes = np.zeros(len(x), dtype=np.int64)
+    ok = np.isfinite(x).all(axis=1) & (x > 0).all(axis=1) & np.isfinite(y).all(axis=1)
+
+    if x.shape[1] == 1 and y.shape[1] == 1:
+        ref = _fdh_sweep(x[:, 0], y[:, 0], codes, ok)
+        score = np.full(len(x), np.nan)
+        score[ok] = x[ref[ok], 0] / x[ok, 0]
+        return score, ref
+    return _fdh_pairwise(x, y, codes, ok)
+
+
+def tges_frontier(
+    spend_df: pd.DataFrame,
+    outcome_df: pd.DataFrame,
+    outcome_col: str,
+    spend_col: str = "Per Pupil costs",
+    peer: str = "tges_group",
+    year_col: str = "end_year",
+) -> pd.DataFrame:
+    """
+    Spend-versus-outcome efficiency frontier (free-disposal hull).
+
+    Same inputs and output columns as R's ``tges_frontier()``. ``peer = "dfg"``
+    needs a ``dfg`` column already on ``spend_df``; unlike R it is not fetched.
+
+    Returns
+    -------
+    pd.DataFrame
+        Entity columns, ``peer_group``, the year, ``spend``, ``outcome``,
+        ``efficiency_score``, ``on_frontier``, ``reference_district_id``,
+        ``reference_district_name``, ``reference_spend`` and ``excess_spend``.
+    """
+    if spend_col not in spend_df.columns:
+        raise ValueError(f"Column '{spend_col}' not found in spend_df")
+    if outcome_col not in outcome_df.columns:
+        raise ValueError(f"Column '{outcome_col}' not found in outcome_df")
+    if "district_id" not in outcome_df.columns:
+        raise ValueError("outcome_df must contain a `district_id` column.")
+    if not {"district_id", year_col} <= set(spend_df.columns):
+        raise ValueError(f"spend_df must contain `district_id` and '{year_col}'.")
+
+    sp = _attach_peer(_real_districts(spend_df), peer)
+    sp = sp.assign(spend=pd.to_numeric(sp[spend_col], errors="coerce"))
+
+    oc = (
+        outcome_df[["district_id", year_col, outcome_col]]
+        .rename(columns={outcome_col: "outcome"})
+        .drop_duplicates()
+    )
+    out = sp.merge(oc, on=["district_id", year_col], how="inner")
+    if out.empty:
+        raise ValueError(
+            f"No district_id/{year_col} rows matched between spend_df and outcome_df."
+        )
+    out = out.sort_values([year_col, "peer_group"], kind="stable").reset_index(drop=True)
+
+    spend = out["spend"].to_numpy(dtype=float)
+    outcome = pd.to_numeric(out["outcome"], errors="coerce").to_numpy(dtype=float)
+    score, ref = fdh_efficiency(spend, outcome, out[[year_col, "peer_group"]])
+
+    has_ref = ref >= 0
+    names = out["district_name"] if "district_name" in out.columns else out["district_id"]
+    out["efficiency_score"] = np.round(score, 4)
+    out["reference_district_id"] = np.where(
+        has_ref, out["district_id"].to_numpy()[ref], None
+    )
+    out["reference_district_name"] = np.where(has_ref, names.to_numpy()[ref], None)
+    out["reference_spend"] = np.where(has_ref, spend[ref], np.nan)
+    out["excess_spend"] = spend - out["reference_spend"]
+    out["on_frontier"] = np.isfinite(score) & (np.abs(score - 1) < 1e-9)
+
+    lead = [
+        col for col in (
+            "county_name", "district_id", "district_name", "peer_group", year_col,
+            "calc_type", "spend", "outcome", "efficiency_score", "on_frontier",
+            "reference_district_id", "reference_district_name", "reference_spend",
+            "excess_spend",
+        )
+        if col in out.columns
+    ]
+    return out[lead + [col for col in out.columns if col not in lead]]
+
+
+def batched_ols(
+    y: np.ndarray,
+    X: np.ndarray,
+    mask: Optional[np.ndarray] = None,
+) -> dict:
+    """
+    Fit many independent OLS regressions in one batched solve.
+
+    Parameters
+    ----------
+    y : np.ndarray, shape (g, m)
+        Responses, one padded row per regression.
+    X : np.ndarray, shape (g, m, p)
+        Design matrices (include the intercept column).
+    mask : np.ndarray of bool, shape (g, m), optional
+        Which padded observations are real. Defaults to all finite rows.
+
+    Returns
+    -------
+    dict
+        ``coef``, ``se``, ``t``, ``pvalue`` (shape ``(g, p)``), ``r_squared``
+        and ``n`` (shape ``(g,)``), matching ``summary(lm(...))``. Regressions
+        with no residual degrees of freedom get ``NaN`` standard errors.
+    """
+    _require_scipy()
+    y = np.asarray(y, dtype=float)
+    X = np.asarray(X, dtype=float)
+    if mask is None:
+        mask = np.isfinite(y) & np.isfinite(X).all(axis=2)
+    w = mask.astype(float)
+    yw = np.where(mask, y, 0.0)
+    Xw = np.where(mask[:, :, None], X, 0.0)
+
+    xtx = np.einsum("gmi,gmj->gij", Xw, Xw)
+    xty = np.einsum("gmi,gm->gi", Xw, yw)
+    xtx_inv = np.linalg.pinv(xtx)
+    coef = np.einsum("gij,gj->gi", xtx_inv, xty)
+
+    n = w.sum(axis=1)
+    p = X.shape[2]
+    resid = (yw - np.einsum("gmi,gi->gm", Xw, coef)) * w
+    rss = (resid ** 2).sum(axis=1)
+    y_mean = yw.sum(axis=1) / np.where(n > 0, n, np.nan)
+    tss = (((yw - y_mean[:, None]) * w) ** 2).sum(axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dof = n - p
+        sigma2 = np.where(dof > 0, rss / dof, np.nan)
+        se = np.sqrt(sigma2[:, None] * np.diagonal(xtx_inv, axis1=1, axis2=2))
+        t = coef / se
+        pvalue = 2 * stdtr(np.where(dof > 0, dof, np.nan)[:, None], -np.abs(t))
+        r_squared = 1 - rss / tss
+    return {
+        "coef": coef, "se": se, "t": t, "pvalue": pvalue,
+        "r_squared": r_squared, "n": n.astype(int),
+    }
+
+
+def _pad_groups(codes: np.ndarray, *columns: np.ndarray):
+    """Scatter rows into ``(groups, max_group_size)`` padded arrays."""
+    n_groups = int(codes.max()) + 1 if len(codes) else 0
+    order = np.argsort(codes, kind="stable")
+    sizes = np.bincount(codes, minlength=n_groups)
+    starts = np.r_[0, np.cumsum(sizes)[:-1]]
+    slot = np.arange(len(codes)) - np.repeat(starts, sizes)
+    width = int(sizes.max()) if n_groups else 0
+    mask = np.zeros((n_groups, width), dtype=bool)
+    mask[codes[order], slot] = True
+    padded = []
+    for column in columns:
+        out = np.full((n_groups, width), np.nan)
+        out[codes[order], slot] = column[order]
+        padded.append(out)
+    return mask, padded
+
+
+def tges_convergence(
+    tbl: pd.DataFrame,
+    metric_col="Per Pupil costs",
+    peer: str = "tges_group",
+    start_year: Optional[int] = None,
+    end_year: Optional[int] = None,
+    calc_type: Optional[str] = "Budgeted",
+) -> pd.DataFrame:
+    """
+    Beta-convergence of spending across peer groups, all groups in one solve.
+
+    Parameters
+    ----------
+    tbl : pd.DataFrame
+        Multi-year TGES table (e.g. ``CSG1`` stacked across
+        ``fetch_many_tges()`` years) with ``district_id``, ``end_year`` and the
+        metric column(s).
+    metric_col : str or sequence of str, default "Per Pupil costs"
+        Column(s) to track. With several, every (metric, peer group) regression
+        is solved in the same batch and the result carries a ``metric`` column.
+    peer : {"tges_group", "dfg", "county", "statewide"}, default "tges_group"
+        Peer system; the backing column must already be present.
+    start_year, end_year : int, optional
+        Endpoints. Default: the min and max ``end_year`` present.
+    calc_type : str or None, default "Budgeted"
+        Calc type to keep when ``calc_type`` is a column.
+
+    Returns
+    -------
+    pd.DataFrame
+        Same columns as R's ``tges_convergence()``: per-district
+        ``start_value``, ``end_value``, ``log_start_value`` and ``growth`` with
+        the broadcast group ``beta``, ``beta_pvalue``, ``r_squared``,
+        ``n_districts`` and ``converging``.
+    """
+    metrics = [metric_col] if isinstance(metric_col, str) else list(metric_col)
+    missing = [col for col in metrics if col not in tbl.columns]
+    if missing:
+        raise ValueError(f"Column(s) {missing} not found in `tbl`.")
+    tbl = _real_districts(tbl)
+    if calc_type is not None and "calc_type" in tbl.columns:
+        tbl = tbl[tbl["calc_type"] == calc_type]
+    if "end_year" not in tbl.columns or tbl.empty:
+        raise ValueError("No usable rows in `tbl`.")
+
+    sy = int(tbl["end_year"].min()) if start_year is None else start_year
+    ey = int(tbl["end_year"].max()) if end_year is None else end_year
+    if sy == ey:
+        raise ValueError(f"start_year and end_year must differ (got {sy}).")
+
+    keys = [c for c in ("county_name", "district_id", "district_name", "group", "dfg")
+            if c in tbl.columns]
+    vals = (
+        tbl[tbl["end_year"].isin([sy, ey])]
+        .drop_duplicates(["district_id", "end_year"])
+    )
+    start = vals[vals["end_year"] == sy].set_index("district_id")
+    end = vals[vals["end_year"] == ey].set_index("district_id")
+    ids = start.index.intersection(end.index, sort=False)
+
+    frames = []
+    for metric in metrics:
+        s_val = pd.to_numeric(start.loc[ids, metric], errors="coerce")
+        e_val = pd.to_numeric(end.loc[ids, metric], errors="coerce")
+        good = (np.isfinite(s_val) & np.isfinite(e_val) & (s_val > 0) & (e_val > 0)).to_numpy()
+        wide = start.loc[ids[good], [k for k in keys if k != "district_id"]].reset_index()
+        wide["start_value"] = s_val.to_numpy()[good]
+        wide["end_value"] = e_val.to_numpy()[good]
+        if len(metrics) > 1:
+            wide.insert(0, "metric", metric)
+        frames.append(wide)
+    wide = pd.concat(frames, ignore_index=True)
+    if wide.empty:
+        raise ValueError(f"No districts have both {sy} and {ey} values.")
+
+    span = ey - sy
+    wide = _attach_peer(wide, peer)
+    wide["start_year"] = sy
+    wide["end_year"] = ey
+    wide["log_start_value"] = np.log(wide["start_value"])
+    wide["growth"] = (np.log(wide["end_value"]) - wide["log_start_value"]) / span
+
+    group_cols = (["metric"] if len(metrics) > 1 else []) + ["peer_group"]
+    codes = wide.groupby(group_cols, sort=False, dropna=False).ngroup().to_numpy()
+    mask, (growth, log_start) = _pad_groups(
+        codes, wide["growth"].to_numpy(), wide["log_start_value"].to_numpy()
+    )
+    X = np.stack([np.ones_like(log_start), log_start], axis=2)
+    fit = batched_ols(growth, X, mask)
+
+    # R fits only with >= 4 districts and variation in the starting level
+    spread = np.nanmax(np.where(mask, log_start, np.nan), axis=1) - np.nanmin(
+        np.where(mask, log_start, np.nan), axis=1
+    )
+    usable = (fit["n"] >= 4) & (spread > 0)
+    beta = np.where(usable, fit["coef"][:, 1], np.nan)
+    wide["beta"] = beta[codes]
+    wide["beta_pvalue"] = np.where(usable, fit["pvalue"][:, 1], np.nan)[codes]
+    wide["r_squared"] = np.where(usable, fit["r_squared"], np.nan)[codes]
+    wide["n_districts"] = fit["n"][codes]
+    wide["converging"] = (
+        np.isfinite(wide["beta"]) & (wide["beta"] < 0)
+        & np.isfinite(wide["beta_pvalue"]) & (wide["beta_pvalue"] < 0.05)
+    )
+
+    lead = [
+        col for col in (
+            "metric", "county_name", "district_id", "district_name", "peer_group",
+            "start_year", "end_year", "start_value", "end_value", "log_start_value",
+            "growth", "beta", "beta_pvalue", "r_squared", "n_districts", "converging",
+        )
+        if col in wide.columns
+    ]
+    wide = wide.sort_values(group_cols, kind="stable").reset_index(drop=True)
+    return wide[lead + [col for col in wide.columns if col not in lead]]
+
+
+def tges_real_growth(
+    aa: pd.DataFrame,
+    years: Optional[Sequence[int]] = None,
+    deflator: Optional[pd.DataFrame] = None,
+) -> pd.DataFrame:
+    """
+    Decompose per-pupil growth into real cost vs the enrollment effect.
+
+    Whole-panel counterpart of R's ``tges_real_growth()``: lags, log
+    decomposition and the optional caller-supplied deflator are computed as
+    array operations over a district/year-sorted panel.
+
+    Parameters
+    ----------
+    aa : pd.DataFrame
+        ``CSG1AA_AVGS`` rows stacked across years.
+    years : sequence of int, optional
+        Keep only these ``end_year`` values (after differencing).
+    deflator : pd.DataFrame, optional
+        ``end_year`` and ``price_index`` from a real index (e.g. BLS CPI). No
+        deflator is fabricated; without one only nominal columns are returned.
+
+    Returns
+    -------
+    pd.DataFrame
+        Same columns as the R function.
+    """
+    if not {_EXP_COL, _ADE_COL} <= set(aa.columns):
+        raise ValueError("CSG1AA_AVGS is missing total expenditures and/or ADE columns.")
+    aa = _real_districts(aa)
+    keys = [c for c in ("county_name", "district_id", "district_name") if c in aa.columns]
+
+    base = aa[keys].copy()
+    base["end_year"] = aa["end_year"].to_numpy()
+    base["total_exp"] = pd.to_numeric(aa[_EXP_COL], errors="coerce").to_numpy()
+    base["ade"] = pd.to_numeric(aa[_ADE_COL], errors="coerce").to_numpy()
+    base["per_pupil"] = (
+        pd.to_numeric(aa[_PP_COL], errors="coerce").to_numpy()
+        if _PP_COL in aa.columns else base["total_exp"] / base["ade"]
+    )
+    # collapse overlapping reports of the same actual year
+    base = base.drop_duplicates(["district_id", "end_year"])
+
+    if deflator is not None:
+        if not {"end_year", "price_index"} <= set(deflator.columns):
+            raise ValueError(
+                "`deflator` must be a data frame with `end_year` and `price_index`."
+            )
+        base_index = deflator["price_index"].iloc[int(np.argmin(deflator["end_year"]))]
+        index = base["end_year"].map(
+            deflator.drop_duplicates("end_year").set_index("end_year")["price_index"]
+        )
+        base["price_index"] = index.to_numpy()
+        factor = base_index / base["price_index"]
+        base["real_total_exp"] = base["total_exp"] * factor
+        base["real_per_pupil"] = base["per_pupil"] * factor
+
+    base = base.sort_values(["district_id", "end_year"], kind="stable").reset_index(drop=True)
+    first = (base["district_id"] != base["district_id"].shift()).to_numpy()
+
+    def lag(col: str) -> np.ndarray:
+        values = base[col].to_numpy(dtype=float)
+        lagged = np.r_[np.nan, values[:-1]]
+        lagged[first] = np.nan
+        return lagged
+
+    exp_lag, ade_lag, pp_lag = lag("total_exp"), lag("ade"), lag("per_pupil")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        base["total_exp_growth"] = base["total_exp"] / exp_lag - 1
+        base["ade_growth"] = base["ade"] / ade_lag - 1
+        base["per_pupil_growth"] = base["per_pupil"] / pp_lag - 1
+        base["real_cost_component"] = np.log(base["total_exp"] / exp_lag)
+        base["enrollment_component"] = -np.log(base["ade"] / ade_lag)
+        pp_log_change = np.log(base["per_pupil"].to_numpy(dtype=float) / pp_lag)
+        base["enrollment_effect_share"] = np.where(
+            np.isfinite(pp_log_change) & (pp_log_change != 0),
+            base["enrollment_component"] / pp_log_change,
+            np.nan,
+        )
+        if deflator is not None:
+            base["real_pp_growth"] = base["real_per_pupil"] / lag("real_per_pupil") - 1
+
+    if years is not None:
+        base = base[base["end_year"].isin(list(years))].reset_index(drop=True)
+    return base
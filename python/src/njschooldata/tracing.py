@@ -0,0 +1,357 @@
+"""
+OpenTelemetry-compatible trace spans for the fetch pipeline.
+
+With tracing on (``NJSD_TRACE`` or :func:`configure_tracing`), each
+pandas-converting wrapper such as :func:`~njschooldata.fetch_enr` records a
+tree of spans:
+
+- the wrapper itself;
+- :func:`~njschooldata._r_bridge.call_r_function`;
+- stages R reports through its ``njschooldata.trace_hook`` option:
+  ``download_source`` (URL, status, bytes, digest, retries), ``parse``,
+  ``process`` and ``tidy``;
+- pandas ``conversion``.
+
+The wrapper span carries ``njsd.source_status`` from ``njsd_source_results``:
+the least successful status across the frame's sources.
+
+Finished traces go to an exporter, which is any object with
+``export(spans)``. No network is needed. Set ``NJSD_TRACE`` to:
+
+- ``console`` to print an indented tree to stderr;
+- ``file`` or ``1`` to append OTLP-style JSON lines to ``NJSD_TRACE_FILE``
+  (default ``njsd-traces.jsonl``).
+
+When the ``opentelemetry`` API is installed, :class:`OpenTelemetryExporter`
+re-emits the spans through its configured tracer provider.
+"""
+
+import contextvars
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+import warnings
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator, Optional, Protocol, Sequence, TextIO
+
+import pandas as pd
+
+# Worst first, mirroring select_source_result_record() in R/source_result.R.
+_STATUS_PRIORITY = (
+    "parse_error",
+    "source_unavailable",
+    "not_published",
+    "not_yet_observed",
+    "actual",
+)
+
+_current: contextvars.ContextVar = contextvars.ContextVar(
+    "njsd_trace_current", default=None
+)
+_exporter: Optional["SpanExporter"] = None
+_configured = False
+_lock = threading.Lock()
+
+
+@dataclass
+class Span:
+    """One timed stage; field names follow the OpenTelemetry data model."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: Optional[str]
+    start_time_unix_nano: int
+    end_time_unix_nano: Optional[int] = None
+    attributes: dict = field(default_factory=dict)
+    status_code: str = "UNSET"
+    status_message: Optional[str] = None
+    parent: Optional["Span"] = field(default=None, repr=False, compare=False)
+    _trace: list = field(default_factory=list, repr=False, compare=False)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_time_unix_nano or time.time_ns()
+        return (end - self.start_time_unix_nano) / 1e6
+
+    def to_otlp(self) -> dict:
+        """Return the span in OTLP/JSON field layout."""
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_span_id or "",
+            "name": self.name,
+            "startTimeUnixNano": str(self.start_time_unix_nano),
+            "endTimeUnixNano": str(self.end_time_unix_nano),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)}
+                for key, value in sorted(self.attributes.items())
+            ],
+            "status": {
+                "code": f"STATUS_CODE_{self.status_code}",
+                **({"message": self.status_message} if self.status_message else {}),
+            },
+        }
+
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class SpanExporter(Protocol):
+    """Receives every span of a trace, in start order, when the root ends."""
+
+    def export(self, spans: Sequence[Span]) -> None: ...
+
+
+class ConsoleExporter:
+    """Print each trace as an indented tree."""
+
+    def __init__(self, stream: Optional[TextIO] = None) -> None:
+        self.stream = stream
+
+    def export(self, spans: Sequence[Span]) -> None:
+        stream = self.stream or sys.stderr
+        depth: dict = {}
+        for span in spans:
+            depth[span.span_id] = depth.get(span.parent_span_id, -1) + 1
+            attributes = " ".join(f"{k}={v}" for k, v in sorted(span.attributes.items()))
+            status = "" if span.status_code != "ERROR" else f" ERROR {span.status_message}"
+            print(
+                f"{'  ' * depth[span.span_id]}{span.name} "
+                f"{span.duration_ms:.1f}ms{status} {attributes}".rstrip(),
+                file=stream,
+            )
+
+
+class FileExporter:
+    """Append spans as OTLP-style JSON lines."""
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[Span]) -> None:
+        lines = "".join(json.dumps(span.to_otlp(), sort_keys=True) + "\n" for span in spans)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, self.path.open("a", encoding="utf-8") as handle:
+            handle.write(lines)
+
+
+class OpenTelemetryExporter:
+    """
+    Re-emit spans through the ``opentelemetry`` API.
+
+    Requires the optional ``opentelemetry-api`` package; spans go to whatever
+    tracer provider (and exporters) the application configured.
+    """
+
+    def __init__(self, tracer_provider: Any = None) -> None:
+        try:
+            from opentelemetry import trace
+        except ImportError as e:
+            raise ImportError(
+                "OpenTelemetryExporter requires opentelemetry-api. "
+                "Install with: pip install \"njschooldata[opentelemetry]\""
+            ) from e
+        self._trace = trace
+        self._tracer = trace.get_tracer("njschooldata", tracer_provider=tracer_provider)
+
+    def export(self, spans: Sequence[Span]) -> None:
+        trace = self._trace
+        emitted: dict = {}
+        for span in spans:
+            parent = emitted.get(span.parent_span_id)
+            otel_span = self._tracer.start_span(
+                span.name,
+                context=trace.set_span_in_context(parent) if parent else None,
+                start_time=span.start_time_unix_nano,
+                attributes=span.attributes,
+            )
+            if span.status_code == "ERROR":
+                otel_span.set_status(
+                    trace.Status(trace.StatusCode.ERROR, span.status_message)
+                )
+            emitted[span.span_id] = otel_span
+        for span in reversed(spans):
+            emitted[span.span_id].end(end_time=span.end_time_unix_nano)
+
+
+def configure_tracing(exporter: Optional[SpanExporter]) -> Optional[SpanExporter]:
+    """
+    Set the exporter for finished traces; ``None`` turns tracing off.
+
+    Returns
+    -------
+    SpanExporter or None
+        The previous exporter.
+    """
+    global _exporter, _configured
+    with _lock:
+        previous, _exporter, _configured = _exporter, exporter, True
+    return previous
+
+
+def _exporter_from_environment() -> Optional[SpanExporter]:
+    mode = os.environ.get("NJSD_TRACE", "").lower()
+    if mode == "console":
+        return ConsoleExporter()
+    if mode in {"1", "true", "yes", "file"}:
+        return FileExporter(os.environ.get("NJSD_TRACE_FILE") or "njsd-traces.jsonl")
+    return None
+
+
+def tracing_exporter() -> Optional[SpanExporter]:
+    """Active exporter, from :func:`configure_tracing` or ``NJSD_TRACE``."""
+    global _exporter, _configured
+    if not _configured:
+        with _lock:
+            if not _configured:
+                _exporter, _configured = _exporter_from_environment(), True
+    return _exporter
+
+
+def current_span() -> Optional[Span]:
+    """Innermost open span in this context, if any."""
+    return _current.get()
+
+
+def start_span(name: str, attributes: Optional[dict] = None) -> Span:
+    """Open a child of the current span (or a new trace) and make it current."""
+    parent = _current.get()
+    span = Span(
+        name=name,
+        trace_id=parent.trace_id if parent else secrets.token_hex(16),
+        span_id=secrets.token_hex(8),
+        parent_span_id=parent.span_id if parent else None,
+        start_time_unix_nano=time.time_ns(),
+        attributes=dict(attributes or {}),
+        parent=parent,
+        _trace=parent._trace if parent else [],
+    )
+    span._trace.append(span)
+    _current.set(span)
+    return span
+
+
+def end_span(span: Span, error: Optional[BaseException] = None) -> None:
+    """Close ``span``, restore its parent and export the trace at its root."""
+    span.end_time_unix_nano = time.time_ns()
+    if error is not None:
+        span.status_code = "ERROR"
+        span.status_message = f"{type(error).__name__}: {error}"
+    elif span.status_code == "UNSET":
+        span.status_code = "OK"
+    _current.set(span.parent)
+    if span.parent is None:
+        exporter = tracing_exporter()
+        if exporter is not None:
+            try:
+                exporter.export(list(span._trace))
+            except Exception as e:
+                warnings.warn(f"trace exporter {exporter!r} failed: {e}", RuntimeWarning)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """
+    Record a span around a block while tracing is on.
+
+    Yields ``None`` (and records nothing) while tracing is off.
+    """
+    if tracing_exporter() is None:
+        yield None
+        return
+    opened = start_span(name, attributes)
+    try:
+        yield opened
+    except BaseException as e:
+        end_span(opened, e)
+        raise
+    end_span(opened)
+
+
+def worst_source_status(source_results: Any) -> Optional[str]:
+    """Least successful ``source_status`` in a source-results frame."""
+    if not isinstance(source_results, pd.DataFrame) or "source_status" not in source_results:
+        return None
+    statuses = set(source_results["source_status"].dropna().astype(str))
+    for status in _STATUS_PRIORITY:
+        if status in statuses:
+            return status
+    return min(statuses) if statuses else None
+
+
+def record_source_status(opened: Optional[Span], frame: Any) -> None:
+    """Copy source provenance from a converted frame onto ``opened``."""
+    if opened is None or not isinstance(frame, pd.DataFrame):
+        return
+    results = frame.attrs.get("source_results")
+    status = worst_source_status(results)
+    if status is not None:
+        opened.set_attribute("njsd.source_status", status)
+        opened.set_attribute("njsd.source_count", len(results))
+    opened.set_attribute("njsd.rows", len(frame))
+
+
+def on_r_event(phase: str, name: Optional[str], attributes: dict) -> None:
+    """
+    Handle one event from R's ``njschooldata.trace_hook``.
+
+    ``start`` opens a child of the current span, ``annotate`` adds attributes
+    to it and ``end`` closes it; R attributes are prefixed with ``njsd.``.
+    Events arriving with no open Python span are ignored.
+    """
+    current = _current.get()
+    if current is None:
+        return
+    prefixed = {f"njsd.{key}": value for key, value in attributes.items()}
+    if phase == "start":
+        start_span(f"R::{name}", prefixed)
+    elif phase == "annotate":
+        current.attributes.update(prefixed)
+    elif phase == "end" and current.name == f"R::{name}":
+        error = prefixed.pop("njsd.error", None)
+        current.attributes.update(prefixed)
+        if error is not None:
+            current.status_code = "ERROR"
+            current.status_message = str(error)
+        end_span(current)
+
+
+_r_hook_installed = False
+
+
+def install_r_hook() -> None:
+    """Point R's ``njschooldata.trace_hook`` option at :func:`on_r_event`."""
+    global _r_hook_installed
+    if _r_hook_installed:
+        return
+    from rpy2.rinterface import NULL, rternalize
+
+    from ._r_bridge import ro
+
+    @rternalize
+    def trace_hook(phase, name, attributes):
+        names = [str(key) for key in attributes.names] if len(attributes) else []
+        values = {key: attributes[i][0] for i, key in enumerate(names)}
+        label = None if name[0] is ro.NA_Character else str(name[0])
+        on_r_event(str(phase[0]), label, values)
+        return NULL
+
+    ro.r["options"](**{"njschooldata.trace_hook": trace_hook})
+    _r_hook_installed = True
@@ -0,0 +1,504 @@
+"""Conditional-request HTTP transport for ``download_source()``.
+
+``download_source()`` (``R/source_transport.R``) either reuses a validated
+cache file forever or downloads the whole artifact again. This module
+provides a ``request_fn`` for its injectable transport hook that remembers
+each URL's ``ETag`` / ``Last-Modified`` validators and last body, sends
+conditional GETs, and answers a ``304 Not Modified`` by handing back the
+stored body. Connections are kept alive and pooled per host, so a freshness
+sweep over every registered source costs one small round trip per URL.
+
+The transport only moves bytes. Host allowlisting, redirect checks, content
+validation and digests stay in R, which sees an ordinary ``request_fn``
+result (``status_code``, ``final_url``, ``content_type``) plus
+``not_modified`` when the stored body was reused.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import http.client
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Optional, Union
+from urllib.parse import urljoin, urlsplit
+
+import pandas as pd
+
+__all__ = [
+    "ConditionalTransport",
+    "ConnectionPool",
+    "TransportResponse",
+    "download_source",
+    "r_request_fn",
+]
+
+_REDIRECTS = (301, 302, 303, 307, 308)
+_MAX_REDIRECTS = 5
+_CHUNK = 1 << 16
+
+
+def _default_user_agent() -> str:
+    from ._generated_contract import PYTHON_PACKAGE_VERSION
+
+    return f"njschooldata-python/{PYTHON_PACKAGE_VERSION}"
+
+
+def _url_key(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+def _place(source: Path, dest: Path) -> None:
+    """Hard-link (or copy) ``source`` to ``dest`` through an atomic rename."""
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    fd, staging = tempfile.mkstemp(prefix=".njsd-transport-", dir=dest.parent)
+    os.close(fd)
+    os.unlink(staging)
+    try:
+        os.link(source, staging)
+    except OSError:
+        shutil.copyfile(source, staging)
+    os.replace(staging, dest)
+
+
+@dataclass(frozen=True)
+class TransportResponse:
+    """
+    Result of one transport request.
+
+    Attributes
+    ----------
+    status_code : int
+        Final HTTP status. ``304`` means the stored body was written to the
+        destination.
+    final_url : str
+        URL after redirects.
+    content_type : str
+        Response (or stored) ``Content-Type``.
+    not_modified : bool
+        Whether the server confirmed the stored body is current.
+    bytes_received : int
+        Body bytes read from the network.
+    """
+
+    status_code: int
+    final_url: str
+    content_type: str
+    not_modified: bool = False
+    bytes_received: int = 0
+
+    def as_r_list(self) -> dict:
+        """Fields in the shape ``download_source()`` expects from ``request_fn``."""
+        return {
+            "status_code": self.status_code,
+            "final_url": self.final_url,
+            "content_type": self.content_type,
+            "not_modified": self.not_modified,
+        }
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of idle keep-alive connections, per scheme/host/port.
+
+    Parameters
+    ----------
+    max_idle_per_host : int, default 4
+        Idle connections kept for each host; extras are closed.
+    """
+
+    def __init__(self, max_idle_per_host: int = 4) -> None:
+        self.max_idle_per_host = max_idle_per_host
+        self._idle: dict = {}
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.reused = 0
+
+    def acquire(self, scheme: str, host: str, port: Optional[int], timeout: float):
+        """Return ``(connection, reused)`` for the origin."""
+        key = (scheme, host, port)
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                self.reused += 1
+                conn = idle.pop()
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                return conn, True
+            self.opened += 1
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return cls(host, port, timeout=timeout), False
+
+    def release(self, scheme: str, host: str, port: Optional[int], conn) -> None:
+        """Return a connection whose response was fully read."""
+        with self._lock:
+            idle = self._idle.setdefault((scheme, host, port), [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        with self._lock:
+            connections = [c for idle in self._idle.values() for c in idle]
+            self._idle.clear()
+        for conn in connections:
+            conn.close()
+
+
+@dataclass
+class _Counters:
+    requests: int = 0
+    not_modified: int = 0
+    downloaded: int = 0
+    bytes_received: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, **counts: int) -> None:
+        with self.lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+
+class ConditionalTransport:
+    """
+    ``request_fn`` implementation with ETag / Last-Modified revalidation.
+
+    Parameters
+    ----------
+    state_dir : str or Path
+        Directory holding per-URL validators (``validators/``) and the last
+        body received for each URL (``bodies/``). It may be shared by
+        processes on one host.
+    pool : ConnectionPool, optional
+        Keep-alive pool; a private pool is created when omitted.
+    user_agent : str, optional
+        ``User-Agent`` header; defaults to the package version.
+
+    Examples
+    --------
+    >>> transport = ConditionalTransport("~/.cache/njsd-transport")
+    >>> result = download_source(url, "xlsx", transport=transport)
+    """
+
+    def __init__(
+        self,
+        state_dir: Union[str, Path],
+        pool: Optional[ConnectionPool] = None,
+        user_agent: Optional[str] = None,
+    ) -> None:
+        self.state_dir = Path(state_dir).expanduser()
+        self.pool = pool or ConnectionPool()
+        self.user_agent = user_agent or _default_user_agent()
+        self._counters = _Counters()
+        for sub in ("validators", "bodies"):
+            (self.state_dir / sub).mkdir(parents=True, exist_ok=True)
+
+    # -- per-URL state -----------------------------------------------------
+
+    def _validator_path(self, url: str) -> Path:
+        return self.state_dir / "validators" / f"{_url_key(url)}.json"
+
+    def _body_path(self, url: str) -> Path:
+        return self.state_dir / "bodies" / _url_key(url)
+
+    def validators(self, url: str) -> Optional[dict]:
+        """Stored validators for ``url`` (``None`` without a stored body)."""
+        path = self._validator_path(url)
+        if not path.exists() or not self._body_path(url).exists():
+            return None
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _write_validators(self, url: str, record: dict) -> None:
+        path = self._validator_path(url)
+        fd, staging = tempfile.mkstemp(prefix=".njsd-validators-", dir=path.parent)
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(record, handle, sort_keys=True)
+        os.replace(staging, path)
+
+    # -- HTTP --------------------------------------------------------------
+
+    def _send(self, url: str, headers: dict, timeout: float):
+        """
+        Issue one GET, retrying once when a pooled connection was stale.
+
+        Returns ``(connection, response, origin)``; the caller must read the
+        response fully before releasing the connection.
+        """
+        parts = urlsplit(url)
+        origin = (parts.scheme, parts.hostname, parts.port)
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+        for attempt in range(2):
+            conn, reused = self.pool.acquire(*origin, timeout=timeout)
+            try:
+                conn.request("GET", target, headers=headers)
+                return conn, conn.getresponse(), origin
+            except (http.client.HTTPException, ConnectionError, OSError):
+                conn.close()
+                if not reused or attempt:
+                    raise
+        raise RuntimeError("unreachable")  # pragma: no cover
+
+    def _finish(self, conn, response, origin) -> None:
+        if response.will_close:
+            conn.close()
+        else:
+            self.pool.release(*origin, conn)
+
+    def request(self, url: str, dest: Union[str, Path], timeout: float = 60) -> TransportResponse:
+        """
+        Fetch ``url`` into ``dest``, revalidating a stored body when possible.
+
+        Parameters
+        ----------
+        url : str
+            Source URL.
+        dest : str or Path
+            File to write the artifact to.
+        timeout : float, default 60
+            Socket timeout in seconds.
+
+        Returns
+        -------
+        TransportResponse
+        """
+        dest = Path(dest)
+        stored = self.validators(url)
+        headers = {
+            "User-Agent": self.user_agent,
+            "Accept-Encoding": "identity",
+            "Connection": "keep-alive",
+        }
+        if stored:
+            if stored.get("etag"):
+                headers["If-None-Match"] = stored["etag"]
+            if stored.get("last_modified"):
+                headers["If-Modified-Since"] = stored["last_modified"]
+
+        current = url
+        for _ in range(_MAX_REDIRECTS + 1):
+            conn, response, origin = self._send(current, headers, timeout)
+            self._counters.add(requests=1)
+            if response.status not in _REDIRECTS:
+                break
+            response.read()
+            self._finish(conn, response, origin)
+            location = response.getheader("Location")
+            if not location:
+                # Already read and released: report the bare redirect as is.
+                return TransportResponse(
+                    response.status,
+                    current,
+                    response.getheader("Content-Type") or "application/octet-stream",
+                )
+            current = urljoin(current, location)
+        else:
+            response.read()
+            self._finish(conn, response, origin)
+            raise http.client.HTTPException(f"Too many redirects for {url}")
+
+        status = response.status
+        content_type = response.getheader("Content-Type") or "application/octet-stream"
+
+        if status == 304 and stored:
+            response.read()
+            self._finish(conn, response, origin)
+            _place(self._body_path(url), dest)
+            self._write_validators(url, {**stored, "checked_at": time.time()})
+            self._counters.add(not_modified=1)
+            return TransportResponse(
+                status_code=304,
+                final_url=stored.get("final_url") or current,
+                content_type=stored.get("content_type") or content_type,
+                not_modified=True,
+            )
+
+        if not 200 <= status < 300:
+            response.read()
+            self._finish(conn, response, origin)
+            return TransportResponse(status, current, content_type)
+
+        body = self._body_path(url)
+        fd, staging = tempfile.mkstemp(prefix=".njsd-body-", dir=body.parent)
+        received = 0
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                while True:
+                    chunk = response.read(_CHUNK)
+                    if not chunk:
+                        break
+                    handle.write(chunk)
+                    received += len(chunk)
+        except BaseException:
+            conn.close()
+            os.unlink(staging)
+            raise
+        self._finish(conn, response, origin)
+        os.replace(staging, body)
+        self._write_validators(url, {
+            "url": url,
+            "final_url": current,
+            "etag": response.getheader("ETag"),
+            "last_modified": response.getheader("Last-Modified"),
+            "content_type": content_type,
+            "checked_at": time.time(),
+        })
+        _place(body, dest)
+        self._counters.add(downloaded=1, bytes_received=received)
+        return TransportResponse(status, current, content_type, bytes_received=received)
+
+    __call__ = request
+
+    def revalidate(self, urls: Iterable[str], max_workers: int = 8, timeout: float = 60) -> pd.DataFrame:
+        """
+        Freshness sweep: conditionally fetch every URL into the body store.
+
+        Parameters
+        ----------
+        urls : iterable of str
+            Source URLs.
+        max_workers : int, default 8
+            Concurrent requests (connections are pooled per host).
+        timeout : float, default 60
+            Socket timeout in seconds.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per URL with ``url``, ``status_code``, ``not_modified``,
+            ``bytes_received`` and ``error``.
+        """
+        scratch = Path(tempfile.mkdtemp(prefix="njsd-sweep-"))
+
+        def check(item):
+            index, url = item
+            try:
+                result = self.request(url, scratch / str(index), timeout)
+                return (url, result.status_code, result.not_modified,
+                        result.bytes_received, None)
+            except Exception as e:  # noqa: BLE001 - reported per URL
+                return (url, pd.NA, False, 0, f"{type(e).__name__}: {e}")
+            finally:
+                (scratch / str(index)).unlink(missing_ok=True)
+
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                rows = list(executor.map(check, enumerate(urls)))
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+        out = pd.DataFrame(
+            rows, columns=["url", "status_code", "not_modified", "bytes_received", "error"]
+        )
+        out["status_code"] = out["status_code"].astype("Int64")
+        return out
+
+    def stats(self) -> dict[str, int]:
+        """Request, revalidation, byte and connection counters."""
+        with self._counters.lock:
+            counts = {
+                "requests": self._counters.requests,
+                "not_modified": self._counters.not_modified,
+                "downloaded": self._counters.downloaded,
+                "bytes_received": self._counters.bytes_received,
+            }
+        counts["connections_opened"] = self.pool.opened
+        counts["connections_reused"] = self.pool.reused
+        return counts
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.pool.close()
+
+
+def r_request_fn(transport: ConditionalTransport):
+    """
+    Wrap a transport as an R function usable as ``download_source(request_fn=)``.
+
+    Returns
+    -------
+    rpy2 closure
+        ``function(url, dest, timeout)`` returning the R list
+        ``download_source()`` expects.
+    """
+    from ._r_bridge import _require_rpy2, ro
+
+    _require_rpy2()
+    from rpy2.rinterface import rternalize
+
+    @rternalize
+    def request_fn(url, dest, timeout):
+        result = transport.request(str(url[0]), str(dest[0]), float(timeout[0]))
+        fields = result.as_r_list()
+        return ro.ListVector({
+            "status_code": ro.IntVector([fields["status_code"]]),
+            "final_url": ro.StrVector([fields["final_url"]]),
+            "content_type": ro.StrVector([fields["content_type"]]),
+            "not_modified": ro.BoolVector([fields["not_modified"]]),
+        })
+
+    return request_fn
+
+
+def download_source(
+    url: str,
+    source_type: str,
+    transport: Optional[ConditionalTransport] = None,
+    cache_path: Optional[str] = None,
+    **kwargs,
+) -> dict:
+    """
+    Call the R ``download_source()`` with a Python transport.
+
+    Parameters
+    ----------
+    url : str
+        Registered NJ DOE source URL.
+    source_type : str
+        One of ``xlsx``, ``xls``, ``zip``, ``csv``, ``text``, ``json`` or
+        ``html``.
+    transport : ConditionalTransport, optional
+        Transport used as ``request_fn``; R's default transport otherwise.
+    cache_path : str, optional
+        Validated artifact cache path.
+    **kwargs
+        Further ``download_source()`` arguments (``timeout``, ``retries``).
+
+    Returns
+    -------
+    dict
+        The ``njsd_source_result`` fields (``data``, ``source_status``,
+        ``source_url``, ``retrieved_at``, ``digest``, ``warning``, ``error``).
+    """
+    from ._r_bridge import _get_r_package, _python_to_r, ro
+
+    _get_r_package()
+    r_download = ro.r("njschooldata:::download_source")
+    r_kwargs = {key: _python_to_r(value) for key, value in kwargs.items()}
+    if transport is not None:
+        r_kwargs["request_fn"] = r_request_fn(transport)
+    if cache_path is not None:
+        r_kwargs["cache_path"] = _python_to_r(str(cache_path))
+    result = r_download(_python_to_r(url), _python_to_r(source_type), **r_kwargs)
+    out = {}
+    for name in ("data", "source_status", "source_url", "digest", "warning", "error"):
+        value = result.rx2(name)
+        out[name] = None if value is ro.NULL or value[0] is ro.NA_Character else str(value[0])
+    retrieved = result.rx2("retrieved_at")
+    out["retrieved_at"] = (
+        None if retrieved is ro.NULL else pd.Timestamp(float(retrieved[0]), unit="s", tz="UTC")
+    )
+    return out
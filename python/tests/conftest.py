@@ -1,9 +1,16 @@
 """pytest configuration and fixtures."""
 
+import json
 import os
+import statistics
+import time
+from pathlib import Path
 
 import pytest
 
+BENCHMARK_BASELINES = Path(__file__).with_name("benchmark_baselines.json")
+_benchmark_results = {}
+
 def _r_available():
     """Probe R only when a collected test explicitly requires it."""
     try:
@@ -22,6 +29,9 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "requires_r: tests that require R and njschooldata package"
     )
+    config.addinivalue_line(
+        "markers", "benchmark: offline performance benchmarks over bundled data"
+    )
 
 
 def pytest_collection_modifyitems(config, items):
@@ -30,8 +40,12 @@ def pytest_collection_modifyitems(config, items):
         reason="Set NJSCHOOLDATA_LIVE_TESTS=true to run NJ DOE live-source tests"
     )
     skip_r = pytest.mark.skip(reason="R or njschooldata not available")
+    skip_benchmark = pytest.mark.skip(
+        reason="Set NJSCHOOLDATA_BENCHMARKS=true to run offline benchmarks"
+    )
 
     live_tests = os.environ.get("NJSCHOOLDATA_LIVE_TESTS", "false").lower() == "true"
+    benchmarks = os.environ.get("NJSCHOOLDATA_BENCHMARKS", "false").lower() == "true"
     needs_r = any("requires_r" in item.keywords for item in items)
     r_available = _r_available() if needs_r else False
 
@@ -40,6 +54,62 @@ def pytest_collection_modifyitems(config, items):
             item.add_marker(skip_network)
         if "requires_r" in item.keywords and not r_available:
             item.add_marker(skip_r)
+        if "benchmark" in item.keywords and not benchmarks:
+            item.add_marker(skip_benchmark)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Write benchmark baselines when NJSCHOOLDATA_BENCHMARK_UPDATE=true."""
+    update = os.environ.get("NJSCHOOLDATA_BENCHMARK_UPDATE", "false").lower() == "true"
+    if not update or not _benchmark_results:
+        return
+    baselines = _read_baselines()
+    baselines.update(_benchmark_results)
+    BENCHMARK_BASELINES.write_text(
+        json.dumps(dict(sorted(baselines.items())), indent=2) + "\n",
+        encoding="utf-8",
+    )
+
+
+def _read_baselines():
+    if not BENCHMARK_BASELINES.exists():
+        return {}
+    return json.loads(BENCHMARK_BASELINES.read_text(encoding="utf-8"))
+
+
+@pytest.fixture
+def offline_benchmark():
+    """
+    Time a callable and compare its median against the stored baseline.
+
+    Fails when the median exceeds the baseline by more than
+    ``NJSCHOOLDATA_BENCHMARK_TOLERANCE`` (a ratio, default 1.5). Benchmarks
+    without a baseline only record. Set ``NJSCHOOLDATA_BENCHMARK_UPDATE=true``
+    to rewrite the baselines from this run.
+    """
+    tolerance = float(os.environ.get("NJSCHOOLDATA_BENCHMARK_TOLERANCE", "1.5"))
+    update = os.environ.get("NJSCHOOLDATA_BENCHMARK_UPDATE", "false").lower() == "true"
+    baselines = _read_baselines()
+
+    def run(name, fn, *args, rounds=5, number=1, **kwargs):
+        result = fn(*args, **kwargs)
+        timings = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            for _ in range(number):
+                fn(*args, **kwargs)
+            timings.append((time.perf_counter() - started) / number)
+        median = statistics.median(timings)
+        _benchmark_results[name] = {"median_seconds": float(f"{median:.4g}")}
+        baseline = baselines.get(name, {}).get("median_seconds")
+        if baseline and not update and median > baseline * tolerance:
+            pytest.fail(
+                f"{name}: median {median:.4g}s exceeds baseline "
+                f"{baseline:.4g}s x {tolerance:g}"
+            )
+        return result
+
+    return run
 
 
 @pytest.fixture
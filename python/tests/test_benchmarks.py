@@ -0,0 +1,119 @@
+"""Offline performance benchmarks over bundled source fixtures.
+
+Run with ``NJSCHOOLDATA_BENCHMARKS=true pytest -m benchmark``. Medians are
+compared against ``benchmark_baselines.json``; see the ``offline_benchmark``
+fixture for the tolerance and baseline-update switches. Nothing here touches
+the network.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from njschooldata import _r_bridge
+from njschooldata.directory import validate_assignment_semantics
+from njschooldata.facilities import _facility_geodataframe
+from njschooldata.subgroups import recode_subgroups
+
+pytestmark = pytest.mark.benchmark
+
+EXTDATA = Path(__file__).resolve().parents[2] / "inst" / "extdata"
+SPED_PLACEMENT = EXTDATA / "sped-placement-pdf-transcribed"
+SOURCE_ADAPTERS = EXTDATA / "test-fixtures" / "source-adapters"
+
+
+def _sped_placement(copies=1):
+    frames = [
+        pd.read_csv(path).assign(source_file=path.stem)
+        for path in sorted(SPED_PLACEMENT.glob("*.csv"))
+    ]
+    return pd.concat(frames * copies, ignore_index=True)
+
+
+def _directory_roles(rows=20_000):
+    # Synthetic roles seeded from the bundled district directory fixture.
+    district = pd.read_csv(
+        SOURCE_ADAPTERS / "directory-district.csv", skiprows=3, dtype=str
+    )
+    names = (
+        district["Supt First Name"].fillna("Pat") + " " + district["Supt Last Name"].fillna("Doe")
+    ).tolist()
+    roles = ["principal", "vice_principal", "counselor", "nurse"]
+    positions = np.arange(rows)
+    return pd.DataFrame({
+        "district_id": [f"{1000 + i // 28:04d}" for i in positions],
+        "school_id": [f"{i // 4 % 7:03d}" for i in positions],
+        "role": [roles[i % 4] for i in positions],
+        "person_name": [f"{names[i % len(names)]} {i}" for i in positions],
+    })
+
+
+def test_r_to_pandas_frame_overhead(monkeypatch, offline_benchmark):
+    monkeypatch.setattr(_r_bridge, "_require_rpy2", lambda: None)
+    frame = _sped_placement(copies=200)
+
+    @_r_bridge.r_to_pandas
+    def fetch_fixture(end_year):
+        return frame
+
+    result = offline_benchmark(
+        "r_to_pandas_frame_overhead", fetch_fixture, 2022, rounds=7, number=1_000
+    )
+    assert result is frame
+
+
+@pytest.mark.requires_r
+def test_r_data_frame_conversion(offline_benchmark):
+    import rpy2.robjects as ro
+
+    paths = ro.StrVector([str(path) for path in sorted(SPED_PLACEMENT.glob("*.csv"))])
+    r_frame = ro.r(
+        "function(paths) do.call(rbind, rep(lapply(paths, utils::read.csv), 200))"
+    )(paths)
+
+    result = offline_benchmark(
+        "r_data_frame_conversion", _r_bridge._convert, lambda: r_frame, (), {}
+    )
+    assert len(result) == r_frame.nrow
+
+
+def test_validate_assignment_semantics(offline_benchmark):
+    roles = _directory_roles()
+    count = offline_benchmark(
+        "validate_assignment_semantics", validate_assignment_semantics, roles, 0, rounds=3
+    )
+    assert count == 0
+
+
+def test_facility_geometry_parsing(offline_benchmark):
+    pytest.importorskip("geopandas")
+    pytest.importorskip("shapely")
+    rng = np.random.default_rng(46)
+    longitude = rng.uniform(-75.5, -73.9, 5_000)
+    latitude = rng.uniform(38.9, 41.4, 5_000)
+    df = pd.DataFrame({
+        "facility_id": np.arange(5_000),
+        "longitude": longitude,
+        "latitude": latitude,
+        "wkt": [f"POINT ({x:.6f} {y:.6f})" for x, y in zip(longitude, latitude)],
+    })
+    gdf = offline_benchmark("facility_geometry_parsing", _facility_geodataframe, df, rounds=3)
+    assert len(gdf) == 5_000
+
+
+def test_sped_placement_tidy(offline_benchmark):
+    placement = _sped_placement(copies=100)
+
+    def tidy(df):
+        out = df.assign(subgroup=recode_subgroups(df["subgroup"], "sped_placement"))
+        return out.pivot_table(
+            index=["source_file", "subgroup"],
+            columns="environment",
+            values="count",
+            aggfunc="sum",
+        )
+
+    wide = offline_benchmark("sped_placement_tidy", tidy, placement)
+    assert wide.index.get_level_values("source_file").nunique() == 6
@@ -0,0 +1,174 @@
+"""Tests for sparse-matrix charter sector aggregation."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("scipy")
+
+from njschooldata.charter import CharterApportionment
+
+
+@pytest.fixture
+def apportionment():
+    charter_city = pd.DataFrame({
+        "district_id": ["6068", "6010", "6020"],
+        "district_name": ["METS", "Charter A", "Charter B"],
+        "host_county_id": ["17", "13", "17"],
+        "host_county_name": ["Hudson", "Essex", "Hudson"],
+        "host_district_id": ["2390", "3570", "2390"],
+        "host_district_name": ["Jersey City", "Newark", "Jersey City"],
+    })
+    shares = pd.DataFrame({
+        "district_id": ["6068", "6068"],
+        "end_year": [2019, 2019],
+        "host_county_id": ["17", "13"],
+        "host_county_name": ["Hudson", "Essex"],
+        "host_district_id": ["2390", "3570"],
+        "host_district_name": ["Jersey City", "Newark"],
+        "share": [0.5, 0.5],
+    })
+    return CharterApportionment(charter_city, shares)
+
+
+def _grate(end_year):
+    return pd.DataFrame({
+        "end_year": end_year,
+        "county_id": ["80", "80", "80", "17", "13", "05"],
+        "district_id": ["6068", "6010", "6020", "2390", "3570", "0110"],
+        "school_id": ["999", "999", "888", "999", "999", "999"],
+        "is_district": True,
+        "subgroup": "total population",
+        "methodology": "4 year",
+        "cohort_count": [100.0, 50.0, 30.0, 1000.0, 2000.0, 400.0],
+        "graduated_count": [90.0, 40.0, np.nan, 800.0, 1500.0, 300.0],
+    })
+
+
+def test_apportioned_charter_total_is_preserved(apportionment):
+    out = apportionment.aggregate(_grate(2019), "grate").set_index("district_id")
+
+    assert out.loc["2390C", "cohort_count"] == 50 + 30
+    assert out.loc["3570C", "cohort_count"] == 50 + 50
+    assert out["cohort_count"].sum() == 100 + 50 + 30
+    assert out.loc["2390C", "graduated_count"] == 45
+    assert out.loc["3570C", "grad_rate"] == round(85 / 100, 3)
+    assert out.loc["2390C", "n_charter_rows"] == 2
+
+
+def test_unapportioned_year_uses_charter_city_host(apportionment):
+    out = apportionment.aggregate(_grate(2015), "grate").set_index("district_id")
+
+    assert out.loc["2390C", "cohort_count"] == 130
+    assert out.loc["3570C", "cohort_count"] == 50
+
+
+def test_allpublic_keeps_only_hosts_with_charters(apportionment):
+    out = apportionment.aggregate(_grate(2019), "grate", sector="allpublic")
+    out = out.set_index("district_id")
+
+    assert sorted(out.index) == ["2390A", "3570A"]
+    assert out.loc["2390A", "cohort_count"] == 1000 + 50 + 30
+    assert out.loc["3570A", "cohort_count"] == 2000 + 50 + 50
+    assert out.loc["2390A", "district_name"] == "Jersey City All Public"
+    assert out["is_allpublic"].all()
+
+
+def test_host_matrix_rows_sum_to_one_and_are_cached(apportionment):
+    matrix = apportionment.host_matrix(2019)
+
+    np.testing.assert_allclose(np.asarray(matrix.sum(axis=1)).ravel(), 1.0)
+    assert apportionment.host_matrix(2019) is matrix
+
+
+def test_bad_shares_are_rejected():
+    city = pd.DataFrame({
+        "district_id": ["6068"], "host_county_id": ["17"],
+        "host_county_name": ["Hudson"], "host_district_id": ["2390"],
+        "host_district_name": ["Jersey City"],
+    })
+    shares = city.assign(end_year=2019, share=0.6)
+
+    with pytest.raises(ValueError, match="6068/2019"):
+        CharterApportionment(city, shares)
+
+
+def _enr(end_year):
+    return pd.DataFrame({
+        "end_year": end_year,
+        "county_id": ["80"] * 6 + ["17", "17"],
+        "district_id": ["6068", "6068", "6010", "6010", "6020", "6020", "2390", "2390"],
+        "school_id": "999",
+        "is_district": True,
+        "program_code": "55",
+        "program_name": "Total",
+        "grade_level": "TOTAL",
+        "subgroup": ["total_enrollment", "male"] * 4,
+        "n_students": [100.0, 40.0, 50.0, 20.0, 30.0, 10.0, 1000.0, 480.0],
+    })
+
+
+def test_enr_matches_r_pct_total_schools_and_flags(apportionment):
+    out = apportionment.aggregate(_enr(2019), "enr")
+    out = out.set_index(["district_id", "subgroup"])
+
+    # agg_enr_pct_total(): n_students / the host's total_enrollment row
+    assert out.loc[("2390C", "total_enrollment"), "n_students"] == 50 + 30
+    assert out.loc[("2390C", "male"), "pct_total_enr"] == pytest.approx(30 / 80)
+    assert out.loc[("3570C", "male"), "pct_total_enr"] == pytest.approx(40 / 100)
+    assert out.loc[("3570C", "total_enrollment"), "pct_total_enr"] == 1.0
+    # n_schools = sum(share): METS counts half a school in each host
+    assert out.loc[("2390C", "male"), "n_schools"] == 1.5
+    row = out.loc[("2390C", "male")]
+    assert not row[["is_state", "is_county", "is_district", "is_school"]].any()
+    assert not row["is_subprogram"]
+    assert pd.isna(row["cds_code"])
+
+    allpublic = apportionment.aggregate(_enr(2019), "enr", sector="allpublic")
+    allpublic = allpublic.set_index(["district_id", "subgroup"])
+    assert allpublic.loc[("2390A", "male"), "pct_total_enr"] == pytest.approx(
+        (480 + 30) / (1000 + 80)
+    )
+
+
+def _parcc():
+    return pd.DataFrame({
+        "testing_year": 2019,
+        "county_id": ["80", "80", "80", "80"],
+        "district_id": ["6068", "6068", "6010", "6020"],
+        "district_name": ["METS", "METS", "Charter A", "Charter B"],
+        "school_id": None,
+        "school_name": ["METS", "METS", "Charter A", "Charter B"],
+        "is_district": True,
+        "assess_name": "NJSLA",
+        "test_name": "math",
+        "grade": ["3", "4", "3", "3"],
+        "subgroup": "total_population",
+        "subgroup_type": "Total",
+        "number_enrolled": [40.0, 40.0, 20.0, 30.0],
+        "number_not_tested": 0.0,
+        "number_of_valid_scale_scores": [40.0, 40.0, 20.0, 30.0],
+        "scale_score_mean": [750.0, 740.0, 700.0, 760.0],
+        "num_l1": [4.0, 4.0, 2.0, 3.0],
+        "num_l2": [4.0, 4.0, 2.0, 3.0],
+        "num_l3": [8.0, 8.0, 6.0, 6.0],
+        "num_l4": [16.0, 16.0, 8.0, 12.0],
+        "num_l5": [8.0, 8.0, 2.0, 6.0],
+    })
+
+
+def test_parcc_matches_r_n_schools_and_flags(apportionment):
+    # PARCC frames carry testing_year, so R uses the 1:1 charter_city host
+    out = apportionment.aggregate(_parcc(), "parcc").set_index(["district_id", "grade"])
+
+    jersey_city = out.loc[("2390C", "3")]
+    assert jersey_city["number_of_valid_scale_scores"] == 40 + 30
+    assert jersey_city["n_schools"] == 2
+    assert jersey_city["scale_score_mean"] == round((750 * 40 + 760 * 30) / 70, 2)
+    assert jersey_city["proficient_above"] == round((24 + 18) / 70 * 100, 2)
+    assert out.loc[("2390C", "4"), "n_schools"] == 1
+    assert out.loc[("3570C", "3"), "n_schools"] == 1
+    assert not jersey_city[
+        ["is_state", "is_dfg", "is_district", "is_charter", "is_school"]
+    ].any()
+    assert jersey_city["is_charter_sector"]
@@ -8,7 +8,10 @@ import pytest
 
 import njschooldata
 from njschooldata import _r_bridge
-from njschooldata._contract import expected_python_parameters
+from njschooldata._contract import (
+    CURATED_PYTHON_ONLY_PARAMETERS,
+    expected_python_parameters,
+)
 from njschooldata._generated_contract import (
     PYTHON_PACKAGE_VERSION,
     R_PACKAGE_MAX_VERSION,
@@ -115,9 +118,15 @@ def test_curated_python_signatures_match_generated_r_formals():
         assert python_parameters == expected, name
 
         defaults = contract["defaults"] or {}
+        python_only = CURATED_PYTHON_ONLY_PARAMETERS.get(name, [])
         for parameter in expected:
+            python_parameter = inspect.signature(wrapper).parameters[parameter]
+            python_default = python_parameter.default
+            if parameter in python_only:
+                assert python_parameter.kind is inspect.Parameter.KEYWORD_ONLY
+                assert python_default is None, (name, parameter)
+                continue
             r_default = defaults[parameter]
-            python_default = inspect.signature(wrapper).parameters[parameter].default
             if r_default == "<required>":
                 assert python_default is inspect.Parameter.empty, (name, parameter)
             elif r_default == "TRUE":
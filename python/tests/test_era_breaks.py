@@ -0,0 +1,100 @@
+"""Tests for the searchsorted era engine."""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from njschooldata.era_breaks import (
+    assert_no_break_span,
+    break_span_violations,
+    era_break_set,
+    get_era_breaks,
+    tag_era,
+)
+
+REGISTRY = Path(__file__).resolve().parents[2] / "inst" / "extdata" / "metric_registry.csv"
+
+
+def _r_tag_era(years, break_set):
+    """Loop-for-loop port of R's tag_era()."""
+    breaks = get_era_breaks(break_set)
+    boundary = sorted(set(breaks.loc[
+        breaks["break_type"].isin(["scale_break", "definition_change"]), "break_year"
+    ]))
+    era = np.ones(len(years), dtype=int)
+    for year in boundary:
+        era += years >= year
+    return era, np.isin(years, breaks["break_year"])
+
+
+@pytest.mark.parametrize("break_set", ["njsla", "grad", "attendance", "econ_disadv"])
+def test_tag_era_matches_r_loop(break_set):
+    years = np.arange(2005, 2030)
+    tagged = tag_era(pd.DataFrame({"end_year": years}), break_set)
+    era, is_break = _r_tag_era(years, break_set)
+
+    np.testing.assert_array_equal(tagged["era_id"].to_numpy(dtype=int), era)
+    np.testing.assert_array_equal(tagged["is_break_year"], is_break)
+
+
+def test_documented_examples_and_missing_years():
+    tagged = tag_era(pd.DataFrame({"end_year": [2014, 2015, 2016, None]}), "njsla")
+
+    assert tagged["era_id"].tolist()[:3] == [1, 2, 2]
+    assert tagged["era_id"].isna().iloc[3]
+    assert tagged["is_break_year"].tolist() == [False, True, False, False]
+    covid = tag_era(pd.DataFrame({"end_year": [2019, 2020, 2021, 2022]}), "njsla")
+    assert covid["era_id"].tolist() == [3, 3, 3, 4]
+
+
+def test_tag_era_does_not_copy_or_modify_input_columns():
+    df = pd.DataFrame({"end_year": [2014, 2015], "score": [700.5, 712.25]})
+    tagged = tag_era(df, "njsla")
+
+    assert list(df.columns) == ["end_year", "score"]
+    assert np.shares_memory(tagged["score"].to_numpy(), df["score"].to_numpy())
+
+
+def test_assert_no_break_span_messages():
+    assert assert_no_break_span([2016, 2017, 2018], "njsla") == [2016, 2017, 2018]
+    assert_no_break_span([2020], "njsla")
+
+    with pytest.raises(ValueError, match=r"2014-2016 .*2015 scale_break \(NJASK/HSPA"):
+        assert_no_break_span(range(2014, 2017), "njsla")
+    with pytest.raises(ValueError, match="2020 covid_gap"):
+        assert_no_break_span([2019, 2021], "attendance")
+    with pytest.raises(ValueError, match="whole-number ending years.*2019.5"):
+        assert_no_break_span([2019.5, 2020], "njsla")
+    with pytest.raises(ValueError, match="Available break_set values: attendance"):
+        tag_era(pd.DataFrame({"end_year": [2020]}), "nope")
+
+
+def test_panel_span_check_matches_per_group_assertion():
+    rng = np.random.default_rng(2)
+    panel = pd.DataFrame({
+        "district_id": rng.integers(0, 50, 2000).astype(str),
+        "subgroup": rng.choice(["a", "b"], 2000),
+        "end_year": rng.integers(2016, 2025, 2000),
+    })
+    panel.loc[panel["district_id"] == "7", "end_year"] = 2023
+
+    out = break_span_violations(panel, "grad", by=["district_id", "subgroup"])
+
+    expected = set()
+    for key, group in panel.groupby(["district_id", "subgroup"]):
+        try:
+            assert_no_break_span(group["end_year"], "grad")
+        except ValueError:
+            expected.add(key)
+    assert set(zip(out["district_id"], out["subgroup"])) == expected
+    assert "7" not in set(out["district_id"])
+
+
+def test_every_registry_break_set_compiles():
+    if not REGISTRY.exists():
+        pytest.skip("metric_registry.csv is only available in a source checkout")
+    registry = pd.read_csv(REGISTRY, dtype=str)
+    for name in registry["era_break_set"].dropna().unique():
+        assert len(era_break_set(name).break_years) > 0
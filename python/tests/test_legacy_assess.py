@@ -0,0 +1,107 @@
+"""Tests for the memory-mapped legacy assessment fixed-width reader."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from njschooldata.legacy_assess import (
+    find_redundant_overlaps,
+    legacy_assess_layout,
+    nj_coltype_parser,
+    read_legacy_fwf,
+)
+
+
+@pytest.fixture
+def layout():
+    return pd.DataFrame({
+        "field_start_position": [1, 1, 3, 7, 10, 15, 19],
+        "field_end_position": [9, 2, 6, 9, 14, 18, 22],
+        "field_length": [9, 2, 4, 3, 5, 4, 4],
+        "data_type": ["Text", "Text", "Text", "Integer", "Text", "Integer", "Decimal"],
+        "final_name": ["CDS_Code", "County_Code", "District_Code", "School_Code",
+                       "School_Name", "Tested", "Mean"],
+    })
+
+
+def _write(tmp_path, lines, newline="\n"):
+    path = tmp_path / "state_summary.txt"
+    path.write_bytes(newline.join(lines).encode("iso8859_2"))
+    return path
+
+
+def test_fixed_width_file_parses_with_layout_types(tmp_path, layout):
+    path = _write(tmp_path, [
+        "130010050Kaška  1245.5",
+        "13001099*Newar   * 1e3",
+    ], newline="\r\n")
+
+    df = read_legacy_fwf(path, layout)
+
+    assert list(df.columns) == list(layout["final_name"])
+    assert df["School_Name"].tolist() == ["Kaška", "Newar"]
+    assert str(df["Tested"].dtype) == "Int64"
+    assert df["Tested"].iloc[0] == 12 and df["Tested"].isna().iloc[1]
+    np.testing.assert_array_equal(df["Mean"], [45.5, 1000.0])
+    assert df["School_Code"].iloc[0] == 50
+    # composites paste the parsed components, like as.character() in R
+    assert df["CDS_Code"].tolist()[0] == "130010" + "50"
+    assert df["CDS_Code"].isna().iloc[1]
+
+
+def test_ragged_lines_are_trimmed_padded_and_warned(tmp_path, layout):
+    path = _write(tmp_path, ["130010050Alpha   7", "130010060Beta\t"])
+
+    with pytest.warns(UserWarning, match="not fixed"):
+        df = read_legacy_fwf(path, layout)
+
+    assert df["School_Name"].tolist() == ["Alpha", "Beta"]
+    assert df["Tested"].iloc[0] == 7
+    assert df["Tested"].isna().iloc[1] and df["Mean"].isna().all()
+
+
+def test_redundant_overlaps_and_type_codes(layout):
+    assert find_redundant_overlaps(layout).tolist() == [True] + [False] * 6
+    gap = layout.drop(index=2)
+    assert not find_redundant_overlaps(gap).any()
+    assert nj_coltype_parser(layout["data_type"]) == "cccicid"
+
+
+def test_layout_selection_mirrors_fetch_functions():
+    assert legacy_assess_layout("NJASK", 2008, 4) == ("layout_njask07gr3", None)
+    assert legacy_assess_layout("NJASK", 2008, 6) == ("layout_njask09", None)
+    assert legacy_assess_layout("NJASK", 2007, 8) == ("layout_njask", None)
+    assert legacy_assess_layout("HSPA", 2013) == ("layout_hspa", 558)
+    assert legacy_assess_layout("GEPA", 2004) == ("layout_njask04", 361)
+    assert legacy_assess_layout("gepa", 2006) == ("layout_gepa06", None)
+
+
+def _r_fetch_njask_layout(end_year, grade):
+    """Branch-for-branch port of the layout choice in R's fetch_njask()."""
+    if end_year == 2004:
+        return "layout_njask04"
+    elif end_year == 2005:
+        return "layout_njask05"
+    elif end_year == 2006 and grade in (3, 4):
+        return "layout_njask06gr3"
+    elif end_year == 2006 and grade >= 5:
+        return "layout_njask06gr5"
+    elif end_year in (2007, 2008) and grade in (3, 4):
+        return "layout_njask07gr3"
+    elif end_year == 2007 and grade in (5, 6, 7):
+        return "layout_njask07gr5"
+    elif end_year == 2008 and grade >= 5:
+        return "layout_njask09"
+    elif end_year == 2009:
+        return "layout_njask09"
+    elif end_year == 2010:
+        return "layout_njask10"
+    return "layout_njask"
+
+
+@pytest.mark.parametrize("end_year", range(2004, 2015))
+def test_njask_layout_matches_r_for_every_year_and_grade(end_year):
+    for grade in range(1, 9):
+        assert legacy_assess_layout("NJASK", end_year, grade) == (
+            _r_fetch_njask_layout(end_year, grade), None
+        )
@@ -0,0 +1,145 @@
+"""Tests for per-call memory accounting and the memory budget."""
+
+import contextlib
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from njschooldata import _r_bridge, memory
+
+
+class _FakeRFrame:
+    rclass = ("data.frame",)
+
+    def __init__(self, rows, projected):
+        self.rows = rows
+        self.projected = projected
+        self.converted = False
+
+    def list_attrs(self):
+        return []
+
+    def to_pandas(self):
+        self.converted = True
+        return pd.DataFrame({"value": np.arange(self.rows, dtype="float64")})
+
+
+@pytest.fixture(autouse=True)
+def _fake_r(monkeypatch):
+    heap = iter([(1_000, 1_000), (1_500, 4_000)])
+    monkeypatch.delenv("NJSD_MEMORY_ACCOUNTING", raising=False)
+    monkeypatch.delenv("NJSD_MEMORY_BUDGET", raising=False)
+    monkeypatch.setattr(_r_bridge, "_require_rpy2", lambda: None)
+    monkeypatch.setattr(_r_bridge, "ro", SimpleNamespace(default_converter=0))
+    monkeypatch.setattr(_r_bridge, "pandas2ri", SimpleNamespace(converter=0))
+    monkeypatch.setattr(_r_bridge, "localconverter", lambda _: contextlib.nullcontext())
+    monkeypatch.setattr(memory, "_hooks", [])
+    monkeypatch.setattr(memory, "_budget", None)
+    monkeypatch.setattr(
+        memory,
+        "_r_function",
+        lambda source: (
+            (lambda reset: next(heap))
+            if source == memory._R_HEAP
+            else (lambda df: (df.projected,))
+        ),
+    )
+
+
+def _wrapper(result):
+    @_r_bridge.r_to_pandas
+    def fetch_fake(end_year):
+        return result
+
+    return fetch_fake
+
+
+def test_accounting_is_off_by_default():
+    df = _wrapper(_FakeRFrame(10, 500))(2024)
+    assert "memory" not in df.attrs
+
+
+def test_track_memory_records_r_python_and_frame_usage():
+    with memory.track_memory():
+        df = _wrapper(_FakeRFrame(100_000, 800_128))(2024)
+
+    record = df.attrs["memory"]
+    assert record["function"] == "fetch_fake"
+    assert (record["r_heap_before"], record["r_heap_after"], record["r_heap_peak"]) == (
+        1_000, 1_500, 4_000,
+    )
+    assert record["projected_frame"] == 800_128
+    assert record["frame"] == df.memory_usage(deep=True).sum()
+    assert record["python_peak"] >= 800_000
+
+
+def test_hooks_enable_accounting_and_failures_only_warn():
+    records = []
+    memory.add_memory_hook(records.append)
+
+    @memory.add_memory_hook
+    def broken(record):
+        raise ValueError("exporter down")
+
+    with pytest.warns(RuntimeWarning, match="exporter down"):
+        _wrapper(pd.DataFrame({"x": [1, 2]}))(2024)
+
+    (record,) = records
+    assert isinstance(record, memory.FetchMemory)
+    assert record.r_heap_before is None and record.projected_frame is None
+    assert record.frame == pd.DataFrame({"x": [1, 2]}).memory_usage(deep=True).sum()
+    memory.remove_memory_hook(broken)
+    assert memory._hooks == [records.append]
+
+
+def test_nested_wrapped_calls_are_counted_in_the_outer_record():
+    inner = _wrapper(_FakeRFrame(10, 500))
+    records = []
+
+    @_r_bridge.r_to_pandas
+    def fetch_outer(end_year):
+        return _FakeRFrame(len(inner(end_year)), 500)
+
+    memory.add_memory_hook(records.append)
+    # Runs in a daemon thread so a self-deadlock fails the test instead of
+    # hanging it.
+    frames = []
+    worker = threading.Thread(target=lambda: frames.append(fetch_outer(2024)), daemon=True)
+    worker.start()
+    worker.join(timeout=10)
+    assert not worker.is_alive(), "nested accounted call deadlocked"
+    (df,) = frames
+
+    assert [record.function for record in records] == ["fetch_outer"]
+    assert df.attrs["memory"]["r_heap_before"] == 1_000
+    assert not memory._lock.locked()
+
+
+def test_budget_raises_before_conversion(monkeypatch):
+    result = _FakeRFrame(10, 5_000)
+    memory.set_memory_budget("4K")
+    with pytest.raises(memory.MemoryBudgetExceeded) as info:
+        _wrapper(result)(2024)
+    assert (info.value.projected, info.value.budget) == (5_000, 4_096)
+    assert isinstance(info.value, MemoryError)
+    assert not result.converted
+
+    memory.set_memory_budget(None)
+    monkeypatch.setenv("NJSD_MEMORY_BUDGET", "1M")
+    assert len(_wrapper(result)(2024)) == 10
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [(None, None), (512, 512), ("1000", 1000), ("2G", 2 * 1024 ** 3), ("1.5MiB", 1_572_864)],
+)
+def test_parse_bytes(value, expected):
+    assert memory.parse_bytes(value) == expected
+
+
+def test_parse_bytes_rejects_garbage():
+    with pytest.raises(ValueError, match="invalid memory size"):
+        memory.parse_bytes("lots")
@@ -0,0 +1,67 @@
+"""Tests for the indexed metric registry."""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from njschooldata.metric_registry import (
+    MetricRegistry,
+    annotate_metric,
+    list_metrics,
+    load_metric_registry,
+    metric_meta,
+)
+
+REGISTRY = Path(__file__).resolve().parents[2] / "inst" / "extdata" / "metric_registry.csv"
+
+
+def test_bundled_registry_matches_csv():
+    if not REGISTRY.exists():
+        pytest.skip("metric_registry.csv is only available in a source checkout")
+    from_csv = MetricRegistry.from_csv(REGISTRY)
+
+    pd.testing.assert_frame_equal(from_csv.table, load_metric_registry().table)
+
+
+def test_annotate_long_frame_matches_string_merge():
+    registry = load_metric_registry()
+    rng = np.random.default_rng(1)
+    metrics = rng.choice(list(registry.metrics[:20]) + ["not_a_metric", None], 500)
+    df = pd.DataFrame({"metric": metrics, "value": rng.random(500)})
+
+    with pytest.warns(UserWarning, match="Unregistered metric\\(s\\): not_a_metric"):
+        out = annotate_metric(df)
+
+    meta = registry.table[["metric", "polarity", "unit", "is_rate"]]
+    expected = df.merge(meta, on="metric", how="left")
+    for col in ("polarity", "unit"):
+        assert out[col].astype("string").equals(expected[col].astype("string"))
+    assert out["is_rate"].equals(expected["is_rate"].astype("boolean"))
+    assert isinstance(out["unit"].dtype, pd.CategoricalDtype)
+
+    registered = df[df["metric"].isin(registry.metrics)]
+    categorical = annotate_metric(registered.astype({"metric": "category"}))
+    assert categorical["unit"].astype("string").equals(
+        out.loc[registered.index, "unit"].astype("string")
+    )
+
+
+def test_scalar_metric_and_extra_fields():
+    out = annotate_metric(pd.DataFrame({"value": [0.8, 0.9]}), "grad_rate",
+                          fields=("polarity", "is_rate", "era_break_set"))
+
+    assert out["polarity"].tolist() == ["higher_is_better"] * 2
+    assert out["is_rate"].all()
+    assert out["era_break_set"].tolist() == ["grad"] * 2
+
+
+def test_metric_meta_and_list_metrics():
+    assert metric_meta("per_pupil_total")["unit"].iloc[0] == "dollars"
+    with pytest.warns(UserWarning, match="'nope' is not registered"):
+        row = metric_meta("nope")
+    assert row["metric"].iloc[0] == "nope" and row["unit"].isna().all()
+    assert set(list_metrics(["finance", "el"])["domain"]) == {"finance", "el"}
+    with pytest.raises(ValueError, match="no 'metric' column"):
+        annotate_metric(pd.DataFrame({"value": [1]}))
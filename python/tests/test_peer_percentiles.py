@@ -0,0 +1,126 @@
+"""Tests for precomputed peer-percentile lookup tables."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from njschooldata.peer_percentiles import (
+    PeerPercentileTable,
+    build_peer_percentile_table,
+)
+
+
+@pytest.fixture
+def assessment_df():
+    rng = np.random.default_rng(7)
+    rows = []
+    for year in (2023, 2024):
+        for grade in ("4", "8"):
+            for dfg in ("A", "J"):
+                for i in range(25):
+                    rows.append({
+                        "testing_year": year,
+                        "assess_name": "NJSLA",
+                        "test_name": "math",
+                        "grade": grade,
+                        "dfg": dfg,
+                        "subgroup": "total_population",
+                        "subgroup_type": "Total",
+                        "is_district": True,
+                        "is_school": False,
+                        "scale_score_mean": float(rng.integers(700, 800)),
+                    })
+    df = pd.DataFrame(rows)
+    df.loc[3, "scale_score_mean"] = np.nan
+    return df
+
+
+def test_member_ranks_match_r_min_rank(assessment_df):
+    table = build_peer_percentile_table(assessment_df, peer_group="dfg")
+    ranked = table.rank(assessment_df, member=True)
+
+    grouped = assessment_df.groupby(list(table.key_columns))["scale_score_mean"]
+    expected_rank = grouped.rank(method="min")
+    expected_n = grouped.transform("count")
+    expected_pct = np.round(expected_rank / expected_n * 100, 1)
+
+    np.testing.assert_array_equal(ranked["rank"], expected_rank)
+    np.testing.assert_array_equal(ranked["percentile"], expected_pct)
+    assert np.isnan(ranked.loc[3, "percentile"])
+
+
+def test_what_if_scores_join_the_peer_group(assessment_df):
+    table = build_peer_percentile_table(assessment_df)
+    query = assessment_df.iloc[[0, 0]].copy()
+    query["scale_score_mean"] = [0.0, 10_000.0]
+
+    ranked = table.rank(query)
+    n = table.group_sizes()[0] + 1
+
+    assert list(ranked["n"]) == [n, n]
+    assert list(ranked["rank"]) == [1, n]
+    assert ranked["percentile"].iloc[1] == 100.0
+
+
+def test_unknown_groups_and_missing_scores_are_nan(assessment_df):
+    table = build_peer_percentile_table(assessment_df)
+    query = assessment_df.iloc[[0]].assign(testing_year=1999)
+
+    assert table.rank(query)["percentile"].isna().all()
+
+
+def test_nearest_percentile_averages_equidistant_neighbours():
+    df = pd.DataFrame({
+        "testing_year": 2024, "assess_name": "NJSLA", "test_name": "ela",
+        "grade": "3", "subgroup": "total_population", "subgroup_type": "Total",
+        "is_district": True, "is_school": False,
+        "scale_score_mean": [700.0, 710.0, 710.0, 730.0],
+    })
+    table = build_peer_percentile_table(df)
+    query = df.iloc[[0, 0, 0]].assign(scale_score_mean=[711.0, 720.0, 705.0])
+
+    result = table.nearest_percentile(query)
+
+    assert list(result) == [50.0, 75.0, 37.5]
+
+
+def _r_lookup_peer_percentile(members, queries):
+    """Port of R's lookup_peer_percentile() join/filter/mean for scale scores."""
+    keys = ["testing_year", "test_name", "grade", "subgroup", "subgroup_type"]
+    grouped = members.groupby(keys + ["assess_name"])["scale_score_mean"]
+    lookup = members.assign(
+        pct=np.round(grouped.rank(method="min") / grouped.transform("count") * 100, 1)
+    )[keys + ["scale_score_mean", "pct"]].drop_duplicates()
+    out = []
+    for _, query in queries.iterrows():
+        peers = lookup.loc[(lookup[keys] == query[keys]).all(axis=1)]
+        diff = (peers["scale_score_mean"] - query["scale_score_mean"]).abs()
+        out.append(peers.loc[diff == diff.min(), "pct"].mean())
+    return out
+
+
+def test_nearest_percentile_pools_assessments_like_r():
+    rng = np.random.default_rng(3)
+    members = pd.DataFrame({
+        "testing_year": 2019, "test_name": "math", "grade": "8",
+        "subgroup": "total_population", "subgroup_type": "Total",
+        "assess_name": ["PARCC"] * 30 + ["NJSLA"] * 20,
+        "is_district": True, "is_school": False,
+        "scale_score_mean": rng.integers(720, 760, 50).astype(float),
+    })
+    table = build_peer_percentile_table(members)
+    queries = members.iloc[:12][["testing_year", "test_name", "grade", "subgroup", "subgroup_type"]]
+    queries = queries.assign(scale_score_mean=np.linspace(715.5, 765.0, 12))
+
+    result = table.nearest_percentile(queries)
+
+    np.testing.assert_allclose(result, _r_lookup_peer_percentile(members, queries))
+
+
+def test_round_trip_persistence(tmp_path, assessment_df):
+    table = build_peer_percentile_table(assessment_df, peer_group="dfg")
+    loaded = PeerPercentileTable.load(table.save(tmp_path / "dfg.npz"))
+
+    pd.testing.assert_frame_equal(
+        loaded.rank(assessment_df), table.rank(assessment_df)
+    )
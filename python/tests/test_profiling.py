@@ -0,0 +1,160 @@
+"""Tests for opt-in cProfile/Rprof profiling of R calls."""
+
+import contextvars
+from pathlib import Path
+import threading
+
+import pandas as pd
+import pytest
+
+from njschooldata import _r_bridge, profiling
+
+RPROF = 'sample.interval=10000\n"read.csv" "fetch_enr"\n"read.csv" "fetch_enr"\n"clean" "fetch_enr"\n'
+
+
+class _FakePackage:
+    @staticmethod
+    def fetch_enr(end_year, tidy=False):
+        total = sum(i * i for i in range(20_000))
+        return pd.DataFrame({"end_year": [end_year], "total": [total]})
+
+
+@pytest.fixture(autouse=True)
+def _fake_r(monkeypatch):
+    monkeypatch.delenv("NJSD_PROFILE", raising=False)
+    monkeypatch.delenv("NJSD_PROFILE_DIR", raising=False)
+    monkeypatch.setattr(_r_bridge, "_require_rpy2", lambda: None)
+    monkeypatch.setattr(_r_bridge, "_get_r_package", lambda: _FakePackage)
+    monkeypatch.setattr(_r_bridge, "_python_to_r", lambda value: value)
+
+    def start(path):
+        Path(path).write_text(RPROF, encoding="utf-8")
+        return True
+
+    monkeypatch.setattr(profiling, "_rprof_start", start)
+    monkeypatch.setattr(profiling, "_rprof_stop", lambda: None)
+
+
+@_r_bridge.r_to_pandas
+def fetch_fake(end_year, tidy=False):
+    _r_bridge.call_r_function("fetch_enr", end_year, tidy=tidy)
+    return pd.DataFrame({"end_year": [end_year]})
+
+
+def _folded(path):
+    lines = path.read_text(encoding="utf-8").splitlines()
+    return {line.rsplit(" ", 1)[0]: int(line.rsplit(" ", 1)[1]) for line in lines}
+
+
+def test_profiling_is_off_by_default(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    fetch_fake(2024)
+    assert profiling.profile_directory() is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_profile_calls_writes_one_merged_file_per_outer_call(tmp_path):
+    with profiling.profile_calls(tmp_path / "profiles") as directory:
+        fetch_fake(2024, tidy=True)
+
+    files = list(directory.iterdir())
+    assert len(files) == 1
+    assert files[0].name.startswith("fetch_fake-2024-tidy=True-")
+    assert files[0].suffix == ".folded"
+    stacks = _folded(files[0])
+    r_lines = {stack: weight for stack, weight in stacks.items() if "R::" in stack}
+    assert {stack.split(";_r_bridge.py:_invoke_r;", 1)[1] for stack in r_lines} == {
+        "R::fetch_enr;R::read.csv",
+        "R::fetch_enr;R::clean",
+    }
+    assert sorted(r_lines.values()) == [10_000, 20_000]
+    assert any("fetch_fake" in stack for stack in stacks)
+
+
+def test_environment_switch_and_direct_calls(tmp_path, monkeypatch):
+    monkeypatch.setenv("NJSD_PROFILE", "true")
+    monkeypatch.setenv("NJSD_PROFILE_DIR", str(tmp_path))
+    _r_bridge.call_r_function("fetch_enr", [2023, 2024])
+    (path,) = tmp_path.iterdir()
+    assert path.name.startswith("fetch_enr-_2023_2024-")
+
+
+def test_long_argument_names_are_truncated_with_a_digest():
+    slug = profiling._slug("fetch_enr", (list(range(2000, 2040)),), {})
+    assert len(slug) == 80
+    assert slug.startswith("fetch_enr-_2000_2001_")
+    assert slug != profiling._slug("fetch_enr", (list(range(2000, 2041)),), {})
+
+
+def test_merge_without_python_entry_keeps_r_stacks_at_root():
+    merged = profiling.merge_stacks({("main",): 0.5}, profiling.r_stacks(RPROF))
+    assert merged[("R", "R::fetch_enr", "R::read.csv")] == pytest.approx(0.02)
+
+
+def test_merge_discounts_rpy2_time_already_sampled_in_r():
+    entry = ("main", "_r_bridge.py:_invoke_r")
+    python = {entry: 0.01, entry + ("rpy2",): 0.04, ("main",): 0.1}
+    merged = profiling.merge_stacks(python, {("R::f",): 0.03})
+    assert merged[entry + ("rpy2",)] == pytest.approx(0.01)
+    assert merged[entry + ("R::f",)] == pytest.approx(0.03)
+    assert merged[("main",)] == pytest.approx(0.1)
+
+
+def test_pass_through_wrappers_are_named_after_the_r_function(tmp_path):
+    import functools
+
+    wrapper = _r_bridge.r_to_pandas(
+        functools.partial(_r_bridge.call_r_function, "fetch_enr")
+    )
+    with profiling.profile_calls(tmp_path):
+        wrapper(2024)
+    (path,) = tmp_path.iterdir()
+    assert path.name.startswith("fetch_enr-2024-")
+
+
+def test_a_failed_profile_write_warns_without_masking_the_call_error(tmp_path, monkeypatch):
+    def full_disk(stacks, path):
+        raise OSError("No space left on device")
+
+    def fails():
+        raise ValueError("no such year")
+
+    monkeypatch.setattr(profiling, "write_folded", full_disk)
+    with profiling.profile_calls(tmp_path), pytest.warns(
+        RuntimeWarning, match="No space left"
+    ), pytest.raises(ValueError, match="no such year"):
+        profiling.profiled("fetch_enr", (2024,), {}, fails)
+    assert not profiling._claimed
+
+
+def test_concurrent_calls_do_not_wait_on_a_profiled_call(tmp_path):
+    entered, release = threading.Event(), threading.Event()
+
+    def slow():
+        entered.set()
+        release.wait(10)
+        return "slow"
+
+    results = {}
+    with profiling.profile_calls(tmp_path):
+        first = threading.Thread(
+            target=lambda context=contextvars.copy_context(): results.update(
+                slow=context.run(profiling.profiled, "slow", (), {}, slow)
+            )
+        )
+        first.start()
+        assert entered.wait(5)
+        second = threading.Thread(
+            target=lambda context=contextvars.copy_context(): results.update(
+                fast=context.run(profiling.profiled, "fast", (), {}, lambda: "fast")
+            ),
+            daemon=True,
+        )
+        second.start()
+        second.join(5)
+        assert not second.is_alive(), "a concurrent call waited on the profiled call"
+        release.set()
+        first.join(5)
+
+    assert results == {"slow": "slow", "fast": "fast"}
+    assert [path.name.split("-", 1)[0] for path in tmp_path.iterdir()] == ["slow"]
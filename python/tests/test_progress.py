@@ -0,0 +1,138 @@
+"""Tests for the R progress-callback bridge."""
+
+import threading
+
+import pandas as pd
+import pytest
+
+import njschooldata
+from njschooldata import _r_bridge, progress
+from njschooldata import ell
+
+
+def _r_event(phase, index, item, **fields):
+    return {
+        "task": "fetch_all_parcc", "phase": phase, "index": index, "total": 3,
+        "item": item, "elapsed": 0.0, "total_elapsed": 2.0 * index, "bytes": 0.0,
+        **fields,
+    }
+
+
+class _FakePackage:
+    """Emits the events R's progress_lapply() would send for a batch."""
+
+    @staticmethod
+    def fetch_all_parcc(*args, **kwargs):
+        for index, item in enumerate(["2023 3 ela", "2023 4 ela", "2023 5 ela"], 1):
+            progress.on_r_event(_r_event("start", index, item))
+            progress.on_r_event(
+                _r_event("done", index, item, elapsed=2.0, bytes=1024.0, status="actual")
+            )
+        return pd.DataFrame({"end_year": [2023]})
+
+    fetch_ell_multi = fetch_all_parcc
+
+
+class _Bar:
+    def __init__(self):
+        self.total = None
+        self.n = 0
+        self.postfix = []
+
+    def update(self, n=1):
+        self.n += n
+
+    def set_postfix_str(self, text):
+        self.postfix.append(text)
+
+
+@pytest.fixture
+def fake_r(monkeypatch):
+    monkeypatch.setattr(_r_bridge, "_require_rpy2", lambda: None)
+    monkeypatch.setattr(_r_bridge, "_get_r_package", lambda: _FakePackage)
+    monkeypatch.setattr(_r_bridge, "_python_to_r", lambda value: value)
+    monkeypatch.setattr(progress, "install_r_callback", lambda: None)
+
+
+def test_passthrough_batch_fetcher_sends_structured_events(fake_r):
+    events = []
+    njschooldata._build_passthrough("fetch_all_parcc")(progress=events.append)
+
+    assert [(e.phase, e.index) for e in events] == [
+        ("start", 1), ("done", 1), ("start", 2), ("done", 2), ("start", 3), ("done", 3),
+    ]
+    done = events[1]
+    assert done == progress.ProgressEvent(
+        task="fetch_all_parcc", phase="done", index=1, total=3, item="2023 3 ela",
+        elapsed=2.0, total_elapsed=2.0, bytes=1024.0, status="actual",
+    )
+    assert done.eta == pytest.approx(4.0)
+    assert events[0].eta is None
+    assert events[0].status is None
+
+
+def test_curated_multi_wrapper_accepts_a_tqdm_style_bar(fake_r):
+    bar = _Bar()
+    ell.fetch_ell_multi([2023, 2024], progress=bar)
+    assert bar.total == 3
+    assert bar.n == 3
+    assert bar.postfix[:2] == ["2023 3 ela", "2023 3 ela actual"]
+
+
+def test_events_outside_a_progress_context_are_ignored(fake_r):
+    events = []
+    njschooldata._build_passthrough("fetch_all_parcc")()
+    with progress.report_progress(events.append):
+        pass
+    progress.on_r_event(_r_event("start", 1, "2023 3 ela"))
+    assert events == []
+
+
+def test_failing_callback_warns_without_failing_the_fetch(fake_r):
+    def broken(event):
+        raise ValueError("bar closed")
+
+    with pytest.warns(RuntimeWarning, match="bar closed"):
+        frame = njschooldata._build_passthrough("fetch_all_parcc")(progress=broken)
+    assert list(frame["end_year"]) == [2023]
+
+
+def test_concurrent_identical_fetches_each_receive_their_events(fake_r, monkeypatch):
+    # Both calls must be inside R at once; coalescing them breaks the barrier.
+    barrier = threading.Barrier(2, timeout=5)
+    fetch = _FakePackage.fetch_all_parcc
+
+    def fetch_all_parcc(*args, **kwargs):
+        barrier.wait()
+        return fetch(*args, **kwargs)
+
+    monkeypatch.setattr(_FakePackage, "fetch_all_parcc", staticmethod(fetch_all_parcc))
+    wrapper = njschooldata._build_passthrough("fetch_all_parcc")
+    received = {name: [] for name in ("first", "second")}
+    errors = []
+
+    def run(name):
+        try:
+            wrapper(progress=received[name].append)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(name,)) for name in received]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert [len(events) for events in received.values()] == [6, 6]
+
+
+def test_only_batch_fetchers_report_progress():
+    assert progress.reports_progress("fetch_all_parcc")
+    assert progress.reports_progress("fetch_many_tges")
+    assert progress.reports_progress("fetch_finance_multi")
+    assert progress.reports_progress("fetch_enr_years")
+    assert not progress.reports_progress("fetch_enr")
+    assert not progress.reports_progress("get_available_finance_years")
+    with pytest.raises(TypeError, match="progress must be"):
+        progress.as_callback(42)
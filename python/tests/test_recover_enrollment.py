@@ -0,0 +1,91 @@
+"""Tests for the rounded-percentage count recovery engine."""
+
+from fractions import Fraction
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from njschooldata.recover_enrollment import (
+    RationalTable,
+    infer_postsec_counts,
+    recover_counts,
+)
+
+
+def _brute_force(percent, lo, hi, digits=1):
+    """enumerate_possibilities()-style scan with exact half-up rounding."""
+    scale = 10 ** digits
+    target = Fraction(percent).limit_denominator(10 ** 6) * scale
+    hits = []
+    for d in range(lo, hi + 1):
+        for n in range(d + 1):
+            value = Fraction(100 * n * scale, d)
+            rounded = int(value + Fraction(1, 2))
+            if rounded == target:
+                hits.append((n, d))
+    return hits
+
+
+def test_candidate_runs_match_brute_force_enumeration():
+    table = RationalTable.build(120)
+    queries = [(68.2, 80, 120), (71.6, 50, 120), (0.0, 10, 12), (100.0, 5, 7),
+               (12.5, 1, 40), (33.3, 1, 120)]
+
+    start, stop = table.candidate_ranges(
+        [q[0] for q in queries], [q[1] for q in queries], [q[2] for q in queries]
+    )
+
+    for (percent, lo, hi), a, b in zip(queries, start, stop):
+        got = sorted(zip(table.num[a:b].tolist(), table.denom[a:b].tolist()))
+        assert got == sorted(_brute_force(percent, lo, hi))
+
+
+def test_truncation_rule_differs_from_rounding():
+    # 2/3 = 66.666...%: rounds to 66.7, truncates to 66.6
+    rounded = RationalTable.build(3, "round")
+    truncated = RationalTable.build(3, "trunc")
+
+    assert rounded.resolve([66.7], 3, 3)["count"].tolist() == [2]
+    assert truncated.resolve([66.6], 3, 3)["count"].tolist() == [2]
+    assert not truncated.resolve([66.7], 3, 3)["resolved"].any()
+
+
+def test_resolve_picks_nearest_denominator_and_flags_ambiguity():
+    out = recover_counts([50.0, 50.0, 12.3, np.nan], 2, [10, 10, 10, 10],
+                         expected_denom=[6, 7, 5, 5])
+
+    assert out["count"].iloc[0] == 3 and out["denom"].iloc[0] == 6
+    assert out["denom"].iloc[1] == 6  # ties go to the smaller denominator
+    assert out["ambiguous"].iloc[0] and out["n_candidates"].iloc[0] == 5
+    assert not out["resolved"].iloc[2] and out["count"].isna().iloc[2]
+    assert not out["resolved"].iloc[3]
+
+
+def test_infer_postsec_counts_lags_grade12_enrollment():
+    matric = pd.DataFrame({
+        "end_year": [2014, 2014],
+        "county_code": ["13", "13"],
+        "district_code": ["3570", "3570"],
+        "school_code": ["057", "058"],
+        "subgroup": ["total population", "total population"],
+        "enroll_any": [round(150 / 220 * 100, 1), 60.0],
+        "enroll_4yr": [round(100 / 150 * 100, 1), 50.0],
+    })
+    enr = pd.DataFrame({
+        "end_year": [2013, 2013, 2014],
+        "county_id": ["13", "13", "13"],
+        "district_id": ["3570", "3570", "3570"],
+        "school_id": ["057", "057", "058"],
+        "grade_level": ["12", "11", "12"],
+        "subgroup": "total_enrollment",
+        "n_students": [220, 400, 90],
+    })
+
+    out = infer_postsec_counts(matric, enr, tolerance=0.0)
+
+    assert out["grade12_enr"].iloc[0] == 220
+    assert out["enroll_any_count"].iloc[0] == 150
+    assert out["enroll_4yr_count"].iloc[0] == 100
+    assert not out["enroll_any_ambiguous"].iloc[0]
+    assert out["enroll_any_count"].isna().iloc[1]
@@ -0,0 +1,114 @@
+"""Tests for vectorized graduation-rate recovery and validation."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from njschooldata.recover_graduation import (
+    grate_validation_summary,
+    recover_suppressed_grate,
+    validate_grate_aggregation,
+)
+
+
+@pytest.fixture
+def panel():
+    rng = np.random.default_rng(4)
+    rows = []
+    for year in (2019, 2020):
+        for d in range(30):
+            for subgroup in ("total population", "white", "hispanic"):
+                district_rate = rng.uniform(0.6, 1) if rng.random() > 0.3 else np.nan
+                rows.append({
+                    "end_year": year, "district_id": f"{d:04d}",
+                    "district_name": f"District {d}", "school_id": "999",
+                    "school_name": "District Total", "subgroup": subgroup,
+                    "is_district": True, "is_school": False,
+                    "grad_rate": district_rate, "cohort_count": 300.0,
+                })
+                for s in range(rng.integers(0, 4)):
+                    rows.append({
+                        "end_year": year, "district_id": f"{d:04d}",
+                        "district_name": f"District {d}", "school_id": f"{s:03d}",
+                        "school_name": f"School {s}", "subgroup": subgroup,
+                        "is_district": False, "is_school": True,
+                        "grad_rate": rng.uniform(0.5, 1) if rng.random() > 0.1 else np.nan,
+                        "cohort_count": float(rng.integers(1, 40)) if rng.random() > 0.1 else np.nan,
+                    })
+    return pd.DataFrame(rows)
+
+
+def _r_weighted_mean(g):
+    """stats::weighted.mean(grad_rate, cohort_count, na.rm = TRUE) semantics."""
+    if g["cohort_count"].isna().all():
+        return g["grad_rate"].mean()
+    if g["cohort_count"].isna().any():
+        return np.nan
+    return (g["grad_rate"] * g["cohort_count"]).sum() / g["cohort_count"].sum()
+
+
+def _expected_school_aggs(panel):
+    schools = panel[panel["is_school"] & panel["grad_rate"].notna()]
+    grouped = schools.groupby(["end_year", "district_id", "subgroup"])
+    return pd.DataFrame({
+        "n": grouped.size(),
+        "cohort": grouped["cohort_count"].sum(),
+        "rate": grouped.apply(_r_weighted_mean, include_groups=False),
+    })
+
+
+def test_recovered_rates_match_grouped_reference(panel):
+    result = recover_suppressed_grate(panel, min_cohort=10)
+    expected = _expected_school_aggs(panel)
+    expected = expected[(expected["cohort"] >= 10) & expected["rate"].notna()]
+
+    out = result.data
+    suppressed = out[out["is_district"] & out["grad_rate_original"].isna()]
+    for _, row in suppressed.iterrows():
+        key = (row["end_year"], row["district_id"], row["subgroup"])
+        if key in expected.index:
+            assert row["grad_rate_recovered"]
+            assert row["grad_rate"] == pytest.approx(expected.loc[key, "rate"], rel=1e-12)
+            assert row["recovered_n_schools"] == expected.loc[key, "n"]
+        else:
+            assert not row["grad_rate_recovered"] and np.isnan(row["grad_rate"])
+
+    assert len(result.records) == out["grad_rate_recovered"].sum() > 0
+    first = result.records.iloc[0]
+    assert len(first["school_ids"]) == first["n_schools"]
+    assert not out.loc[~out["is_district"], "grad_rate_recovered"].any()
+
+
+def test_missing_cohort_among_schools_blocks_recovery():
+    df = pd.DataFrame({
+        "end_year": 2020, "district_id": "0001", "subgroup": "white",
+        "school_id": ["999", "001", "002"],
+        "is_district": [True, False, False], "is_school": [False, True, True],
+        "grad_rate": [np.nan, 0.8, 0.9], "cohort_count": [np.nan, 20.0, np.nan],
+    })
+
+    assert not recover_suppressed_grate(df).data["grad_rate_recovered"].any()
+
+
+def test_validation_flags_and_summary(panel):
+    validation = validate_grate_aggregation(panel, tolerance=2)
+    data = validation.data
+    districts = data[data["is_district"]]
+
+    assert data.loc[~data["is_district"], "aggregation_flag"].isna().all()
+    assert set(districts["aggregation_flag"]) <= {
+        "OK", "DISCREPANCY", "RECOVERABLE", "MISSING_SCHOOL_DATA", "SUPPRESSED"
+    }
+    disc = validation.discrepancies["rate_discrepancy_pp"].abs()
+    assert (disc > 2).all() and disc.is_monotonic_decreasing
+
+    summary = grate_validation_summary(validation)
+    assert summary["total_records"].sum() == len(districts)
+    assert summary["discrepancies"].sum() == len(validation.discrepancies)
+
+
+def test_missing_columns_are_reported():
+    with pytest.raises(ValueError, match="is_school"):
+        recover_suppressed_grate(pd.DataFrame(columns=[
+            "district_id", "school_id", "subgroup", "grad_rate", "end_year", "is_district",
+        ]))
@@ -0,0 +1,74 @@
+"""Tests for single-flight de-duplication of R calls."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from njschooldata import _r_bridge
+
+
+@pytest.fixture(autouse=True)
+def _no_rpy2(monkeypatch):
+    monkeypatch.setattr(_r_bridge, "_require_rpy2", lambda: None)
+    _r_bridge.reset_single_flight_stats()
+
+
+def _wait_for_coalesced(count, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while _r_bridge.single_flight_stats()["frames"]["coalesced"] < count:
+        if time.monotonic() > deadline:
+            raise AssertionError("callers did not join the in-flight call")
+        time.sleep(0.001)
+
+
+def test_concurrent_identical_calls_share_one_execution():
+    executions = []
+
+    @_r_bridge.r_to_pandas
+    def fetch_fake(end_year, tidy=False):
+        executions.append(end_year)
+        _wait_for_coalesced(7)
+        return pd.DataFrame({"end_year": [end_year], "tidy": [tidy]})
+
+    calls = [((2024,), {"tidy": True})] * 4 + [((), {"end_year": 2024, "tidy": True})] * 4
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda c: fetch_fake(*c[0], **c[1]), calls))
+
+    assert executions == [2024]
+    assert all(r.equals(results[0]) for r in results)
+    assert len({id(r) for r in results}) == len(results)
+    stats = _r_bridge.single_flight_stats()["frames"]
+    assert stats == {"executed": 1, "coalesced": 7, "bypassed": 0, "in_flight": 0}
+
+
+def test_errors_propagate_to_waiters_and_are_not_cached():
+    release = threading.Event()
+    attempts = []
+
+    @_r_bridge.r_to_pandas
+    def fetch_failing(end_year):
+        attempts.append(end_year)
+        release.wait(5)
+        raise RuntimeError("source unavailable")
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(fetch_failing, 2025) for _ in range(3)]
+        _wait_for_coalesced(2)
+        release.set()
+        for future in futures:
+            with pytest.raises(RuntimeError, match="source unavailable"):
+                future.result()
+
+    with pytest.raises(RuntimeError):
+        fetch_failing(2025)
+    assert len(attempts) == 2
+
+
+def test_distinct_and_unhashable_arguments_do_not_coalesce():
+    key = _r_bridge._flight_key
+    assert key("fetch_enr", (2024,), {"tidy": True}) != key("fetch_enr", (2024,), {"tidy": 1})
+    assert key("fetch_ell_multi", ([2024, 2025],), {}) == key("fetch_ell_multi", ([2024, 2025],), {})
+    assert key("fetch_enr", (pd.DataFrame(),), {}) is None
@@ -0,0 +1,65 @@
+"""Tests for compiled subgroup recodes."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from njschooldata.subgroups import (
+    add_subgroup_std,
+    recode_subgroups,
+    standardize_subgroup,
+    subgroup_recode,
+)
+
+
+def test_cleaners_match_case_when_rules():
+    spr = recode_subgroups(["Statewide", "Hispanic/Latino", "Students with Disability", None], "spr")
+    assert spr.tolist()[:3] == ["total population", "hispanic/latino", "students with disabilities"]
+    assert pd.isna(spr.iloc[3])
+
+    parcc = recode_subgroups(
+        ["NON-ECON. DISADVANTAGED", "Grade - Other", "Black or African American", "FEMALE"],
+        "parcc",
+    )
+    assert parcc.tolist() == ["non_ed", "grade_other", "black", "female"]
+
+    sped = recode_subgroups(["Non-Englishh Learner", "Districtwide", "Unlisted"], "sped_placement")
+    assert sped.tolist() == ["non_lep", "total", "Unlisted"]
+
+
+def test_categorical_input_recodes_categories_only():
+    raw = pd.Series(
+        pd.Categorical(["total population", "american indian", "male"] * 1000),
+        index=np.arange(3000) + 10,
+        name="subgroup",
+    )
+    out = recode_subgroups(raw, "absence")
+
+    expected = raw.astype(str).map({"total population": "total", "american indian": "native_american"})
+    expected = expected.fillna(raw.astype(str))
+    assert out.index.equals(raw.index)
+    assert out.astype(str).equals(expected)
+    assert set(out.cat.categories) == {"total", "native_american", "male"}
+
+
+def test_standardize_subgroup_warns_unmatched_and_maps_no_equivalent_to_missing():
+    with pytest.warns(UserWarning, match="Unmatched subgroup value\\(s\\): martian, venusian"):
+        out = standardize_subgroup(["ed", "grade_06", "martian", None, "venusian", "martian"])
+    assert out.iloc[0] == "econ_disadv"
+    assert out.iloc[1:].isna().all()
+
+
+def test_add_subgroup_std_inserts_after_subgroup():
+    df = pd.DataFrame({
+        "end_year": [2024, 2024],
+        "subgroup": ["total_population", "lep_current"],
+        "subgroup_std": ["stale", "stale"],
+        "value": [1.0, 2.0],
+    })
+    out = add_subgroup_std(df)
+
+    assert list(out.columns) == ["end_year", "subgroup", "subgroup_std", "value"]
+    assert out["subgroup_std"].tolist() == ["total_enrollment", "lep_current"]
+    assert add_subgroup_std(df[["value"]]).equals(df[["value"]])
+    with pytest.raises(ValueError, match="Unknown subgroup recode"):
+        subgroup_recode("nope")
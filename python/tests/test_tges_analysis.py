@@ -0,0 +1,240 @@
+"""Tests for the vectorized TGES analysis engines."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("scipy")
+
+from njschooldata.tges_analysis import (
+    TgesPeerIndex,
+    fdh_efficiency,
+    tges_convergence,
+    tges_frontier,
+    tges_peer_index,
+    tges_real_growth,
+)
+
+
+@pytest.fixture
+def features():
+    rng = np.random.default_rng(11)
+    n = 60
+    return pd.DataFrame({
+        "district_id": [f"{i:04d}" for i in range(n)],
+        "district_name": [f"District {i}" for i in range(n)],
+        "county_name": "Essex",
+        "group": "K-12",
+        "dfg": rng.choice(["A", "B", "I", "J"], n),
+        "end_year": 2024,
+        "ade": rng.lognormal(8, 1, n),
+        "budgetary_pp": rng.normal(18000, 2500, n),
+        "classroom_share": rng.normal(0.55, 0.05, n),
+        "administration_share": rng.normal(0.1, 0.02, n),
+        "local_share": rng.uniform(0.2, 0.9, n),
+        "state_share": rng.uniform(0.05, 0.7, n),
+    })
+
+
+def _brute_force(features, focal, n):
+    cols = ["ade", "budgetary_pp", "classroom_share", "administration_share",
+            "local_share", "state_share"]
+    fmat = features[cols].copy()
+    fmat["ade"] = np.log(fmat["ade"])
+    z = (fmat - fmat.mean()) / fmat.std(ddof=1)
+    focal_row = features.index[features["district_id"] == focal][0]
+    distance = np.sqrt(((z - z.loc[focal_row]) ** 2).sum(axis=1))
+    return distance.sort_values(kind="stable").head(n + 1)
+
+
+def test_batched_peers_match_brute_force_distances(features):
+    index = TgesPeerIndex.build(features)
+    peers = index.find_peers(n=5)
+
+    assert len(peers) == len(features) * 6
+    for focal in ("0000", "0017", "0059"):
+        got = peers[peers["focal_district_id"] == focal]
+        expected = _brute_force(features, focal, 5)
+        assert got["is_focal"].iloc[0]
+        assert got["district_id"].iloc[0] == focal
+        np.testing.assert_allclose(got["distance"], np.round(expected, 4))
+
+
+def test_incomplete_focal_district_is_rejected(features):
+    features.loc[3, "local_share"] = np.nan
+    index = TgesPeerIndex.build(features)
+
+    with pytest.raises(ValueError, match="0003"):
+        index.find_peers(["0003"])
+
+
+def test_zero_variance_feature_is_dropped_with_warning(features):
+    features["state_share"] = 0.4
+
+    with pytest.warns(UserWarning, match="state_share"):
+        index = TgesPeerIndex.build(features)
+    assert "state_share" not in index.features
+
+
+def test_dfg_rank_feature_and_cache(features):
+    cols = ("budgetary_pp", "dfg_rank")
+    index = tges_peer_index(features, features=cols)
+
+    assert tges_peer_index(features, features=cols) is index
+    assert index.features == cols
+
+
+def test_peer_index_cache_keys_on_row_order_and_column_names(features):
+    cols = ("budgetary_pp", "dfg_rank")
+    index = tges_peer_index(features, features=cols)
+
+    reordered = features.iloc[::-1].reset_index(drop=True)
+    assert tges_peer_index(reordered, features=cols) is not index
+    renamed = features.rename(columns={"county_name": "county"})
+    assert tges_peer_index(renamed, features=cols) is not index
+
+
+def test_peer_index_cache_is_bounded(features, monkeypatch):
+    from njschooldata import tges_analysis
+
+    monkeypatch.setattr(tges_analysis, "_PEER_INDEX_CACHE", tges_analysis.OrderedDict())
+    monkeypatch.setattr(tges_analysis, "_PEER_INDEX_CACHE_SIZE", 2)
+    first = tges_peer_index(features, features=("ade",))
+    tges_peer_index(features, features=("budgetary_pp",))
+    assert tges_peer_index(features, features=("ade",)) is first
+    tges_peer_index(features, features=("local_share",))
+
+    assert [key[1] for key in tges_analysis._PEER_INDEX_CACHE] == [
+        ("ade",), ("local_share",),
+    ]
+
+
+def _r_fdh_group(spend, outcome):
+    """Line-for-line port of R's .tges_fdh_group() loop."""
+    ok = np.isfinite(spend) & np.isfinite(outcome) & (spend > 0)
+    score = np.full(len(spend), np.nan)
+    ref = np.full(len(spend), -1)
+    for i in np.flatnonzero(ok):
+        cand = np.flatnonzero(ok & (outcome >= outcome[i]))
+        best = cand[np.argmin(spend[cand])]
+        score[i] = spend[best] / spend[i]
+        ref[i] = best
+    return score, ref
+
+
+def test_sweep_frontier_matches_pairwise_definition():
+    rng = np.random.default_rng(5)
+    n = 400
+    spend = rng.integers(12, 30, n).astype(float) * 1000
+    outcome = rng.integers(0, 20, n).astype(float)
+    spend[[3, 9]] = [np.nan, -1.0]
+    outcome[17] = np.nan
+    groups = rng.integers(0, 4, n)
+
+    score, ref = fdh_efficiency(spend, outcome, groups)
+
+    for group in range(4):
+        rows = np.flatnonzero(groups == group)
+        expected_score, expected_ref = _r_fdh_group(spend[rows], outcome[rows])
+        np.testing.assert_allclose(score[rows], expected_score)
+        got_ref = np.where(ref[rows] >= 0, np.searchsorted(rows, ref[rows]), -1)
+        np.testing.assert_array_equal(got_ref, expected_ref)
+
+
+def test_multidimensional_frontier_uses_radial_dominance():
+    inputs = np.array([[10.0, 5.0], [8.0, 4.0], [20.0, 1.0]])
+    outputs = np.array([[1.0], [2.0], [1.0]])
+
+    score, ref = fdh_efficiency(inputs, outputs)
+
+    np.testing.assert_allclose(score, [0.8, 1.0, 1.0])
+    np.testing.assert_array_equal(ref, [1, 1, 2])
+
+
+def test_tges_frontier_reports_reference_districts():
+    spend = pd.DataFrame({
+        "district_id": ["0001", "0002", "0003", "00NA"],
+        "district_name": ["A", "B", "C", "Group average"],
+        "group": "K-12",
+        "end_year": 2023,
+        "Per Pupil costs": [20000, 15000, 18000, 17000],
+    })
+    outcome = pd.DataFrame({
+        "district_id": ["0001", "0002", "0003"],
+        "end_year": 2023,
+        "grad_rate_percentile": [50.0, 60.0, 90.0],
+    })
+
+    fr = tges_frontier(spend, outcome, "grad_rate_percentile").set_index("district_id")
+
+    assert "00NA" not in fr.index
+    assert fr.loc["0001", "efficiency_score"] == 0.75
+    assert fr.loc["0001", "reference_district_name"] == "B"
+    assert fr.loc["0001", "excess_spend"] == 5000
+    assert fr.loc["0003", "on_frontier"]
+
+
+@pytest.fixture
+def csg1_panel():
+    rng = np.random.default_rng(3)
+    rows = []
+    for i in range(90):
+        group = ["K-12 A", "K-12 B", "K-8"][i % 3]
+        start = rng.lognormal(9.7, 0.15)
+        for year in (2015, 2024):
+            grown = start * np.exp(rng.normal(0.03, 0.01) * (year - 2015))
+            rows.append({
+                "district_id": f"{i:04d}", "district_name": f"D{i}",
+                "group": group, "end_year": year, "calc_type": "Budgeted",
+                "Per Pupil costs": start if year == 2015 else grown,
+                "Classroom Instruction": 0.55 * (start if year == 2015 else grown),
+            })
+    rows.append({**rows[0], "calc_type": "Actuals", "Per Pupil costs": 1.0})
+    return pd.DataFrame(rows)
+
+
+def test_batched_convergence_matches_per_group_regression(csg1_panel):
+    from scipy import stats
+
+    conv = tges_convergence(
+        csg1_panel, metric_col=["Per Pupil costs", "Classroom Instruction"]
+    )
+
+    assert len(conv) == 180
+    for (metric, group), d in conv.groupby(["metric", "peer_group"]):
+        fit = stats.linregress(d["log_start_value"], d["growth"])
+        assert d["beta"].iloc[0] == pytest.approx(fit.slope)
+        assert d["beta_pvalue"].iloc[0] == pytest.approx(fit.pvalue)
+        assert d["r_squared"].iloc[0] == pytest.approx(fit.rvalue ** 2)
+        assert (d["n_districts"] == 30).all()
+
+
+def test_small_groups_get_no_beta(csg1_panel):
+    small = csg1_panel[csg1_panel["district_id"].isin(["0000", "0003", "0006"])]
+
+    conv = tges_convergence(small)
+
+    assert conv["beta"].isna().all()
+    assert not conv["converging"].any()
+
+
+def test_real_growth_decomposition_and_deflator():
+    aa = pd.DataFrame({
+        "district_id": ["0001", "0001", "0001", "0002", "0002"],
+        "end_year": [2020, 2021, 2021, 2020, 2021],
+        "Total Expenditures, actual costs": [100.0, 110.0, 999.0, 50.0, 50.0],
+        "Average Daily Enrollment plus Sent Pupils": [10.0, 8.0, 1.0, 5.0, 5.0],
+    })
+    cpi = pd.DataFrame({"end_year": [2020, 2021], "price_index": [100.0, 110.0]})
+
+    rg = tges_real_growth(aa, deflator=cpi).set_index(["district_id", "end_year"])
+
+    row = rg.loc[("0001", 2021)]
+    assert row["total_exp_growth"] == pytest.approx(0.1)
+    assert row["enrollment_component"] == pytest.approx(-np.log(0.8))
+    assert row["real_cost_component"] + row["enrollment_component"] == pytest.approx(
+        np.log(13.75 / 10)
+    )
+    assert row["real_pp_growth"] == pytest.approx(0.25)
+    assert np.isnan(rg.loc[("0002", 2020), "ade_growth"])
+    assert np.isnan(rg.loc[("0002", 2021), "enrollment_effect_share"])
@@ -0,0 +1,165 @@
+"""Tests for OpenTelemetry-compatible fetch pipeline spans."""
+
+import contextlib
+import io
+import json
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from njschooldata import _r_bridge, tracing
+
+
+class _ListExporter:
+    def __init__(self):
+        self.traces = []
+
+    def export(self, spans):
+        self.traces.append(list(spans))
+
+
+class _FakePackage:
+    """Emits the events R's trace hook would send for a fetch."""
+
+    @staticmethod
+    def fetch_enr(end_year, tidy=False):
+        tracing.on_r_event("start", "download_source", {"url": "https://www.nj.gov/enr.zip"})
+        tracing.on_r_event("annotate", None, {"retries": 1})
+        tracing.on_r_event(
+            "end", "download_source",
+            {"source_status": "actual", "bytes": 2048.0, "digest": "ab12"},
+        )
+        tracing.on_r_event("start", "tidy", {"end_year": end_year})
+        if end_year < 2000:
+            tracing.on_r_event("end", "tidy", {"error": "no tidy layout"})
+            raise RuntimeError("R error: no tidy layout")
+        tracing.on_r_event("end", "tidy", {"rows": 3})
+        df = pd.DataFrame({"end_year": [end_year] * 3})
+        df.attrs["source_results"] = pd.DataFrame(
+            {"source_status": ["actual", "not_published"]}
+        )
+        return df
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    monkeypatch.setattr(_r_bridge, "_require_rpy2", lambda: None)
+    monkeypatch.setattr(_r_bridge, "_get_r_package", lambda: _FakePackage)
+    monkeypatch.setattr(_r_bridge, "_python_to_r", lambda value: value)
+    monkeypatch.setattr(tracing, "install_r_hook", lambda: None)
+    exporter = _ListExporter()
+    previous = tracing.configure_tracing(exporter)
+    yield exporter
+    tracing.configure_tracing(previous)
+
+
+@_r_bridge.r_to_pandas
+def fetch_fake(end_year, tidy=False):
+    return _r_bridge.call_r_function("fetch_enr", end_year, tidy=tidy)
+
+
+def test_fetch_records_nested_spans_with_source_status(exporter):
+    fetch_fake(2024, tidy=True)
+
+    (spans,) = exporter.traces
+    root, call, download, tidy = spans
+    assert [s.name for s in spans] == [
+        "fetch_fake", "call_r_function", "R::download_source", "R::tidy",
+    ]
+    assert len({s.trace_id for s in spans}) == 1
+    assert root.parent_span_id is None
+    assert call.parent_span_id == root.span_id
+    assert download.parent_span_id == tidy.parent_span_id == call.span_id
+    assert root.attributes["njsd.source_status"] == "not_published"
+    assert root.attributes["njsd.source_count"] == 2
+    assert root.attributes["njsd.arguments"] == "2024, tidy=True"
+    assert call.attributes["njsd.function"] == "fetch_enr"
+    assert download.attributes == {
+        "njsd.url": "https://www.nj.gov/enr.zip",
+        "njsd.retries": 1,
+        "njsd.source_status": "actual",
+        "njsd.bytes": 2048.0,
+        "njsd.digest": "ab12",
+    }
+    assert {s.status_code for s in spans} == {"OK"}
+    assert all(s.start_time_unix_nano <= s.end_time_unix_nano for s in spans)
+    assert tracing.current_span() is None
+
+
+def test_errors_mark_spans_and_still_export(exporter):
+    with pytest.raises(RuntimeError, match="no tidy layout"):
+        fetch_fake(1999)
+
+    (spans,) = exporter.traces
+    status = {s.name: (s.status_code, s.status_message) for s in spans}
+    assert status["R::tidy"] == ("ERROR", "no tidy layout")
+    assert status["fetch_fake"] == ("ERROR", "RuntimeError: R error: no tidy layout")
+    assert status["R::download_source"][0] == "OK"
+    assert tracing.current_span() is None
+
+
+def test_tracing_off_records_nothing(exporter):
+    tracing.configure_tracing(None)
+    fetch_fake(2024)
+    tracing.on_r_event("start", "download_source", {})
+    assert exporter.traces == []
+    assert tracing.current_span() is None
+
+
+def test_conversion_span_wraps_r_to_pandas_conversion(exporter, monkeypatch):
+    monkeypatch.setattr(_r_bridge, "ro", SimpleNamespace(default_converter=0))
+    monkeypatch.setattr(_r_bridge, "pandas2ri", SimpleNamespace(converter=0))
+    monkeypatch.setattr(_r_bridge, "localconverter", lambda _: contextlib.nullcontext())
+    r_frame = SimpleNamespace(to_pandas=lambda: pd.DataFrame({"x": [1]}))
+
+    @_r_bridge.r_to_pandas
+    def fetch_r_frame():
+        return r_frame
+
+    fetch_r_frame()
+    (spans,) = exporter.traces
+    assert [s.name for s in spans] == ["fetch_r_frame", "conversion"]
+    assert spans[0].attributes["njsd.rows"] == 1
+
+
+def test_file_exporter_writes_otlp_json_lines(exporter, tmp_path):
+    path = tmp_path / "traces" / "spans.jsonl"
+    tracing.configure_tracing(tracing.FileExporter(str(path)))
+    fetch_fake(2024)
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [r["name"] for r in records][:2] == ["fetch_fake", "call_r_function"]
+    assert records[0]["parentSpanId"] == ""
+    assert records[1]["parentSpanId"] == records[0]["spanId"]
+    assert records[0]["status"] == {"code": "STATUS_CODE_OK"}
+    assert {"key": "njsd.retries", "value": {"intValue": "1"}} in records[2]["attributes"]
+
+
+def test_console_exporter_indents_the_tree(exporter):
+    stream = io.StringIO()
+    tracing.configure_tracing(tracing.ConsoleExporter(stream))
+    fetch_fake(2024)
+    lines = stream.getvalue().splitlines()
+    assert lines[0].startswith("fetch_fake ")
+    assert lines[1].startswith("  call_r_function ")
+    assert lines[2].startswith("    R::download_source ")
+
+
+def test_environment_selects_exporter(monkeypatch, tmp_path):
+    monkeypatch.setattr(tracing, "_exporter", None)
+    monkeypatch.setattr(tracing, "_configured", False)
+    monkeypatch.setenv("NJSD_TRACE", "file")
+    monkeypatch.setenv("NJSD_TRACE_FILE", str(tmp_path / "t.jsonl"))
+    exporter = tracing.tracing_exporter()
+    assert isinstance(exporter, tracing.FileExporter)
+    assert exporter.path == tmp_path / "t.jsonl"
+    monkeypatch.setattr(tracing, "_configured", False)
+    monkeypatch.setenv("NJSD_TRACE", "")
+    assert tracing.tracing_exporter() is None
+
+
+def test_worst_source_status_follows_r_priority():
+    frame = pd.DataFrame({"source_status": ["actual", "parse_error", "not_published"]})
+    assert tracing.worst_source_status(frame) == "parse_error"
+    assert tracing.worst_source_status(None) is None
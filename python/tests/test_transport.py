@@ -0,0 +1,159 @@
+"""Tests for the conditional-request transport against a local HTTP server."""
+
+import hashlib
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from njschooldata.transport import ConditionalTransport, ConnectionPool
+
+
+class _Source:
+    """Mutable stand-in for NJ DOE files served by the test server."""
+
+    def __init__(self):
+        self.files = {}
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.body_bytes = 0
+        self.peers = set()
+
+    def put(self, path, body, etag=True, modified=1_700_000_000):
+        self.files[path] = {
+            "body": body,
+            "etag": f'"{hashlib.sha256(body).hexdigest()[:16]}"' if etag else None,
+            "last_modified": formatdate(modified, usegmt=True),
+        }
+
+
+def _handler(source):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            with source.lock:
+                source.requests += 1
+                source.peers.add(self.client_address)
+            if self.path.startswith("/nowhere/"):
+                self.send_response(302)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            if self.path.startswith("/moved/"):
+                self.send_response(302)
+                self.send_header("Location", "/" + self.path.split("/", 2)[2])
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            entry = source.files.get(self.path)
+            if entry is None:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            etag = entry["etag"]
+            fresh = (
+                self.headers.get("If-None-Match") == etag if etag
+                else self.headers.get("If-Modified-Since") == entry["last_modified"]
+            )
+            if fresh:
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/zip")
+            self.send_header("Content-Length", str(len(entry["body"])))
+            if etag:
+                self.send_header("ETag", etag)
+            self.send_header("Last-Modified", entry["last_modified"])
+            self.end_headers()
+            self.wfile.write(entry["body"])
+            with source.lock:
+                source.body_bytes += len(entry["body"])
+
+    return Handler
+
+
+@pytest.fixture
+def server():
+    source = _Source()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _handler(source))
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    source.base = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield source
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_etag_revalidation_reuses_body_over_one_connection(server, tmp_path):
+    server.put("/enr.zip", b"PK" + b"x" * 5000)
+    transport = ConditionalTransport(tmp_path / "state")
+    url = server.base + "/enr.zip"
+
+    first = transport.request(url, tmp_path / "first.zip")
+    second = transport.request(url, tmp_path / "second.zip")
+
+    assert (first.status_code, first.not_modified) == (200, False)
+    assert (second.status_code, second.not_modified) == (304, True)
+    assert (tmp_path / "second.zip").read_bytes() == b"PK" + b"x" * 5000
+    assert second.content_type == "application/zip"
+    assert server.body_bytes == 5002
+    assert len(server.peers) == 1
+    assert transport.stats()["connections_reused"] == 1
+
+    server.put("/enr.zip", b"PK-updated")
+    third = transport.request(url, tmp_path / "third.zip")
+    assert (third.status_code, third.bytes_received) == (200, 10)
+    assert (tmp_path / "third.zip").read_bytes() == b"PK-updated"
+
+
+def test_last_modified_redirects_and_errors(server, tmp_path):
+    server.put("/dir.csv", b"a,b\n1,2\n", etag=False)
+    transport = ConditionalTransport(tmp_path / "state")
+    url = server.base + "/moved/dir.csv"
+
+    first = transport.request(url, tmp_path / "a.csv")
+    second = transport.request(url, tmp_path / "b.csv")
+    missing = transport.request(server.base + "/missing.csv", tmp_path / "c.csv")
+
+    assert first.final_url == server.base + "/dir.csv"
+    assert second.not_modified and second.final_url == first.final_url
+    assert missing.status_code == 404
+    assert not (tmp_path / "c.csv").exists()
+
+
+def test_redirect_without_location_releases_its_connection_once(server, tmp_path):
+    transport = ConditionalTransport(tmp_path / "state")
+
+    response = transport.request(server.base + "/nowhere/dir.csv", tmp_path / "a.csv")
+
+    assert response.status_code == 302
+    assert not (tmp_path / "a.csv").exists()
+    (idle,) = transport.pool._idle.values()
+    assert len(idle) == 1
+
+
+def test_nightly_sweep_transfers_only_changed_sources(server, tmp_path):
+    urls = []
+    for i in range(120):
+        server.put(f"/source/{i}.xlsx", b"PK" + bytes([i % 256]) * 2048)
+        urls.append(f"{server.base}/source/{i}.xlsx")
+    transport = ConditionalTransport(tmp_path / "state", pool=ConnectionPool(max_idle_per_host=8))
+
+    initial = transport.revalidate(urls, max_workers=8)
+    sent_initially = server.body_bytes
+    server.put("/source/7.xlsx", b"PK-new")
+    nightly = transport.revalidate(urls, max_workers=8)
+
+    assert initial["status_code"].eq(200).all()
+    assert nightly["not_modified"].sum() == 119
+    assert nightly.loc[nightly["url"].str.endswith("/7.xlsx"), "bytes_received"].item() == 6
+    assert server.body_bytes - sent_initially == 6
+    assert transport.stats()["connections_opened"] <= 16
+    assert nightly["error"].isna().all()
@@ -0,0 +1,265 @@
+"""Scheduler checks for the live-validation runner against local stand-in hosts."""
+
+from __future__ import annotations
+
+import hashlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import importlib.util
+import json
+from pathlib import Path
+import sys
+import threading
+import time
+
+import pytest
+
+
+PACKAGE_ROOT = Path(__file__).resolve().parents[1]
+MODULE_PATH = PACKAGE_ROOT / "tools" / "live-validation" / "run.py"
+PASSING = {"production_parse": True, "goldens": True, "invariants": True}
+
+
+def _load_module():
+    spec = importlib.util.spec_from_file_location("_live_validation_run", MODULE_PATH)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    # Dataclasses resolve their annotations through sys.modules.
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class _Host:
+    """A stand-in source host that records how many requests overlap."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.files: dict[str, bytes] = {}
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = 0
+
+    def handler(self):
+        host = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with host.lock:
+                    host.in_flight += 1
+                    host.requests += 1
+                    host.max_in_flight = max(host.max_in_flight, host.in_flight)
+                time.sleep(host.latency)
+                with host.lock:
+                    host.in_flight -= 1
+                if self.path.startswith("/stall/"):
+                    # Promise a body, send part of it, then stall past the timeout.
+                    self.send_response(200)
+                    self.send_header("Content-Length", "1024")
+                    self.end_headers()
+                    self.wfile.write(b"PK")
+                    self.wfile.flush()
+                    time.sleep(1.0)
+                    self.close_connection = True
+                    return
+                if self.path.startswith("/moved/"):
+                    self.send_response(301)
+                    self.send_header("Location", "/" + self.path.split("/", 2)[2])
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                body = host.files.get(self.path)
+                self.send_response(200 if body is not None else 404)
+                self.send_header("Content-Type", "application/zip")
+                self.send_header("Content-Length", str(len(body or b"")))
+                self.end_headers()
+                self.wfile.write(body or b"")
+
+        return Handler
+
+
+@pytest.fixture
+def hosts():
+    started = []
+    # Lanes are keyed by host name, so the two stand-ins use different names.
+    for latency, name in ((0.15, "127.0.0.1"), (0.05, "localhost")):
+        host = _Host(latency)
+        server = ThreadingHTTPServer(("127.0.0.1", 0), host.handler())
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        host.base = f"http://{name}:{server.server_address[1]}"
+        started.append((host, server))
+    yield [host for host, _ in started]
+    for _, server in started:
+        server.shutdown()
+        server.server_close()
+
+
+def _artifact(host, name: str, body: bytes, snapshot: bytes | None = None) -> dict:
+    host.files["/" + name] = body
+    return {
+        "artifact_id": name,
+        "source_identity": f"{host.base}/{name}",
+        "tier": "shipped",
+        "checksum": "sha256:" + hashlib.sha256(snapshot or body).hexdigest(),
+        "lineage": {"kind": "source"},
+    }
+
+
+def _plan(module, contract_id, artifacts, budget):
+    return module.ContractPlan(
+        contract_id=contract_id,
+        fingerprint="sha256:" + "1" * 64,
+        mode="local",
+        minimum_delay=0.0,
+        budget=module.Budget(budget),
+        artifacts=artifacts,
+    )
+
+
+def test_hosts_run_concurrently_and_each_host_is_serial(hosts, tmp_path):
+    module = _load_module()
+    slow, fast = hosts
+    plans = [
+        _plan(
+            module,
+            "enrollment",
+            [_artifact(slow, f"enr-{year}.zip", b"PK" + bytes([year % 256]) * 64) for year in range(2019, 2025)]
+            + [_artifact(fast, "enr-directory.csv", b"a,b\n")],
+            budget=10,
+        ),
+        _plan(
+            module,
+            "assessment",
+            [_artifact(fast, f"sla-{grade}.xlsx", b"PK" + bytes([grade]) * 32) for grade in range(3, 9)]
+            + [_artifact(slow, "sla-drift.xlsx", b"PK-new", snapshot=b"PK-old")],
+            budget=10,
+        ),
+    ]
+    streamed = []
+    started = time.perf_counter()
+    events = module.run_sweep(
+        plans,
+        tmp_path / "events",
+        checker=lambda contract_id, artifact, path: PASSING,
+        on_event=lambda value, path: streamed.append(path),
+    )
+    elapsed = time.perf_counter() - started
+
+    assert slow.max_in_flight == 1 and fast.max_in_flight == 1
+    # Seven requests on the slow host dominate; the fast host's run overlaps it.
+    assert elapsed < 7 * slow.latency + 7 * fast.latency * 0.5
+    assert len(events) == 14 and len(streamed) == 14
+    states = {value["artifact_id"]: value["terminal_state"] for value in events}
+    assert states.pop("sla-drift.xlsx") == "validated_content_drift"
+    assert set(states.values()) == {"validated_match"}
+    for path in streamed:
+        value = json.loads(path.read_text(encoding="utf-8"))
+        assert value["execution"]["request_count"] <= value["execution"]["request_budget"]
+    assert [plan.budget.used for plan in plans] == [7, 7]
+
+
+def test_budget_redirects_and_failures_are_terminal_events(hosts, tmp_path):
+    module = _load_module()
+    slow, fast = hosts
+    artifacts = [
+        _artifact(fast, "a.zip", b"PK-a"),
+        dict(_artifact(fast, "b.zip", b"PK-b"), source_identity=f"{fast.base}/moved/b.zip"),
+        dict(_artifact(fast, "c.zip", b"PK-c"), source_identity=f"{fast.base}/missing.zip"),
+        _artifact(fast, "d.zip", b"PK-d"),
+    ]
+    plan = _plan(module, "budgeted", artifacts, budget=4)
+    events = module.run_sweep([plan], tmp_path / "events", checker=lambda *args: PASSING)
+    states = [(value["artifact_id"], value["terminal_state"]) for value in events]
+
+    assert states == [
+        ("a.zip", "validated_match"),
+        ("b.zip", "validated_match"),
+        ("c.zip", "source_unavailable"),
+        ("d.zip", "request_budget_exceeded"),
+    ]
+    assert events[1]["final_url"] == f"{fast.base}/b.zip"
+    assert fast.requests == 4
+    assert "404" in events[2]["failure"]["message"]
+    # Each event counts the contract's requests as of its own last request.
+    assert [value["execution"]["request_count"] for value in events] == [1, 3, 4, 4]
+
+    unchecked = module.run_sweep(
+        [_plan(module, "unchecked", [_artifact(slow, "e.zip", b"PK-e")], budget=1)],
+        tmp_path / "events",
+    )
+    assert unchecked[0]["terminal_state"] == "tooling_unavailable"
+    assert len(list((tmp_path / "events" / "budgeted").glob("*.json"))) == 4
+
+
+def test_lanes_are_keyed_by_host_name_alone(hosts, tmp_path):
+    module = _load_module()
+    assert module._host_key("http://WWW.NJ.gov/a") == module._host_key("https://www.nj.gov:8443/b")
+
+    slow, _ = hosts
+    other_port = _Host(slow.latency)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), other_port.handler())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    other_port.base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        artifacts = [_artifact(slow, f"s{i}.zip", b"PK-s") for i in range(3)] + [
+            _artifact(other_port, f"o{i}.zip", b"PK-o") for i in range(3)
+        ]
+        started = time.perf_counter()
+        events = module.run_sweep(
+            [_plan(module, "one-host", artifacts, budget=6)],
+            tmp_path / "events",
+            checker=lambda *args: PASSING,
+        )
+        elapsed = time.perf_counter() - started
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    # Both ports belong to one host name, so all six requests are serial.
+    assert elapsed >= 6 * slow.latency
+    assert {value["terminal_state"] for value in events} == {"validated_match"}
+
+
+def test_invalid_urls_fail_one_artifact_and_events_are_idempotent(hosts, tmp_path):
+    module = _load_module()
+    _, fast = hosts
+    artifacts = [
+        dict(_artifact(fast, "bad.zip", b"PK"), source_identity=f"{fast.base}/bad name.zip"),
+        _artifact(fast, "good.zip", b"PK-good"),
+    ]
+    events = module.run_sweep(
+        [_plan(module, "invalid", artifacts, budget=2)],
+        tmp_path / "events",
+        checker=lambda *args: PASSING,
+    )
+
+    assert [value["terminal_state"] for value in events] == [
+        "source_unavailable", "validated_match",
+    ]
+    assert events[0]["failure"]["type"] == "InvalidURL"
+    path = module.write_event(tmp_path / "events", events[1])
+    assert module.write_event(tmp_path / "events", events[1]) == path
+    assert json.loads(path.read_text(encoding="utf-8")) == events[1]
+
+
+def test_a_body_stalled_mid_read_does_not_poison_the_lane(hosts, tmp_path):
+    module = _load_module()
+    _, fast = hosts
+    artifacts = [
+        dict(_artifact(fast, "slow.zip", b"PK"), source_identity=f"{fast.base}/stall/slow.zip"),
+        _artifact(fast, "ok.zip", b"PK-ok"),
+    ]
+    plan = _plan(module, "stalled", artifacts, budget=3)
+    events = module.run_sweep([plan], tmp_path / "events", checker=lambda *args: PASSING, timeout=0.5)
+
+    assert [(value["terminal_state"], value.get("failure", {}).get("type")) for value in events] == [
+        ("source_unavailable", "TimeoutError"),
+        ("validated_match", None),
+    ]
+    assert plan.budget.used == 2
@@ -0,0 +1,87 @@
+"""Equivalence checks for the indexed shipped-coverage overlap detector."""
+
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+import random
+
+
+PACKAGE_ROOT = Path(__file__).resolve().parents[1]
+MODULE_PATH = PACKAGE_ROOT / "tools" / "source-validation" / "validate_contract.py"
+
+
+def _load_module():
+    spec = importlib.util.spec_from_file_location("_validate_contract", MODULE_PATH)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _pairwise(module, shipped, requirements):
+    for index, left in enumerate(shipped):
+        for right in shipped[index + 1 :]:
+            if module._coverage_overlaps(
+                left["selectors"], right["selectors"]
+            ) and not (
+                left["artifact_id"] in requirements
+                and right["artifact_id"] in requirements
+            ):
+                return left, right
+    return None
+
+
+def _shipped(generator: random.Random, count: int) -> list[dict]:
+    artifacts = []
+    for number in range(count):
+        selectors = {}
+        for key, choices in (
+            ("domain", ["enr", "spr", "grad"]),
+            ("end_year", [2022, 2023, 2024, "2024"]),
+            ("level", ["state", "district", "school"]),
+        ):
+            roll = generator.random()
+            if roll < 0.2:
+                continue
+            if roll < 0.4:
+                selectors[key] = generator.sample(choices, 2)
+            else:
+                selectors[key] = generator.choice(choices)
+        artifacts.append({"artifact_id": f"artifact-{number}", "selectors": selectors})
+    return artifacts
+
+
+def test_indexed_overlap_matches_the_pairwise_scan():
+    module = _load_module()
+    generator = random.Random(43)
+    for _ in range(400):
+        shipped = _shipped(generator, generator.randrange(2, 9))
+        requirements = {
+            artifact["artifact_id"]: artifact
+            for artifact in shipped
+            if generator.random() < 0.5
+        }
+        assert module._first_coverage_overlap(
+            shipped, requirements
+        ) == _pairwise(module, shipped, requirements)
+
+
+def test_disjoint_large_manifest_has_no_overlap():
+    module = _load_module()
+    shipped = [
+        {
+            "artifact_id": f"{domain}-{year}-{level}",
+            "selectors": {"domain": domain, "end_year": year, "level": level},
+        }
+        for domain in ("enr", "spr", "grad", "sped")
+        for year in range(1990, 2026)
+        for level in ("state", "county", "district", "school")
+    ]
+    assert module._first_coverage_overlap(shipped, {}) is None
+    shipped.append(dict(shipped[5], artifact_id="duplicate"))
+    left, right = module._first_coverage_overlap(shipped, {})
+    assert (left["artifact_id"], right["artifact_id"]) == (
+        shipped[5]["artifact_id"],
+        "duplicate",
+    )
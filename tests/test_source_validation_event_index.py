@@ -0,0 +1,115 @@
+"""Parity checks for the incremental source-validation event index."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+import importlib.util
+import json
+from pathlib import Path
+import random
+
+
+PACKAGE_ROOT = Path(__file__).resolve().parents[1]
+MODULE_PATH = PACKAGE_ROOT / "tools" / "source-validation" / "validate_contract.py"
+FINGERPRINTS = ["sha256:" + str(digit) * 64 for digit in range(3)]
+ARTIFACTS = ["enr-2024", "enr-2025", "spr-2024"]
+NOW = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+
+def _load_module():
+    spec = importlib.util.spec_from_file_location("_validate_contract", MODULE_PATH)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _events(seed: int, count: int) -> list[dict]:
+    generator = random.Random(seed)
+    start = NOW - timedelta(days=200)
+    events = []
+    for number in range(count):
+        # Coarse times so that equal completion times (ties) are common.
+        completed = start + timedelta(hours=generator.randrange(0, 200 * 24, 12))
+        state = generator.choice(
+            ["validated_match", "validated_content_drift", "source_unavailable"]
+        )
+        snapshot = "sha256:" + "a" * 64
+        value = {
+            "event_id": f"sha256:{number:064x}",
+            "artifact_id": generator.choice(ARTIFACTS),
+            "contract_fingerprint": generator.choice(FINGERPRINTS),
+            "completed_at": completed.isoformat().replace("+00:00", "Z"),
+            "terminal_state": state,
+            "observed_checksum": (
+                snapshot if state == "validated_match" else "sha256:" + "b" * 64
+            ),
+            "snapshot_checksum": snapshot,
+        }
+        if events and generator.random() < 0.1:
+            value["supersedes"] = generator.choice(events)["event_id"]
+        events.append(value)
+    return events
+
+
+def _statuses(module, derive):
+    return [
+        module.canonical_bytes(derive(fingerprint, now, required))
+        for fingerprint in FINGERPRINTS
+        for now in (NOW, NOW + timedelta(days=120))
+        for required in (None, ARTIFACTS[:1], ARTIFACTS, ARTIFACTS + ["never-seen"])
+    ]
+
+
+def test_index_status_is_byte_identical_to_derive_status():
+    module = _load_module()
+    for seed in range(25):
+        events = _events(seed, 60)
+        index = module.EventIndex.from_events(events)
+        expected = _statuses(
+            module,
+            lambda fingerprint, now, required: module.derive_status(
+                events, fingerprint, now, required_artifact_ids=required
+            ),
+        )
+        assert _statuses(module, index.status) == expected
+
+
+def test_persisted_index_replays_only_new_event_files(tmp_path):
+    module = _load_module()
+    events = _events(7, 90)
+    events_dir = tmp_path / "events"
+    events_dir.mkdir()
+    index_path = tmp_path / "index" / "events.jsonl"
+    for batch in (events[:40], events[40:75], events[75:]):
+        for value in batch:
+            name = value["event_id"].split(":")[1][-8:] + ".json"
+            (events_dir / name).write_text(json.dumps(value), encoding="utf-8")
+        index = module.EventIndex(index_path)
+        added = index.sync(events_dir)
+        assert len(added) == len(batch)
+
+    ordered = [
+        json.loads(path.read_text(encoding="utf-8"))
+        for path in sorted(events_dir.glob("*.json"))
+    ]
+    reopened = module.EventIndex(index_path)
+    assert reopened.pending(events_dir) == []
+    expected = _statuses(
+        module,
+        lambda fingerprint, now, required: module.derive_status(
+            ordered, fingerprint, now, required_artifact_ids=required
+        ),
+    )
+    assert _statuses(module, reopened.status) == expected
+
+    # A log written past the checkpoint (an interrupted run) is replayed.
+    checkpoint = reopened.checkpoint_path.read_bytes()
+    extra = dict(events[0], event_id="sha256:" + "f" * 64, completed_at="2025-05-31T00:00:00Z")
+    (events_dir / "zzzzzzzz.json").write_text(json.dumps(extra), encoding="utf-8")
+    reopened.sync(events_dir)
+    reopened.checkpoint_path.write_bytes(checkpoint)
+    recovered = module.EventIndex(index_path)
+    assert recovered.status(FINGERPRINTS[0], NOW) == module.derive_status(
+        ordered + [extra], FINGERPRINTS[0], NOW
+    )
@@ -0,0 +1,106 @@
+"""Checks for incremental contract fingerprinting."""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+from pathlib import Path
+import sys
+
+
+PACKAGE_ROOT = Path(__file__).resolve().parents[1]
+TOOLS = PACKAGE_ROOT / "tools" / "source-validation"
+CONTRACT_ID = "synthetic_sources"
+
+
+def _load_module():
+    sys.path.insert(0, str(TOOLS))
+    spec = importlib.util.spec_from_file_location("_fingerprint", TOOLS / "fingerprint.py")
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _age(path: Path) -> None:
+    past = path.stat().st_mtime_ns - 3600 * 1_000_000_000
+    os.utime(path, ns=(past, past))
+
+
+def _package(root: Path, module) -> dict[str, list[str]]:
+    inputs = {
+        "golden": ["../../../fixtures/enrollment-2020.zip", "../../../fixtures/tges-2025.zip"],
+        "parser": ["../../../R/process_enrollment.R"],
+    }
+    spec_root = root / "data-raw" / "source-validation-spec" / CONTRACT_ID
+    contract_root = root / "inst" / "extdata" / "source-contract" / "contracts" / CONTRACT_ID
+    spec_root.mkdir(parents=True)
+    (spec_root / "contract.json").write_text(
+        json.dumps({"fingerprint_inputs": inputs}), encoding="utf-8"
+    )
+    payload = []
+    for category in sorted(inputs):
+        for relative in sorted(inputs[category]):
+            source = (spec_root / relative).resolve()
+            source.parent.mkdir(parents=True, exist_ok=True)
+            source.write_bytes(f"{category}:{relative}".encode() * 1000)
+            _age(source)
+            embedded = contract_root / "fingerprint-inputs" / category / source.name
+            embedded.parent.mkdir(parents=True, exist_ok=True)
+            embedded.write_bytes(source.read_bytes())
+            _age(embedded)
+            payload.append(
+                {
+                    "category": category,
+                    "path": relative,
+                    "checksum": module.FileHasher().checksum(source),
+                }
+            )
+    (contract_root / "release-lock.json").write_text(
+        json.dumps({"contract_fingerprint": module.digest(payload)}), encoding="utf-8"
+    )
+    return inputs
+
+
+def test_fingerprint_matches_lock_and_names_changed_categories(tmp_path):
+    module = _load_module()
+    _package(tmp_path, module)
+    cache = tmp_path / "hashes.json"
+
+    first = module.FileHasher(cache)
+    report = module.fingerprint_report(tmp_path, CONTRACT_ID, first)
+    first.close()
+    assert report["matches_lock"]
+    assert report["changed_categories"] == {}
+    assert report["stale_inputs"] == {}
+    assert report["snapshot_fingerprint"] == report["locked_fingerprint"]
+
+    changed = tmp_path / "fixtures" / "tges-2025.zip"
+    changed.write_bytes(b"PK-updated")
+    _age(changed)
+    second = module.FileHasher(cache)
+    report = module.fingerprint_report(tmp_path, CONTRACT_ID, second)
+    second.close()
+
+    assert not report["matches_lock"]
+    assert report["changed_categories"] == {"golden": ["../../../fixtures/tges-2025.zip"]}
+    hashed = [path for path, timing in second.timings.items() if not timing["cached"]]
+    assert hashed == [str(changed)]
+
+
+def test_stale_embedded_copies_are_not_reported_as_changes(tmp_path):
+    module = _load_module()
+    _package(tmp_path, module)
+    contract_root = tmp_path / "inst" / "extdata" / "source-contract" / "contracts" / CONTRACT_ID
+    (contract_root / "fingerprint-inputs" / "parser" / "process_enrollment.R").write_text(
+        "# old copy\n", encoding="utf-8"
+    )
+
+    hasher = module.FileHasher(None)
+    report = module.fingerprint_report(tmp_path, CONTRACT_ID, hasher)
+    hasher.close()
+
+    assert report["matches_lock"]
+    assert report["changed_categories"] == {}
+    assert report["stale_inputs"] == {"parser": ["../../../R/process_enrollment.R"]}
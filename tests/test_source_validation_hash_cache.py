@@ -0,0 +1,72 @@
+"""Checks for the stat-keyed checksum cache used by verify_package.py."""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import os
+from pathlib import Path
+
+import pytest
+
+
+PACKAGE_ROOT = Path(__file__).resolve().parents[1]
+MODULE_PATH = PACKAGE_ROOT / "tools" / "source-validation" / "verify_package.py"
+
+
+def _load_module():
+    spec = importlib.util.spec_from_file_location("_verify_package", MODULE_PATH)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _write(path: Path, body: bytes, age_seconds: int = 3600) -> None:
+    path.write_bytes(body)
+    past = path.stat().st_mtime_ns - age_seconds * 1_000_000_000
+    os.utime(path, ns=(past, past))
+
+
+def test_unchanged_files_are_served_from_the_cache(tmp_path):
+    module = _load_module()
+    files = [tmp_path / f"artifact-{number}.zip" for number in range(6)]
+    for number, path in enumerate(files):
+        _write(path, b"PK" + bytes([number]) * 100_000)
+    _write(tmp_path / "empty.json", b"")
+    files.append(tmp_path / "empty.json")
+    cache = tmp_path / "cache" / "hashes.json"
+
+    first = module.FileHasher(cache, max_workers=4)
+    first.prefetch(files)
+    checksums = [first.checksum(path) for path in files]
+    first.close()
+    assert checksums == [
+        "sha256:" + hashlib.sha256(path.read_bytes()).hexdigest() for path in files
+    ]
+    assert not any(timing["cached"] for timing in first.timings.values())
+
+    _write(files[2], b"PK-changed")
+    second = module.FileHasher(cache)
+    second.prefetch(files)
+    again = [second.checksum(path) for path in files]
+    second.close()
+    assert again[2] == module.checksum_bytes(b"PK-changed")
+    assert again[:2] + again[3:] == checksums[:2] + checksums[3:]
+    assert [second.timings[str(path)]["cached"] for path in files] == [
+        True, True, False, True, True, True, True,
+    ]
+
+
+def test_recently_modified_and_missing_files(tmp_path):
+    module = _load_module()
+    fresh = tmp_path / "fresh.csv"
+    fresh.write_bytes(b"a,b\n")
+    hasher = module.FileHasher(tmp_path / "hashes.json")
+    hasher.prefetch([fresh, tmp_path / "missing.csv"])
+    assert hasher.checksum(fresh) == module.checksum_bytes(b"a,b\n")
+    with pytest.raises(module.PackageVerificationError, match="cannot read"):
+        hasher.checksum(tmp_path / "missing.csv")
+    hasher.close()
+    # Within the racy window the checksum is not trusted on the next run.
+    assert str(fresh) not in module.FileHasher(tmp_path / "hashes.json")._entries
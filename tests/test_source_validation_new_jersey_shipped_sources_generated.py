@@ -11,7 +11,7 @@ from pathlib import Path
 
 CONTRACT_ID = "new_jersey_shipped_sources"
 SOURCE_VALIDATION_RELEASE = "source-validation-v1.0.0-rc.4"
-CONTRACT_FINGERPRINT = "sha256:2f37d3ac1e6dbb64636590ec20934e8827fd13caa41852e2ca5e364054a5ce40"
+CONTRACT_FINGERPRINT = "sha256:61ad2ad1a0b95d94e0bd6f194c1bc28bd129c4f0feff85efe38878323de233c6"
 ARTIFACT_MANIFEST_DIGEST = "sha256:a504663075c50fa7459965fc3a641935bac19e7fce0b67c6490dc915e46f5d8b"
 EXPECTED_TEST_IDS = ["SV-001","SV-002","SV-003","SV-004","SV-005","SV-006","SV-007","SV-008","SV-009","SV-010","SV-011","SV-012","SV-013","SV-014","SV-015","SV-016","SV-017"]
 
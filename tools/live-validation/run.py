@@ -1,22 +1,454 @@
 #!/usr/bin/env python3
-"""Explicit New Jersey live-validation entry point.
+"""Explicit live-validation runner for every registered source contract.
 
-No complete NJDOE artifact is admitted to the source-validation manifest, so
-there is no bounded artifact request this runner may make. It reports that
-coverage limitation without contacting a source or advancing validation time.
+Each shipped source artifact whose ``source_identity`` is an HTTP(S) URL is
+fetched once, hashed, and recorded as an immutable validation event. Requests
+are scheduled in one lane per host name, whatever the scheme or port: lanes run
+concurrently, so a sweep takes as
+long as its slowest host, while requests within a lane are strictly serial
+(``max_in_flight_per_host == 1``) and spaced by the contract's
+``minimum_delay_seconds``. Every request, including each redirect hop, is
+charged against its contract's ``request_budget``; artifacts that cannot be
+charged are recorded as ``request_budget_exceeded`` without contacting the
+source. Events are written and printed as each artifact completes.
+
+Contracts with no requestable artifact report that coverage limitation without
+contacting a source or advancing validation time.
 """
 
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import hashlib
+import http.client
 import json
 import os
+from pathlib import Path
+import shlex
+import subprocess
 import sys
+import tempfile
+import threading
+import time
+from typing import Any, Callable
+from urllib.parse import urljoin, urlsplit
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "tools" / "source-validation"))
+
+from validate_contract import event_id, validate_event  # noqa: E402
+
+
+EVENT_SCHEMA = "source-validation-event/v1"
+PRODUCTION_CHECKS = ("production_parse", "goldens", "invariants")
+MAX_REDIRECTS = 5
+CHUNK_SIZE = 1 << 20
+
+Checker = Callable[[str, dict[str, Any], Path], dict[str, bool]]
+
+
+class Budget:
+    """Thread-safe request budget for one contract run."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def charge(self) -> int | None:
+        """Charge one request; return the running count, or ``None`` if exhausted."""
+        with self._lock:
+            if self.used >= self.limit:
+                return None
+            self.used += 1
+            return self.used
+
+
+@dataclass
+class ContractPlan:
+    """One contract's requestable artifacts and execution limits."""
+
+    contract_id: str
+    fingerprint: str
+    mode: str
+    minimum_delay: float
+    budget: Budget
+    artifacts: list[dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class Fetched:
+    status: int
+    final_url: str
+    content_type: str
+    content_length: int | None
+    byte_length: int
+    checksum: str
+
+
+class RequestBudgetExceeded(Exception):
+    """The contract budget cannot pay for another request."""
+
+
+class RedirectRejected(Exception):
+    """A redirect left the artifact's host lane."""
+
+
+def _read_json(path: Path) -> Any:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _host_key(url: str) -> str:
+    return (urlsplit(url).hostname or "").lower()
+
+
+def _endpoint(url: str) -> tuple[str, str, int]:
+    parts = urlsplit(url)
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    return parts.scheme, _host_key(url), port
+
+
+def _requestable(artifact: dict[str, Any]) -> bool:
+    return (
+        artifact.get("tier") == "shipped"
+        and artifact.get("lineage", {}).get("kind") == "source"
+        and urlsplit(str(artifact.get("source_identity", ""))).scheme
+        in {"http", "https"}
+    )
+
+
+def load_plans(package_root: Path, registry_path: Path | None = None) -> list[ContractPlan]:
+    """Read every registered contract's lock, contract, and artifact manifest."""
+    registry_path = registry_path or (
+        package_root / "inst" / "extdata" / "source-contract" / "registry.json"
+    )
+    registry = _read_json(registry_path)
+    plans = []
+    for contract_id, entry in sorted(registry["contracts"].items()):
+        lock_path = package_root / entry["lock"]
+        lock = _read_json(lock_path)
+        contract = _read_json(lock_path.parent / "contract.json")
+        manifest = _read_json(lock_path.parent / "artifact-manifest.json")
+        execution = contract["execution"]
+        if execution.get("max_in_flight_per_host") != 1:
+            raise ValueError(f"{contract_id}: validators require one in-flight request")
+        plans.append(
+            ContractPlan(
+                contract_id=contract_id,
+                fingerprint=lock["contract_fingerprint"],
+                mode=execution["mode"],
+                minimum_delay=float(execution.get("minimum_delay_seconds", 0)),
+                budget=Budget(execution["request_budget"]),
+                artifacts=[a for a in manifest["artifacts"] if _requestable(a)],
+            )
+        )
+    return plans
+
+
+class HostLane:
+    """Serial requests to one host name over a kept-alive connection.
+
+    HTTP and HTTPS requests (and any port) to the same host share the lane, so
+    they never overlap; the connection is reopened when the endpoint changes.
+    """
+
+    def __init__(self, key: str, timeout: float) -> None:
+        self.key = key
+        self.timeout = timeout
+        self._connection: http.client.HTTPConnection | None = None
+        self._endpoint: tuple[str, str, int] | None = None
+        self._last_request: float | None = None
+        # The contract's request count as of the current artifact's last
+        # request (or refused charge); other lanes may have charged since.
+        self.request_count = 0
+
+    def _connect(self, endpoint: tuple[str, str, int]) -> http.client.HTTPConnection:
+        if self._connection is not None and self._endpoint != endpoint:
+            self.close()
+        if self._connection is None:
+            scheme, host, port = endpoint
+            factory = (
+                http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            )
+            self._connection = factory(host, port, timeout=self.timeout)
+            self._endpoint = endpoint
+        return self._connection
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+            self._endpoint = None
+
+    def fetch(self, url: str, dest: Path, budget: Budget, delay: float) -> Fetched:
+        self.request_count = 0
+        for _ in range(MAX_REDIRECTS + 1):
+            if _host_key(url) != self.key:
+                raise RedirectRejected(f"redirect left {self.key}: {url}")
+            charged = budget.charge()
+            if charged is None:
+                self.request_count = budget.limit
+                raise RequestBudgetExceeded(
+                    f"request budget of {budget.limit} exhausted before {url}"
+                )
+            self.request_count = charged
+            if self._last_request is not None:
+                wait = self._last_request + delay - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+            parts = urlsplit(url)
+            target = parts.path or "/"
+            if parts.query:
+                target += "?" + parts.query
+            connection = self._connect(_endpoint(url))
+            try:
+                try:
+                    connection.request(
+                        "GET", target, headers={"User-Agent": "njschooldata-live-validation"}
+                    )
+                    response = connection.getresponse()
+                finally:
+                    self._last_request = time.monotonic()
+                if response.status in {301, 302, 303, 307, 308}:
+                    response.read()
+                    url = urljoin(url, response.getheader("Location", ""))
+                    continue
+                if response.status != 200:
+                    response.read()
+                else:
+                    digest = hashlib.sha256()
+                    received = 0
+                    with dest.open("wb") as handle:
+                        while chunk := response.read(CHUNK_SIZE):
+                            digest.update(chunk)
+                            handle.write(chunk)
+                            received += len(chunk)
+            except Exception:
+                # A failed or half-read exchange leaves the connection unusable
+                # for the next request on this lane.
+                self.close()
+                raise
+            if response.will_close:
+                self.close()
+            if response.status != 200:
+                raise OSError(f"HTTP {response.status} from {url}")
+            length = response.getheader("Content-Length")
+            return Fetched(
+                status=response.status,
+                final_url=url,
+                content_type=response.getheader("Content-Type", ""),
+                content_length=int(length) if length and length.isdigit() else None,
+                byte_length=received,
+                checksum="sha256:" + digest.hexdigest(),
+            )
+        raise OSError(f"too many redirects from {url}")
+
+
+def command_checker(command: str) -> Checker:
+    """Run ``command contract_id artifact_id path``; it prints the check results as JSON."""
+
+    def check(contract_id: str, artifact: dict[str, Any], path: Path) -> dict[str, bool]:
+        completed = subprocess.run(
+            [*shlex.split(command), contract_id, artifact["artifact_id"], str(path)],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if completed.returncode != 0:
+            raise RuntimeError(completed.stderr.strip() or f"checker exited {completed.returncode}")
+        return json.loads(completed.stdout)
+
+    return check
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+def build_event(
+    plan: ContractPlan,
+    artifact: dict[str, Any],
+    completed_at: str,
+    request_count: int,
+    fetched: Fetched | None = None,
+    checks: dict[str, bool] | None = None,
+    failure: tuple[str, str, str] | None = None,
+) -> dict[str, Any]:
+    """Assemble a content-addressed event; ``failure`` is (state, type, message).
+
+    ``request_count`` is the contract's request count as of the artifact's own
+    last request, not the running total when the event is built.
+    """
+    value: dict[str, Any] = {
+        "schema_version": EVENT_SCHEMA,
+        "contract_id": plan.contract_id,
+        "artifact_id": artifact["artifact_id"],
+        "contract_fingerprint": plan.fingerprint,
+        "completed_at": completed_at,
+        "execution": {
+            "mode": plan.mode,
+            "request_budget": plan.budget.limit,
+            "request_count": request_count,
+        },
+    }
+    if failure is not None:
+        state, kind, message = failure
+        value["terminal_state"] = state
+        value["failure"] = {"type": kind, "message": message}
+    else:
+        assert fetched is not None and checks is not None
+        value.update(
+            terminal_state=(
+                "validated_match"
+                if fetched.checksum == artifact["checksum"]
+                else "validated_content_drift"
+            ),
+            observed_checksum=fetched.checksum,
+            snapshot_checksum=artifact["checksum"],
+            final_url=fetched.final_url,
+            content_type=fetched.content_type,
+            checks=checks,
+        )
+    value["event_id"] = event_id(value)
+    validate_event(value)
+    return value
+
+
+def _validate_artifact(
+    plan: ContractPlan,
+    artifact: dict[str, Any],
+    lane: HostLane,
+    workdir: Path,
+    checker: Checker | None,
+) -> dict[str, Any]:
+    url = artifact["source_identity"]
+
+    def event(**fields: Any) -> dict[str, Any]:
+        return build_event(plan, artifact, _utc_now(), lane.request_count, **fields)
+
+    dest = workdir / f"{plan.contract_id}-{hashlib.sha256(url.encode()).hexdigest()[:16]}"
+    try:
+        fetched = lane.fetch(url, dest, plan.budget, plan.minimum_delay)
+    except RequestBudgetExceeded as error:
+        return event(failure=("request_budget_exceeded", "request_budget", str(error)))
+    except RedirectRejected as error:
+        return event(failure=("source_unavailable", "redirect_rejected", str(error)))
+    except Exception as error:
+        # OSError and HTTPException, but also e.g. http.client.InvalidURL (a
+        # ValueError): one bad artifact is recorded, the sweep continues.
+        return event(
+            failure=("source_unavailable", type(error).__name__, str(error) or repr(error)),
+        )
+    try:
+        checks = {
+            "content_complete": fetched.byte_length > 0
+            and fetched.content_length in {None, fetched.byte_length},
+            "requested_identity": _endpoint(fetched.final_url) == _endpoint(url),
+        }
+        if checker is None:
+            return event(
+                failure=(
+                    "tooling_unavailable",
+                    "checker_unavailable",
+                    f"retrieved {fetched.checksum} but no production checker is configured",
+                ),
+            )
+        try:
+            produced = checker(plan.contract_id, artifact, dest)
+        except Exception as error:  # the checker is user-supplied tooling
+            return event(failure=("tooling_unavailable", type(error).__name__, str(error)))
+        checks.update({name: bool(produced.get(name)) for name in PRODUCTION_CHECKS})
+        failed = sorted(name for name, passed in checks.items() if not passed)
+        if failed:
+            return event(failure=("contract_failure", "failed_checks", ", ".join(failed)))
+        return event(fetched=fetched, checks=checks)
+    finally:
+        dest.unlink(missing_ok=True)
+
+
+def write_event(events_dir: Path, value: dict[str, Any]) -> Path:
+    """Write an event once; an existing event file is never replaced.
+
+    Event files are named by completion time and event id, so an existing file
+    holds the same event and is returned as is. A different event at that path
+    raises ``FileExistsError``.
+    """
+    directory = events_dir / value["contract_id"]
+    directory.mkdir(parents=True, exist_ok=True)
+    stamp = value["completed_at"].replace("-", "").replace(":", "")
+    path = directory / f"{stamp}-{value['event_id'].split(':', 1)[1][:16]}.json"
+    staging = directory / f".{path.name}.{os.getpid()}.tmp"
+    staging.write_text(json.dumps(value, sort_keys=True, indent=2) + "\n", encoding="utf-8")
+    try:
+        os.link(staging, path)
+    except FileExistsError:
+        existing = _read_json(path)
+        if existing.get("event_id") != value["event_id"]:
+            raise
+    finally:
+        staging.unlink()
+    return path
+
+
+def run_sweep(
+    plans: list[ContractPlan],
+    events_dir: Path,
+    checker: Checker | None = None,
+    timeout: float = 60.0,
+    on_event: Callable[[dict[str, Any], Path], None] | None = None,
+) -> list[dict[str, Any]]:
+    """Validate every planned artifact, one concurrent lane per host."""
+    lanes: dict[str, list[tuple[ContractPlan, dict[str, Any]]]] = {}
+    for plan in plans:
+        for artifact in plan.artifacts:
+            lanes.setdefault(_host_key(artifact["source_identity"]), []).append(
+                (plan, artifact)
+            )
+    events: list[dict[str, Any]] = []
+    emit_lock = threading.Lock()
+
+    def run_lane(key, work, workdir):
+        lane = HostLane(key, timeout)
+        try:
+            for plan, artifact in work:
+                value = _validate_artifact(plan, artifact, lane, workdir, checker)
+                with emit_lock:
+                    path = write_event(events_dir, value)
+                    events.append(value)
+                    if on_event is not None:
+                        on_event(value, path)
+        finally:
+            lane.close()
+
+    with tempfile.TemporaryDirectory(prefix="njsd-live-") as workdir:
+        with ThreadPoolExecutor(max_workers=max(1, len(lanes))) as pool:
+            futures = [
+                pool.submit(run_lane, key, work, Path(workdir))
+                for key, work in sorted(lanes.items())
+            ]
+            for future in futures:
+                future.result()
+    return events
 
 
 def main() -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--execute", action="store_true")
+    parser.add_argument("--package-root", type=Path, default=ROOT)
+    parser.add_argument("--registry", type=Path)
+    parser.add_argument(
+        "--events-dir",
+        type=Path,
+        help="directory for immutable events (default: <package-root>/source-validation-events)",
+    )
+    parser.add_argument(
+        "--checker",
+        help="command run as: CHECKER contract_id artifact_id path; prints JSON checks",
+    )
+    parser.add_argument("--timeout", type=float, default=60.0)
     args = parser.parse_args()
     dispatched = os.environ.get("GITHUB_EVENT_NAME") == "workflow_dispatch"
     if not args.execute and not dispatched:
@@ -26,22 +458,35 @@ def main() -> int:
         )
         return 2
 
-    print(
-        json.dumps(
-            {
-                "reason": (
-                    "No complete NJDOE artifact is admitted to this contract; "
-                    "manual source acquisition and lineage review are required."
-                ),
-                "request_budget": 6,
-                "request_count": 0,
-                "terminal_state": "contract_failure",
-                "validation_clock_advanced": False,
-            },
-            sort_keys=True,
-        )
+    plans = load_plans(args.package_root, args.registry)
+    events = run_sweep(
+        plans,
+        args.events_dir or args.package_root / "source-validation-events",
+        checker=command_checker(args.checker) if args.checker else None,
+        timeout=args.timeout,
+        on_event=lambda value, path: print(json.dumps(value, sort_keys=True), flush=True),
     )
-    return 6
+    succeeded = True
+    for plan in plans:
+        states = [e["terminal_state"] for e in events if e["contract_id"] == plan.contract_id]
+        summary: dict[str, Any] = {
+            "contract_id": plan.contract_id,
+            "request_budget": plan.budget.limit,
+            "request_count": plan.budget.used,
+            "terminal_states": {state: states.count(state) for state in sorted(set(states))},
+            "validation_clock_advanced": any(state.startswith("validated_") for state in states),
+        }
+        if not plan.artifacts:
+            summary["reason"] = (
+                "No complete NJDOE artifact is admitted to this contract; "
+                "manual source acquisition and lineage review are required."
+            )
+            summary["terminal_state"] = "contract_failure"
+        succeeded = succeeded and bool(states) and all(
+            state.startswith("validated_") for state in states
+        )
+        print(json.dumps(summary, sort_keys=True))
+    return 0 if succeeded else 6
 
 
 if __name__ == "__main__":
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Time validate_bundle on a synthetic domain x year x level manifest."""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from validate_contract import (  # noqa: E402
+    FINGERPRINT_CATEGORIES,
+    _coverage_overlaps,
+    validate_bundle,
+)
+
+
+def synthetic_bundle(count: int) -> tuple[dict, dict]:
+    """Return a contract and manifest with ``count`` disjoint shipped artifacts."""
+    levels = ("state", "county", "district", "school", "program")
+    years = range(1990, 2030)
+    domains = max(1, -(-count // (len(levels) * len(years))))
+    artifacts = []
+    for domain in range(domains):
+        for year in years:
+            for level in levels:
+                if len(artifacts) == count:
+                    break
+                number = len(artifacts)
+                artifacts.append(
+                    {
+                        "artifact_id": f"domain{domain}-{year}-{level}",
+                        "source_identity": f"synthetic/{number}",
+                        "tier": "shipped",
+                        "checksum": "sha256:" + f"{number:064x}",
+                        "byte_length": 1,
+                        "selectors": {
+                            "domain": f"domain{domain}",
+                            "end_year": [year] if number % 2 else year,
+                            "level": level,
+                        },
+                        "storage": {"backend": "git", "path": f"inst/extdata/{number}"},
+                        "lineage": {"kind": "source"},
+                    }
+                )
+    contract = {
+        "schema_version": "source-validation-contract/v1",
+        "contract_id": "synthetic",
+        "source_validation_release": "benchmark",
+        "category": "benchmark",
+        "selectors": [
+            {"name": name, "required": True, "multi_value": name == "end_year"}
+            for name in ("domain", "end_year", "level")
+        ],
+        "execution": {
+            "mode": "local",
+            "max_in_flight_per_host": 1,
+            "request_budget": 1,
+        },
+        "fingerprint_inputs": {
+            category: [f"{category}.txt"] for category in FINGERPRINT_CATEGORIES
+        },
+        "supported_runtimes": ["python"],
+        "required_artifacts": [
+            {"artifact_id": artifacts[0]["artifact_id"], "selectors": {}}
+        ],
+    }
+    manifest = {
+        "schema_version": "source-validation-artifact-manifest/v1",
+        "contract_id": "synthetic",
+        "artifacts": artifacts,
+    }
+    return contract, manifest
+
+
+def pairwise_seconds(manifest: dict) -> float:
+    shipped = manifest["artifacts"]
+    started = time.perf_counter()
+    for index, left in enumerate(shipped):
+        for right in shipped[index + 1 :]:
+            _coverage_overlaps(left["selectors"], right["selectors"])
+    return time.perf_counter() - started
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--artifacts", type=int, default=50_000)
+    parser.add_argument(
+        "--pairwise-sample",
+        type=int,
+        default=2_000,
+        help="artifacts timed with the pairwise scan; the full cost is extrapolated",
+    )
+    args = parser.parse_args()
+    contract, manifest = synthetic_bundle(args.artifacts)
+    started = time.perf_counter()
+    validate_bundle(contract, manifest)
+    indexed = time.perf_counter() - started
+    _, sample = synthetic_bundle(min(args.pairwise_sample, args.artifacts))
+    sample_seconds = pairwise_seconds(sample)
+    pairs = lambda n: n * (n - 1) / 2  # noqa: E731
+    print(
+        json.dumps(
+            {
+                "artifacts": args.artifacts,
+                "validate_bundle_seconds": round(indexed, 3),
+                "pairwise_overlap_seconds_estimated": round(
+                    sample_seconds
+                    * pairs(args.artifacts)
+                    / pairs(len(sample["artifacts"])),
+                    1,
+                ),
+            },
+            indent=2,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Incrementally recompute a contract fingerprint and report changed categories.
+
+The contract fingerprint is the digest of one ``{category, path, checksum}``
+entry per fingerprint input, in sorted category and path order. Input files are
+hashed through the stat-keyed cache of ``verify_package.FileHasher``, so only
+inputs whose (path, size, mtime_ns, inode) changed since the previous run are
+read again.
+
+``changed_categories`` names the inputs that changed since the release lock:
+it is empty whenever the fingerprint matches the lock, and otherwise lists the
+inputs that differ from their embedded copy under ``fingerprint-inputs/``,
+the only per-file record of the locked state. The embedded copies can fall
+behind the lock, so ``stale_inputs`` separately lists every input whose copy
+differs from the authoritative file, whether or not the lock matches.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import sys
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from validate_contract import ValidationError, digest, load_json  # noqa: E402
+from verify_package import (  # noqa: E402
+    FileHasher,
+    PackageVerificationError,
+    default_cache_path,
+)
+
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def fingerprint_payload(
+    inputs: dict[str, list[str]],
+    resolve,
+    hasher: FileHasher,
+    missing_ok: bool = False,
+) -> list[dict[str, str | None]]:
+    """Return the fingerprint payload; ``resolve(category, relative)`` locates a file.
+
+    With ``missing_ok``, an absent file gets a ``None`` checksum instead of
+    raising.
+    """
+    paths = [
+        resolve(category, relative)
+        for category in sorted(inputs)
+        for relative in sorted(inputs[category])
+    ]
+    hasher.prefetch(paths)
+    payload = []
+    position = 0
+    for category in sorted(inputs):
+        for relative in sorted(inputs[category]):
+            payload.append(
+                {
+                    "category": category,
+                    "path": relative,
+                    "checksum": (
+                        None
+                        if missing_ok and not paths[position].is_file()
+                        else hasher.checksum(paths[position])
+                    ),
+                }
+            )
+            position += 1
+    return payload
+
+
+def fingerprint_report(
+    package_root: Path,
+    contract_id: str,
+    hasher: FileHasher,
+) -> dict[str, Any]:
+    """Compare the authoritative inputs' fingerprint with the locked snapshot."""
+    spec_root = package_root / "data-raw" / "source-validation-spec" / contract_id
+    contract_root = (
+        package_root / "inst" / "extdata" / "source-contract" / "contracts" / contract_id
+    )
+    contract = load_json(spec_root / "contract.json")
+    lock = load_json(contract_root / "release-lock.json")
+    inputs = contract["fingerprint_inputs"]
+    current = fingerprint_payload(
+        inputs, lambda category, relative: (spec_root / relative).resolve(), hasher
+    )
+    embedded = fingerprint_payload(
+        inputs,
+        lambda category, relative: contract_root
+        / "fingerprint-inputs"
+        / category
+        / Path(relative).name,
+        hasher,
+        missing_ok=True,
+    )
+    stale: dict[str, list[str]] = {}
+    for now, then in zip(current, embedded):
+        if now["checksum"] != then["checksum"]:
+            stale.setdefault(now["category"], []).append(now["path"])
+    fingerprint = digest(current)
+    matches_lock = fingerprint == lock["contract_fingerprint"]
+    return {
+        "contract_id": contract_id,
+        "contract_fingerprint": fingerprint,
+        "locked_fingerprint": lock["contract_fingerprint"],
+        "snapshot_fingerprint": digest(embedded),
+        "matches_lock": matches_lock,
+        "category_fingerprints": {
+            category: digest([value for value in current if value["category"] == category])
+            for category in sorted(inputs)
+        },
+        "changed_categories": {} if matches_lock else stale,
+        "stale_inputs": stale,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--package-root", type=Path, default=ROOT)
+    parser.add_argument("--contract-id", action="append")
+    parser.add_argument("--cache", type=Path, default=default_cache_path())
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args()
+    contract_ids = args.contract_id or sorted(
+        load_json(
+            args.package_root / "inst" / "extdata" / "source-contract" / "registry.json"
+        )["contracts"]
+    )
+    hasher = FileHasher(None if args.no_cache else args.cache)
+    try:
+        reports = [
+            fingerprint_report(args.package_root, contract_id, hasher)
+            for contract_id in contract_ids
+        ]
+    except (OSError, KeyError, PackageVerificationError, ValidationError) as error:
+        print(f"cannot fingerprint contract inputs: {error}", file=sys.stderr)
+        return 2
+    finally:
+        hasher.close()
+    print(json.dumps(reports, sort_keys=True, indent=2))
+    return 0 if all(report["matches_lock"] for report in reports) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
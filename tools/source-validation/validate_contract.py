@@ -6,7 +6,9 @@ from __future__ import annotations
 import argparse
 import hashlib
 import json
+import os
 import re
+from bisect import bisect_right
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Iterable
@@ -23,6 +25,9 @@ TERMINAL_STATES = SUCCESS_STATES | {
     "request_budget_exceeded",
 }
 EXECUTION_MODES = {"local", "manual_dispatch"}
+STALE_AFTER = timedelta(days=90)
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+INDEX_SCHEMA = "source-validation-event-index/v1"
 FINGERPRINT_CATEGORIES = {
     "endpoint",
     "downloader",
@@ -63,6 +68,11 @@ def parse_utc(value: str) -> datetime:
     return parsed.astimezone(timezone.utc)
 
 
+def utc_micros(value: str) -> int:
+    """Return a completion time as exact integer microseconds since the epoch."""
+    return (parse_utc(value) - EPOCH) // timedelta(microseconds=1)
+
+
 def _checksum(value: Any, location: str) -> None:
     if not isinstance(value, str) or not CHECKSUM.fullmatch(value):
         raise ValidationError(f"schema violation: malformed checksum at {location}")
@@ -190,6 +200,79 @@ def _coverage_overlaps(left: dict[str, Any], right: dict[str, Any]) -> bool:
     )
 
 
+def _first_coverage_overlap(
+    shipped: list[dict[str, Any]],
+    requirements: dict[str, Any],
+) -> tuple[dict[str, Any], dict[str, Any]] | None:
+    """Return the first pair, in pairwise scan order, whose coverage overlaps.
+
+    Equivalent to testing ``_coverage_overlaps`` for every ``(i, j)`` with
+    ``i < j`` and skipping pairs of required artifacts, without the quadratic
+    scan: selector values are interned once, artifacts are bucketed by
+    (selector, value), and only artifacts that share a value with -- or lack --
+    the most selective selector of the left artifact are compared.
+    """
+    interned: dict[str, int] = {}
+    coverage = [
+        {
+            key: frozenset(
+                interned.setdefault(text, len(interned)) for text in _values(value)
+            )
+            for key, value in artifact["selectors"].items()
+        }
+        for artifact in shipped
+    ]
+    required = [artifact["artifact_id"] in requirements for artifact in shipped]
+    # Required artifacts may overlap each other, so they are only ever
+    # candidates for a non-required left artifact.
+    buckets: list[dict[tuple[str, int], list[int]]] = [{}, {}]
+    lacking: list[dict[str, list[int]]] = [{}, {}]
+    keys = {key for selectors in coverage for key in selectors}
+    for position, selectors in enumerate(coverage):
+        group = 0 if required[position] else 1
+        for key in keys:
+            if key in selectors:
+                for value in selectors[key]:
+                    buckets[group].setdefault((key, value), []).append(position)
+            else:
+                lacking[group].setdefault(key, []).append(position)
+    for position, selectors in enumerate(coverage):
+        groups = (1,) if required[position] else (0, 1)
+        candidates: list[int] | range
+        if selectors:
+            best: list[list[int]] | None = None
+            for key, values in selectors.items():
+                lists = [
+                    members
+                    for group in groups
+                    for members in (
+                        lacking[group].get(key, []),
+                        *(buckets[group].get((key, value), []) for value in values),
+                    )
+                ]
+                if best is None or sum(map(len, lists)) < sum(map(len, best)):
+                    best = lists
+            candidates = sorted(
+                {
+                    other
+                    for members in best or []
+                    for other in members[bisect_right(members, position) :]
+                }
+            )
+        else:
+            candidates = range(position + 1, len(shipped))
+        for other in candidates:
+            if required[position] and required[other]:
+                continue
+            right = coverage[other]
+            if all(
+                key not in right or not values.isdisjoint(right[key])
+                for key, values in selectors.items()
+            ):
+                return shipped[position], shipped[other]
+    return None
+
+
 def _coverage_contains(
     artifact_selectors: dict[str, Any],
     required_selectors: dict[str, Any],
@@ -246,18 +329,12 @@ def validate_bundle(contract: dict[str, Any], manifest: dict[str, Any]) -> None:
                 f"required artifact selectors are not covered: {artifact_id}"
             )
     shipped = [a for a in manifest["artifacts"] if a["tier"] == "shipped"]
-    for index, left in enumerate(shipped):
-        for right in shipped[index + 1 :]:
-            if (
-                _coverage_overlaps(left["selectors"], right["selectors"])
-                and not (
-                    left["artifact_id"] in requirements
-                    and right["artifact_id"] in requirements
-                )
-            ):
-                raise ValidationError(
-                    f"overlapping shipped selector coverage: {left['artifact_id']} and {right['artifact_id']}"
-                )
+    overlap = _first_coverage_overlap(shipped, requirements)
+    if overlap is not None:
+        left, right = overlap
+        raise ValidationError(
+            f"overlapping shipped selector coverage: {left['artifact_id']} and {right['artifact_id']}"
+        )
     if len(shipped) > 1 and not requirements:
         raise ValidationError(
             "multiple shipped artifacts require explicit required_artifacts"
@@ -339,14 +416,31 @@ def validate_events(
     contract: dict[str, Any],
     manifest: dict[str, Any],
     now: datetime | None = None,
+    prior: EventIndex | None = None,
 ) -> None:
+    """Validate events, optionally as additions to already-indexed events.
+
+    Indexed events were fully validated when they were appended; against
+    ``prior`` only the properties that depend on the current contract,
+    manifest, and clock are rechecked, from the index summary.
+    """
     validate_bundle(contract, manifest)
     now = (now or datetime.now(timezone.utc)).astimezone(timezone.utc)
     artifact_ids = {artifact["artifact_id"] for artifact in manifest["artifacts"]}
     ids = [value.get("event_id") for value in events]
-    if len(ids) != len(set(ids)):
+    prior_ids = prior.event_ids if prior is not None else set()
+    if len(ids) != len(set(ids)) or not prior_ids.isdisjoint(ids):
         raise ValidationError("duplicate event ID")
-    known_ids = set(ids)
+    if prior is not None:
+        if prior.contract_ids - {contract["contract_id"]}:
+            raise ValidationError("event references unknown contract")
+        if prior.artifact_ids - artifact_ids:
+            raise ValidationError("event references unknown artifact")
+        if prior.latest_micros is not None and prior.latest_micros > (
+            now + timedelta(minutes=5) - EPOCH
+        ) // timedelta(microseconds=1):
+            raise ValidationError("event completion time is in the future")
+    known_ids = set(ids) | prior_ids
     for value in events:
         validate_event(value)
         if value["contract_id"] != contract["contract_id"]:
@@ -540,21 +634,387 @@ def derive_status(
     }
 
 
+def _index_record(value: dict[str, Any], rank: int | str) -> dict[str, Any]:
+    return {
+        "event_id": value["event_id"],
+        "rank": rank,
+        "contract_id": value.get("contract_id"),
+        "artifact_id": value.get("artifact_id"),
+        "contract_fingerprint": value.get("contract_fingerprint"),
+        "terminal_state": value.get("terminal_state"),
+        "completed_at": value.get("completed_at"),
+        "completed_us": (
+            utc_micros(value["completed_at"])
+            if value.get("terminal_state") in SUCCESS_STATES
+            else None
+        ),
+        "observed_checksum": value.get("observed_checksum"),
+        "snapshot_checksum": value.get("snapshot_checksum"),
+        "supersedes": value.get("supersedes"),
+    }
+
+
+def _order(record: dict[str, Any]) -> tuple[int, int | str]:
+    return record["completed_us"], record["rank"]
+
+
+class EventIndex:
+    """Append-only event index with per-(artifact, fingerprint) latest pointers.
+
+    Each event is reduced once to a compact record with its completion time
+    pre-parsed to integer microseconds and appended to a JSONL log. A
+    checkpoint beside the log holds the latest successful and latest
+    ``validated_match`` record for every (artifact, fingerprint) pair, the
+    known event IDs, and the log offset it covers, so reopening replays only
+    records appended since the checkpoint and ``status()`` reads pointers
+    instead of sorting the history. The full log is read only when a
+    correction supersedes an event that is currently a pointer.
+
+    Ties on completion time resolve by rank: the event's position for
+    :meth:`from_events`, or its file name for :meth:`sync`, matching the order
+    in which :func:`main` loads event files.
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path
+        self.event_ids: set[str] = set()
+        self.superseded: set[str] = set()
+        self.contract_ids: set[str] = set()
+        self.artifact_ids: set[str] = set()
+        self.files: set[str] = set()
+        self.latest_micros: int | None = None
+        self.pointers: dict[tuple[str, str], dict[str, dict[str, Any] | None]] = {}
+        self._records: list[dict[str, Any]] | None = None if path else []
+        self._offset = 0
+        if path is not None:
+            self._open()
+
+    @classmethod
+    def from_events(cls, events: list[dict[str, Any]]) -> EventIndex:
+        """Build an in-memory index ranked by list position."""
+        index = cls()
+        for rank, value in enumerate(events):
+            index._apply(_index_record(value, rank))
+        return index
+
+    @property
+    def checkpoint_path(self) -> Path:
+        assert self.path is not None
+        return self.path.with_name(self.path.name + ".checkpoint")
+
+    def _open(self) -> None:
+        checkpoint = None
+        if self.checkpoint_path.exists():
+            try:
+                checkpoint = load_json(self.checkpoint_path)
+            except ValidationError:
+                checkpoint = None
+        size = self.path.stat().st_size if self.path.exists() else 0
+        if (
+            checkpoint is None
+            or checkpoint.get("schema_version") != INDEX_SCHEMA
+            or checkpoint["offset"] > size
+        ):
+            checkpoint = {"offset": 0}
+        else:
+            self.event_ids = set(checkpoint["event_ids"])
+            self.superseded = set(checkpoint["superseded"])
+            self.contract_ids = set(checkpoint["contract_ids"])
+            self.artifact_ids = set(checkpoint["artifact_ids"])
+            self.files = set(checkpoint["files"])
+            self.latest_micros = checkpoint["latest_micros"]
+            self.pointers = {
+                (artifact_id, fingerprint): {"latest": latest, "match": match}
+                for artifact_id, fingerprint, latest, match in checkpoint["pointers"]
+            }
+        self._offset = checkpoint["offset"]
+        for record in self._read_log(self._offset):
+            self._apply(record)
+        self._offset = size
+
+    def _read_log(self, offset: int = 0) -> list[dict[str, Any]]:
+        if self.path is None or not self.path.exists():
+            return []
+        with self.path.open("rb") as handle:
+            handle.seek(offset)
+            lines = handle.read().splitlines()
+        try:
+            return [json.loads(line) for line in lines if line.strip()]
+        except json.JSONDecodeError as error:
+            raise ValidationError(f"cannot read {self.path}: {error}") from error
+
+    def records(self) -> list[dict[str, Any]]:
+        """Return every indexed record in rank order."""
+        if self._records is None:
+            self._records = self._read_log()
+        return sorted(self._records, key=lambda record: record["rank"])
+
+    def _apply(self, record: dict[str, Any]) -> bool:
+        identity = record["event_id"]
+        if identity in self.event_ids:
+            return False
+        self.event_ids.add(identity)
+        if self.path is None:
+            self._records.append(record)
+        if isinstance(record["rank"], str):
+            self.files.add(record["rank"])
+        if record["contract_id"] is not None:
+            self.contract_ids.add(record["contract_id"])
+        if record["artifact_id"] is not None:
+            self.artifact_ids.add(record["artifact_id"])
+        if record["completed_us"] is not None:
+            if self.latest_micros is None or record["completed_us"] > self.latest_micros:
+                self.latest_micros = record["completed_us"]
+        supersedes = record["supersedes"]
+        if supersedes and supersedes not in self.superseded:
+            self.superseded.add(supersedes)
+            for key, pointer in self.pointers.items():
+                if any(
+                    value is not None and value["event_id"] == supersedes
+                    for value in pointer.values()
+                ):
+                    self._rebuild(key)
+                    break
+        if (
+            record["terminal_state"] not in SUCCESS_STATES
+            or identity in self.superseded
+        ):
+            return True
+        key = (record["artifact_id"], record["contract_fingerprint"])
+        pointer = self.pointers.setdefault(key, {"latest": None, "match": None})
+        slots = ("latest", "match") if record["terminal_state"] == "validated_match" else ("latest",)
+        for slot in slots:
+            if pointer[slot] is None or _order(record) > _order(pointer[slot]):
+                pointer[slot] = record
+        return True
+
+    def _rebuild(self, key: tuple[str, str]) -> None:
+        candidates = [
+            record
+            for record in self.records()
+            if record["terminal_state"] in SUCCESS_STATES
+            and (record["artifact_id"], record["contract_fingerprint"]) == key
+            and record["event_id"] not in self.superseded
+        ]
+        matches = [
+            record for record in candidates if record["terminal_state"] == "validated_match"
+        ]
+        if not candidates:
+            del self.pointers[key]
+            return
+        self.pointers[key] = {
+            "latest": max(candidates, key=_order),
+            "match": max(matches, key=_order) if matches else None,
+        }
+
+    def pending(self, events_dir: Path) -> list[tuple[str, dict[str, Any]]]:
+        """Load only the event files in ``events_dir`` not yet indexed."""
+        paths = sorted(events_dir.glob("*.json"))
+        if self.files - {path.name for path in paths}:
+            raise ValidationError("prior events were edited or deleted")
+        return [
+            (path.name, load_json(path))
+            for path in paths
+            if path.name not in self.files
+        ]
+
+    def append(self, named_events: list[tuple[str, dict[str, Any]]]) -> int:
+        """Append validated events to the log and checkpoint the pointers."""
+        seen = set(self.event_ids)
+        records = []
+        for name, value in named_events:
+            if value["event_id"] not in seen:
+                seen.add(value["event_id"])
+                records.append(_index_record(value, name))
+        if self.path is None:
+            return sum(self._apply(record) for record in records)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("ab") as handle:
+            for record in records:
+                handle.write(canonical_bytes(record) + b"\n")
+            self._offset = handle.tell()
+        self._records = None
+        added = sum(self._apply(record) for record in records)
+        self.checkpoint()
+        return added
+
+    def sync(self, events_dir: Path) -> list[dict[str, Any]]:
+        """Index new event files without validation; return the new events."""
+        named_events = self.pending(events_dir)
+        self.append(named_events)
+        return [value for _, value in named_events]
+
+    def checkpoint(self) -> None:
+        """Atomically write the pointer snapshot for the current log offset."""
+        assert self.path is not None
+        value = {
+            "schema_version": INDEX_SCHEMA,
+            "offset": self._offset,
+            "event_ids": sorted(self.event_ids),
+            "superseded": sorted(self.superseded),
+            "contract_ids": sorted(self.contract_ids),
+            "artifact_ids": sorted(self.artifact_ids),
+            "files": sorted(self.files),
+            "latest_micros": self.latest_micros,
+            "pointers": [
+                [artifact_id, fingerprint, pointer["latest"], pointer["match"]]
+                for (artifact_id, fingerprint), pointer in sorted(self.pointers.items())
+            ],
+        }
+        staging = self.checkpoint_path.with_name(self.checkpoint_path.name + ".tmp")
+        staging.write_bytes(canonical_bytes(value))
+        os.replace(staging, self.checkpoint_path)
+
+    def status(
+        self,
+        current_fingerprint: str,
+        now: datetime,
+        required_artifact_ids: Iterable[str] | None = None,
+    ) -> dict[str, Any]:
+        """Return exactly what :func:`derive_status` returns for the indexed events."""
+        _checksum(current_fingerprint, "current_fingerprint")
+        now = now.astimezone(timezone.utc)
+        now_us = (now - EPOCH) // timedelta(microseconds=1)
+        stale_us = STALE_AFTER // timedelta(microseconds=1)
+        derived_at = now.isoformat().replace("+00:00", "Z")
+        required = sorted(set(required_artifact_ids or []))
+        if required:
+            empty = {"latest": None, "match": None}
+            latest_by_artifact = {
+                artifact_id: self.pointers.get(
+                    (artifact_id, current_fingerprint), empty
+                )["latest"]
+                for artifact_id in required
+            }
+            matched_by_artifact = {
+                artifact_id: self.pointers.get(
+                    (artifact_id, current_fingerprint), empty
+                )["match"]
+                for artifact_id in required
+            }
+            with_success = {artifact_id for artifact_id, _ in self.pointers}
+            missing = [
+                artifact_id
+                for artifact_id in required
+                if latest_by_artifact[artifact_id] is None
+            ]
+            validated = sorted(set(required) - set(missing))
+            selected = [value for value in latest_by_artifact.values() if value is not None]
+            matched_events = [
+                value for value in matched_by_artifact.values() if value is not None
+            ]
+            if missing:
+                state = (
+                    "fingerprint_mismatch"
+                    if with_success.issuperset(required)
+                    else "never_validated"
+                )
+            elif any(now_us - value["completed_us"] > stale_us for value in selected):
+                state = "stale_90d"
+            else:
+                state = "current"
+            micros = lambda value: value["completed_us"]  # noqa: E731
+            latest = max(selected, key=micros) if selected else None
+            latest_match = max(matched_events, key=micros) if matched_events else None
+            return {
+                "schema_version": "source-validation-status/v1",
+                "state": state,
+                "contract_fingerprint": current_fingerprint,
+                "contract_validated_at": (
+                    min(selected, key=micros)["completed_at"] if not missing else None
+                ),
+                "snapshot_matched_at": (
+                    min(matched_events, key=micros)["completed_at"]
+                    if len(matched_events) == len(required) else None
+                ),
+                "snapshot_checksum": (
+                    latest_match["snapshot_checksum"]
+                    if len(required) == 1 and latest_match else None
+                ),
+                "latest_observed_checksum": (
+                    latest["observed_checksum"] if len(required) == 1 and latest else None
+                ),
+                "active_drift": any(
+                    value["observed_checksum"] != value["snapshot_checksum"]
+                    for value in selected
+                ),
+                "derived_at": derived_at,
+                "required_artifact_ids": required,
+                "validated_artifact_ids": validated,
+                "missing_artifact_ids": missing,
+                "artifact_statuses": {
+                    artifact_id: {
+                        "validated_at": value["completed_at"] if value else None,
+                        "snapshot_matched_at": (
+                            matched_by_artifact[artifact_id]["completed_at"]
+                            if matched_by_artifact[artifact_id] else None
+                        ),
+                        "snapshot_checksum": value["snapshot_checksum"] if value else None,
+                        "latest_observed_checksum": (
+                            value["observed_checksum"] if value else None
+                        ),
+                        "active_drift": bool(
+                            value
+                            and value["observed_checksum"] != value["snapshot_checksum"]
+                        ),
+                    }
+                    for artifact_id, value in latest_by_artifact.items()
+                },
+            }
+        pointers = [
+            pointer
+            for (_, fingerprint), pointer in self.pointers.items()
+            if fingerprint == current_fingerprint
+        ]
+        latests = [pointer["latest"] for pointer in pointers]
+        matches = [pointer["match"] for pointer in pointers if pointer["match"]]
+        latest = max(latests, key=_order) if latests else None
+        latest_match = max(matches, key=_order) if matches else None
+        if latest is None:
+            state = "fingerprint_mismatch" if self.pointers else "never_validated"
+        elif now_us - latest["completed_us"] > stale_us:
+            state = "stale_90d"
+        else:
+            state = "current"
+        snapshot_checksum = (
+            latest_match["snapshot_checksum"]
+            if latest_match
+            else (latest["snapshot_checksum"] if latest else None)
+        )
+        return {
+            "schema_version": "source-validation-status/v1",
+            "state": state,
+            "contract_fingerprint": current_fingerprint,
+            "contract_validated_at": latest["completed_at"] if latest else None,
+            "snapshot_matched_at": latest_match["completed_at"] if latest_match else None,
+            "snapshot_checksum": snapshot_checksum,
+            "latest_observed_checksum": latest["observed_checksum"] if latest else None,
+            "active_drift": bool(
+                latest and latest["observed_checksum"] != latest["snapshot_checksum"]
+            ),
+            "derived_at": derived_at,
+        }
+
+
 def verify_status(
     status: dict[str, Any],
     events: list[dict[str, Any]],
     fingerprint: str,
     now: datetime,
     required_artifact_ids: Iterable[str] | None = None,
+    index: EventIndex | None = None,
 ) -> None:
-    if canonical_bytes(status) != canonical_bytes(
-        derive_status(
+    expected = (
+        index.status(fingerprint, now, required_artifact_ids=required_artifact_ids)
+        if index is not None
+        else derive_status(
             events,
             fingerprint,
             now,
             required_artifact_ids=required_artifact_ids,
         )
-    ):
+    )
+    if canonical_bytes(status) != canonical_bytes(expected):
         raise ValidationError("status is stale or hand-edited")
 
 
@@ -563,8 +1023,13 @@ def assess_release(
     current_lock: dict[str, Any],
     events: list[dict[str, Any]],
     now: datetime,
+    index: EventIndex | None = None,
 ) -> dict[str, Any]:
-    """Recompute the affected-contract release gate from locks and events."""
+    """Recompute the affected-contract release gate from locks and events.
+
+    With ``index``, ``events`` is ignored and the gate is computed from the
+    indexed records, whose completion times are already parsed.
+    """
     # Watched fields describe the DATA under contract: which inputs define the
     # contract, which bytes the manifest claims, and which artifacts are
     # required. The generator's own version is not watched -- retooling is not
@@ -580,21 +1045,32 @@ def assess_release(
     affected = bool(reasons)
     fingerprint = current_lock.get("contract_fingerprint")
     required = sorted(set(current_lock.get("required_artifact_ids", [])))
-    matching = [
-        value
-        for value in events
-        if value.get("terminal_state") in SUCCESS_STATES
-        and value.get("contract_fingerprint") == fingerprint
-        and now.astimezone(timezone.utc) - parse_utc(value["completed_at"])
-        <= timedelta(days=90)
-    ]
+    if index is not None:
+        now_us = (now.astimezone(timezone.utc) - EPOCH) // timedelta(microseconds=1)
+        matching = [
+            value
+            for value in index.records()
+            if value["terminal_state"] in SUCCESS_STATES
+            and value["contract_fingerprint"] == fingerprint
+            and now_us - value["completed_us"] <= STALE_AFTER // timedelta(microseconds=1)
+        ]
+        status = index.status(fingerprint, now, required_artifact_ids=required or None)
+    else:
+        matching = [
+            value
+            for value in events
+            if value.get("terminal_state") in SUCCESS_STATES
+            and value.get("contract_fingerprint") == fingerprint
+            and now.astimezone(timezone.utc) - parse_utc(value["completed_at"])
+            <= timedelta(days=90)
+        ]
+        status = derive_status(
+            events,
+            fingerprint,
+            now,
+            required_artifact_ids=required or None,
+        )
     matching_ids = {value["artifact_id"] for value in matching}
-    status = derive_status(
-        events,
-        fingerprint,
-        now,
-        required_artifact_ids=required or None,
-    )
     evidence_ready = status["state"] == "current"
     required_matching = [
         value for value in matching
@@ -633,16 +1109,31 @@ def main() -> int:
     parser.add_argument("--status", type=Path)
     parser.add_argument("--fingerprint")
     parser.add_argument("--as-of")
+    parser.add_argument(
+        "--index",
+        type=Path,
+        help="append-only event index; only event files not yet indexed are read",
+    )
     args = parser.parse_args()
     contract_value = load_json(args.contract)
     manifest_value = load_json(args.manifest)
-    events = (
-        [load_json(path) for path in sorted(args.events.glob("*.json"))]
-        if args.events
-        else []
-    )
     now = parse_utc(args.as_of) if args.as_of else datetime.now(timezone.utc)
-    validate_events(events, contract_value, manifest_value, now=now)
+    index = None
+    if args.index:
+        if not args.events:
+            raise ValidationError("--events is required with --index")
+        index = EventIndex(args.index)
+        pending = index.pending(args.events)
+        events = [value for _, value in pending]
+        validate_events(events, contract_value, manifest_value, now=now, prior=index)
+        index.append(pending)
+    else:
+        events = (
+            [load_json(path) for path in sorted(args.events.glob("*.json"))]
+            if args.events
+            else []
+        )
+        validate_events(events, contract_value, manifest_value, now=now)
     if args.status:
         if not args.fingerprint:
             raise ValidationError("--fingerprint is required with --status")
@@ -654,6 +1145,7 @@ def main() -> int:
             required_artifact_ids=required_artifact_ids(
                 contract_value, manifest_value
             ),
+            index=index,
         )
     return 0
 
@@ -4,12 +4,22 @@
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import Future, ThreadPoolExecutor
 import hashlib
 import json
+import mmap
+import os
 from pathlib import Path
+import sys
+import time
 from typing import Any
 
 
+# A file modified this recently may change again within the same mtime tick,
+# so its checksum is not cached (the "racily clean" problem).
+RACY_WINDOW_NS = 2_000_000_000
+
+
 class PackageVerificationError(Exception):
     """A package-local source-validation asset is missing or has drifted."""
 
@@ -26,11 +36,132 @@ def checksum_bytes(value: bytes) -> str:
 
 def checksum_file(path: Path) -> str:
     try:
-        return checksum_bytes(path.read_bytes())
-    except OSError as error:
+        with path.open("rb") as handle:
+            size = os.fstat(handle.fileno()).st_size
+            if not size:
+                return checksum_bytes(b"")
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return checksum_bytes(mapped)
+    except (OSError, ValueError) as error:
         raise PackageVerificationError(f"cannot read {path}: {error}") from error
 
 
+def default_cache_path() -> Path:
+    root = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(root) / "njschooldata" / "verify-package.json"
+
+
+class FileHasher:
+    """Parallel, stat-keyed file checksums with per-file timing.
+
+    A cached checksum is reused only while the file's (path, size, mtime_ns,
+    inode) is unchanged. ``prefetch`` starts hashing uncached files on a thread
+    pool (``hashlib`` releases the GIL on large buffers); ``checksum`` returns
+    a result, waiting for a prefetched hash or computing it inline, and raises
+    the same errors as :func:`checksum_file`.
+    """
+
+    def __init__(self, cache_path: Path | None = None, max_workers: int | None = None):
+        self.cache_path = cache_path
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self.timings: dict[str, dict[str, Any]] = {}
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._futures: dict[str, Future] = {}
+        self._executor: ThreadPoolExecutor | None = None
+        if cache_path is not None and cache_path.is_file():
+            try:
+                cached = json.loads(cache_path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                cached = {}
+            if cached.get("schema_version") == "source-validation-hash-cache/v1":
+                self._entries = cached.get("files", {})
+
+    def _cached(self, key: str, stat: os.stat_result) -> str | None:
+        entry = self._entries.get(key)
+        if entry and (entry["size"], entry["mtime_ns"], entry["inode"]) == (
+            stat.st_size,
+            stat.st_mtime_ns,
+            stat.st_ino,
+        ):
+            return entry["checksum"]
+        return None
+
+    def _hash(self, path: Path, key: str, stat: os.stat_result) -> str:
+        started = time.perf_counter()
+        checksum = checksum_file(path)
+        self.timings[key] = {
+            "bytes": stat.st_size,
+            "cached": False,
+            "seconds": time.perf_counter() - started,
+        }
+        if time.time_ns() - stat.st_mtime_ns > RACY_WINDOW_NS:
+            self._entries[key] = {
+                "checksum": checksum,
+                "inode": stat.st_ino,
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+            }
+        return checksum
+
+    def prefetch(self, paths: list[Path]) -> None:
+        for path in paths:
+            key = str(path)
+            if key in self._futures:
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if self._cached(key, stat) is not None:
+                continue
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            self._futures[key] = self._executor.submit(self._hash, path, key, stat)
+
+    def checksum(self, path: Path) -> str:
+        key = str(path)
+        future = self._futures.pop(key, None)
+        if future is not None:
+            return future.result()
+        try:
+            stat = path.stat()
+        except OSError as error:
+            raise PackageVerificationError(f"cannot read {path}: {error}") from error
+        cached = self._cached(key, stat)
+        if cached is not None:
+            self.timings[key] = {"bytes": stat.st_size, "cached": True, "seconds": 0.0}
+            return cached
+        return self._hash(path, key, stat)
+
+    def close(self) -> None:
+        """Finish outstanding work and persist the cache."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self._futures.clear()
+        if self.cache_path is None:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            staging = self.cache_path.with_name(
+                f".{self.cache_path.name}.{os.getpid()}.tmp"
+            )
+            staging.write_text(
+                json.dumps(
+                    {
+                        "schema_version": "source-validation-hash-cache/v1",
+                        "files": self._entries,
+                    },
+                    sort_keys=True,
+                ),
+                encoding="utf-8",
+            )
+            os.replace(staging, self.cache_path)
+        except OSError:
+            # The cache only saves time; an unwritable cache is not a failure.
+            pass
+
+
 def read_json(path: Path) -> Any:
     try:
         return json.loads(path.read_text(encoding="utf-8"))
@@ -46,12 +177,38 @@ def _package_path(package_root: Path, relative: str) -> Path:
     return candidate
 
 
+def _prefetch_lock_files(
+    package_root: Path,
+    lock_path: Path,
+    lock: Any,
+    hasher: FileHasher,
+) -> None:
+    # Best effort: anything malformed here is reported, in order, by the
+    # sequential checks in _verify_lock.
+    paths = []
+    try:
+        for relative in lock.get("generated_files", {}):
+            paths.append(_package_path(package_root, relative))
+        manifest = read_json(lock_path.parent / "artifact-manifest.json")
+        for artifact in manifest.get("artifacts", []):
+            if (
+                artifact["tier"] == "shipped"
+                or artifact["storage"]["backend"] in {"git", "git_lfs"}
+            ):
+                paths.append(_package_path(package_root, artifact["storage"]["path"]))
+    except (AttributeError, KeyError, TypeError, PackageVerificationError):
+        pass
+    hasher.prefetch(paths)
+
+
 def _verify_lock(
     package_root: Path,
     lock_path: Path,
     expected_release: str | None,
+    hasher: FileHasher,
 ) -> dict[str, Any]:
     lock = read_json(lock_path)
+    _prefetch_lock_files(package_root, lock_path, lock, hasher)
     if lock.get("schema_version") != "source-validation-release-lock/v1":
         raise PackageVerificationError("invalid package-local source-validation lock")
     if expected_release and lock.get("source_validation_release") != expected_release:
@@ -70,7 +227,7 @@ def _verify_lock(
     ):
         raise PackageVerificationError("invalid package-local expected test IDs")
     for relative, expected in lock.get("generated_files", {}).items():
-        if checksum_file(_package_path(package_root, relative)) != expected:
+        if hasher.checksum(_package_path(package_root, relative)) != expected:
             raise PackageVerificationError(
                 f"generated file hash mismatch: {relative}"
             )
@@ -128,7 +285,7 @@ def _verify_lock(
             raise PackageVerificationError(
                 f"artifact length mismatch: {contract_id}/{artifact['artifact_id']}"
             )
-        if checksum_file(artifact_path) != artifact["checksum"]:
+        if hasher.checksum(artifact_path) != artifact["checksum"]:
             raise PackageVerificationError(
                 f"artifact checksum mismatch: {contract_id}/{artifact['artifact_id']}"
             )
@@ -138,7 +295,14 @@ def _verify_lock(
 def verify_package(
     package_root: Path,
     expected_release: str | None = None,
+    hasher: FileHasher | None = None,
 ) -> dict[str, Any]:
+    if hasher is None:
+        hasher = FileHasher()
+        try:
+            return verify_package(package_root, expected_release, hasher)
+        finally:
+            hasher.close()
     registry_path = (
         package_root / "inst" / "extdata" / "source-contract" / "registry.json"
     )
@@ -153,6 +317,7 @@ def verify_package(
             package_root,
             _package_path(package_root, entry["lock"]),
             expected_release,
+            hasher,
         )
         for contract_id, entry in sorted(contracts.items())
     }
@@ -170,14 +335,26 @@ def main() -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--package-root", type=Path, required=True)
     parser.add_argument("--expected-release")
-    args = parser.parse_args()
-    print(
-        json.dumps(
-            verify_package(args.package_root, args.expected_release),
-            sort_keys=True,
-            indent=2,
-        )
+    parser.add_argument("--cache", type=Path, default=default_cache_path())
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--jobs", type=int)
+    parser.add_argument(
+        "--timings", action="store_true", help="report per-file hash timing on stderr"
     )
+    args = parser.parse_args()
+    hasher = FileHasher(None if args.no_cache else args.cache, args.jobs)
+    try:
+        result = verify_package(args.package_root, args.expected_release, hasher)
+    finally:
+        hasher.close()
+    if args.timings:
+        for path, timing in sorted(hasher.timings.items()):
+            print(
+                f"{timing['seconds']:9.4f}s {timing['bytes']:>12} "
+                f"{'cached' if timing['cached'] else 'hashed'} {path}",
+                file=sys.stderr,
+            )
+    print(json.dumps(result, sort_keys=True, indent=2))
     return 0
 
 